@@ -0,0 +1,33 @@
+"""
+Micro-benchmark dos formatadores com e sem o cache de renderização (`render_once`).
+
+Compara o custo de formatar o mesmo payload a cada clique (função original, acessada via
+`__wrapped__`) com o custo de reaproveitar a mensagem já renderizada.
+
+Uso:
+    python -m benchmarks.bench_render_cache
+"""
+import timeit
+from benchmarks.payloads import partida
+from models.pandascore import Player, parse_Matches
+from utils.formatResponse import format_UltimaPartida, format_ProximasPartidas, format_PartidaAndamento, format_PaginaJogador
+
+PAYLOADS = {
+    "format_UltimaPartida": (format_UltimaPartida, parse_Matches([partida(0)])),
+    "format_ProximasPartidas": (format_ProximasPartidas, parse_Matches([partida(i) for i in range(5)])),
+    "format_PartidaAndamento": (format_PartidaAndamento, parse_Matches([partida(0)])),
+    "format_PaginaJogador": (format_PaginaJogador, Player.from_api({"name": "KSCERATO", "age": 25, "nationality": "BR", "birthday": "1999-09-12"})),
+}
+
+def main(numero=20000):
+    print(f"{'formatador':<26}{'sem cache (us)':>16}{'com cache (us)':>16}{'ganho':>10}")
+    for nome, (formatador, payload) in PAYLOADS.items():
+        original = formatador.__wrapped__
+
+        sem_cache = timeit.timeit(lambda: original(payload), number=numero) / numero * 1e6
+        com_cache = timeit.timeit(lambda: formatador(payload), number=numero) / numero * 1e6
+
+        print(f"{nome:<26}{sem_cache:>16.2f}{com_cache:>16.2f}{sem_cache / com_cache:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
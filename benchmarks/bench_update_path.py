@@ -0,0 +1,87 @@
+"""
+Micro-benchmark do caminho de uma atualização do webhook até o handler.
+
+Compara, por atualização:
+- decodificação com `json` (biblioteca padrão) x `orjson` (se instalado);
+- `types.Update.de_json` do telebot (árvore completa de objetos) x o caminho rápido dos
+  callbacks (`fast_CallbackQuery`);
+- descarte de tipos não tratados pelo filtro de bytes x decodificação completa.
+
+Uso:
+    python -m benchmarks.bench_update_path
+"""
+import time
+import timeit
+from services.update_filter import fast_CallbackQuery, is_Relevant
+from telebot import types
+from utils.json_codec import CODECS
+
+def callback_Update(update_id=1, chat_id=123456789):
+    """Callback de paginação em uma mensagem de foto com teclado, como os enviados pelo bot."""
+    usuario = {"id": chat_id, "is_bot": False, "first_name": "Bench", "username": "bench", "language_code": "pt-br"}
+    chat = {"id": chat_id, "first_name": "Bench", "username": "bench", "type": "private"}
+    teclado = {"inline_keyboard": [[
+        {"text": "◀️ Anterior", "callback_data": "player_076117c3_0"},
+        {"text": "Próximo ▶️", "callback_data": "player_076117c3_2"}
+    ]]}
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id), "from": usuario, "chat_instance": "-512341234123", "data": "player_076117c3_2",
+            "message": {
+                "message_id": 42, "date": int(time.time()), "chat": chat,
+                "from": {"id": 777123456, "is_bot": True, "first_name": "FURIA CS BOT", "username": "furia_bot"},
+                "photo": [
+                    {"file_id": f"AgACAgEAAxkDAAI{i}", "file_unique_id": f"AQAD{i}", "file_size": 1000 * i, "width": 90 * i, "height": 90 * i}
+                    for i in range(1, 4)
+                ],
+                "caption": "👤 KSCERATO\n   - 🎂 Idade: 25 anos\n   - 🏳️ Nacionalidade: BR\n   - 📅 Aniversário: 1999-09-12\n",
+                "caption_entities": [{"type": "bold", "offset": 3, "length": 8}],
+                "reply_markup": teclado
+            }
+        }
+    }
+
+def member_Update(update_id=2, chat_id=123456789):
+    """Atualização de um tipo que o bot não trata (bloqueio/desbloqueio do bot)."""
+    usuario = {"id": chat_id, "is_bot": False, "first_name": "Bench"}
+    return {
+        "update_id": update_id,
+        "my_chat_member": {
+            "chat": {"id": chat_id, "type": "private"}, "from": usuario, "date": int(time.time()),
+            "old_chat_member": {"user": usuario, "status": "member"},
+            "new_chat_member": {"user": usuario, "status": "kicked", "until_date": 0}
+        }
+    }
+
+def aceita(data):
+    return data.startswith(("menu_", "player_"))
+
+def main(numero=20000):
+    std = CODECS["json"]
+    callback = std.dumps(callback_Update())
+    member = std.dumps(member_Update())
+
+    caminhos = {
+        "callback: json + de_json": lambda: types.Update.de_json(std.loads(callback)),
+        "callback: json + rápido": lambda: fast_CallbackQuery(std.loads(callback), aceita),
+    }
+    if "orjson" in CODECS:
+        rapido = CODECS["orjson"]
+        caminhos["callback: orjson + de_json"] = lambda: types.Update.de_json(rapido.loads(callback))
+        caminhos["callback: orjson + rápido"] = lambda: fast_CallbackQuery(rapido.loads(callback), aceita)
+    else:
+        print("orjson não instalado: comparando só a biblioteca padrão\n")
+    caminhos["outro tipo: json + de_json"] = lambda: types.Update.de_json(std.loads(member))
+    caminhos["outro tipo: filtro de bytes"] = lambda: is_Relevant(member)
+
+    # O ganho e relativo ao primeiro caminho (json + de_json) de cada tipo de atualizacao
+    bases = {}
+    print(f"{'caminho':<32}{'us/atualização':>16}{'ganho':>10}")
+    for nome, caminho in caminhos.items():
+        custo = timeit.timeit(caminho, number=numero) / numero * 1e6
+        base = bases.setdefault(nome.split(":")[0], custo)
+        print(f"{nome:<32}{custo:>16.2f}{base / custo:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
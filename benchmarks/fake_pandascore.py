@@ -0,0 +1,75 @@
+"""
+Servidor local que imita a API PandaScore para os benchmarks.
+
+Serve `/csgo/matches`, `/csgo/matches/upcoming`, `/csgo/matches/running` e `/csgo/teams`
+com payloads sintéticos e uma latência configurável por requisição. As respostas têm
+ETag, e uma requisição com `If-None-Match` igual recebe 304 sem corpo. Também serve as fotos
+dos jogadores em `/images/<nome>.png`, para que o antecipador de imagens não saia da máquina.
+
+Uso isolado:
+    python -m benchmarks.fake_pandascore --port 8081 --latency 150
+"""
+from aiohttp import web
+from benchmarks.payloads import partida, time_completo
+import argparse
+import asyncio
+import json
+import zlib
+
+# Conteudo ficticio das fotos (o bot so repassa os bytes ao Telegram)
+IMAGEM = b"\x89PNG\r\n\x1a\n" + bytes(2048)
+
+def create_App(latency_ms=0.0, image_base=None):
+    """
+    Cria a aplicação aiohttp da PandaScore falsa.
+
+    Args:
+        latency_ms (float): Latência adicionada a cada resposta, em milissegundos.
+        image_base (str, optional): URL base das fotos dos jogadores (ex.:
+            'http://127.0.0.1:8081/images'). Se None, usa a CDN da PandaScore.
+
+    Returns:
+        web.Application: Aplicação com o contador de requisições em app["requests"].
+    """
+    respostas = {
+        "matches": json.dumps([partida(0)]).encode(),
+        "matches/upcoming": json.dumps([partida(i, status="not_started") for i in range(1, 6)]).encode(),
+        "matches/running": json.dumps([partida(9, status="running")]).encode(),
+        "teams": json.dumps(time_completo(image_base, sem_foto=False) if image_base else time_completo()).encode(),
+    }
+
+    etags = {endpoint: f'"{zlib.crc32(body):08x}"' for endpoint, body in respostas.items()}
+
+    app = web.Application()
+    app["requests"] = {endpoint: 0 for endpoint in respostas}
+    app["not_modified"] = 0
+
+    def handler(endpoint):
+        async def handle(request):
+            app["requests"][endpoint] += 1
+            if latency_ms:
+                await asyncio.sleep(latency_ms / 1000)
+            if request.headers.get("If-None-Match") == etags[endpoint]:
+                app["not_modified"] += 1
+                return web.Response(status=304, headers={"ETag": etags[endpoint]})
+            return web.Response(body=respostas[endpoint], content_type="application/json", headers={"ETag": etags[endpoint]})
+        return handle
+
+    async def image(request):
+        return web.Response(body=IMAGEM, content_type="image/png")
+
+    for endpoint in respostas:
+        app.router.add_get(f"/csgo/{endpoint}", handler(endpoint))
+    app.router.add_get("/images/{nome}", image)
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="PandaScore falsa para benchmarks")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="latência por requisição em ms")
+    args = parser.parse_args()
+    web.run_app(create_App(args.latency, f"http://127.0.0.1:{args.port}/images"), host="127.0.0.1", port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Servidor local que imita a Bot API do Telegram para os benchmarks.
+
+Responde aos métodos usados pelo bot (sendMessage, sendPhoto, editMessageMedia,
+answerCallbackQuery, sendChatAction, setWebhook, ...) com respostas válidas e avisa o
+gerador de carga, pelo callback `on_delivery(method, chat_id)`, sempre que uma mensagem
+chega a um chat. Também atende `getUpdates` (long polling) com as atualizações
+depositadas por `enqueue_Update`.
+
+Para apontar o bot para este servidor:
+    telebot.asyncio_helper.API_URL = "http://127.0.0.1:<porta>/bot{0}/{1}"
+"""
+from aiohttp import web
+from urllib.parse import parse_qsl
+import asyncio
+import itertools
+import time
+
+# Metodos que entregam conteudo ao usuario (contam como fim do atendimento)
+CONTENT_METHODS = {"sendMessage", "sendPhoto", "editMessageMedia"}
+
+def create_App(on_delivery=None, latency_ms=0.0):
+    """
+    Cria a aplicação aiohttp da Bot API falsa.
+
+    Args:
+        on_delivery (Callable, optional): Chamado com (method, chat_id) a cada mensagem
+            entregue a um chat.
+        latency_ms (float): Latência adicionada a cada resposta, em milissegundos.
+
+    Returns:
+        web.Application: Aplicação com os contadores de chamadas por método em app["calls"].
+    """
+    app = web.Application()
+    app["calls"] = {}
+    app["pending"] = []
+    app["new_updates"] = asyncio.Event()
+    message_ids = itertools.count(1)
+
+    async def handle(request):
+        method = request.match_info["method"]
+        app["calls"][method] = app["calls"].get(method, 0) + 1
+
+        # A pyTelegramBotAPI manda alguns metodos como GET com o formulario no corpo
+        if request.method == "POST":
+            params = dict(await request.post())
+        else:
+            params = dict(parse_qsl(await request.text()))
+
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+        chat_id = params.get("chat_id")
+        result = True
+
+        if method in CONTENT_METHODS:
+            result = {
+                "message_id": next(message_ids),
+                "date": int(time.time()),
+                "chat": {"id": int(chat_id), "type": "private"},
+            }
+            if method in ("sendPhoto", "editMessageMedia"):
+                result["photo"] = [{"file_id": f"file_{result['message_id']}", "file_unique_id": f"u{result['message_id']}", "width": 320, "height": 320}]
+            else:
+                result["text"] = params.get("text", "")
+
+            if on_delivery is not None:
+                on_delivery(method, int(chat_id))
+        elif method == "getUpdates":
+            result = await get_Updates(app, int(params.get("offset") or 0), int(params.get("limit") or 100), float(params.get("timeout") or 0))
+        elif method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+
+        return web.json_response({"ok": True, "result": result})
+
+    app.router.add_route("*", "/bot{token}/{method}", handle)
+    return app
+
+def enqueue_Update(app, update):
+    """Deposita uma atualização para ser entregue na próxima chamada a `getUpdates`."""
+    app["pending"].append(update)
+    app["new_updates"].set()
+
+async def get_Updates(app, offset, limit, timeout):
+    """Descarta as atualizações confirmadas pelo offset e devolve as próximas, esperando até `timeout`."""
+    app["pending"] = [update for update in app["pending"] if update["update_id"] >= offset]
+    if not app["pending"] and timeout:
+        app["new_updates"].clear()
+        try:
+            await asyncio.wait_for(app["new_updates"].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    return app["pending"][:limit]
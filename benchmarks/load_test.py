@@ -0,0 +1,224 @@
+"""
+Teste de carga de ponta a ponta do bot, sem sair da máquina.
+
+Sobe a PandaScore falsa (`fake_pandascore`) e a Bot API falsa (`fake_telegram`), aponta o
+bot para elas e inicia o servidor do webhook de verdade (Quart + Hypercorn, fila de
+atualizações, agendador de envios, caches). Em seguida dispara atualizações sintéticas no
+webhook, como o Telegram faria, e mede o tempo entre o POST no webhook e a chegada da
+resposta ao chat na Bot API falsa.
+
+Com --mode polling, o bot roda em long polling e as atualizações são entregues pela
+`getUpdates` da Bot API falsa, em vez de POSTs no webhook.
+
+Cada atualização usa um chat diferente, então o limite por chat do agendador não interfere;
+o limite global pode ser ajustado com --global-rate (o padrão do Telegram é 30/s).
+
+Uso:
+    python -m benchmarks.load_test --requests 2000 --concurrency 100 --latency 150
+"""
+from aiohttp import web
+from benchmarks import fake_pandascore, fake_telegram
+from benchmarks.payloads import time_completo
+from handlers.roster_index import roster_Version
+from models.pandascore import parse_Teams
+from services.pandas_score_client import PandaScoreClient
+from services.telegram_client import TelegramBotClient
+import aiohttp
+import argparse
+import asyncio
+import itertools
+import socket
+import statistics
+import telebot.asyncio_helper
+import time
+
+BOT_TOKEN = "123456:BENCH"
+
+def acoes(image_base):
+    """Ações simuladas: (nome, tipo de atualização, texto ou callback_data)."""
+    versao = roster_Version(parse_Teams(time_completo(image_base, sem_foto=False))[0].players)
+    return [
+        ("/menu", "message", "/menu"),
+        ("/curiosidade", "message", "/curiosidade"),
+        ("menu_ultimaPartida", "callback_query", "menu_ultimaPartida"),
+        ("menu_proximasPartidas", "callback_query", "menu_proximasPartidas"),
+        ("menu_partidaEmAndamento", "callback_query", "menu_partidaEmAndamento"),
+        ("menu_timeCompleto", "callback_query", "menu_timeCompleto"),
+        ("player", "callback_query", f"player_{versao}_1"),
+    ]
+
+def criar_Update(update_id, chat_id, tipo, conteudo):
+    """Monta o JSON de uma atualização no formato enviado pelo Telegram ao webhook."""
+    usuario = {"id": chat_id, "is_bot": False, "first_name": "Bench"}
+    chat = {"id": chat_id, "type": "private"}
+
+    if tipo == "message":
+        return {
+            "update_id": update_id,
+            "message": {
+                "message_id": 1, "date": int(time.time()), "chat": chat, "from": usuario, "text": conteudo,
+                "entities": [{"type": "bot_command", "offset": 0, "length": len(conteudo)}]
+            }
+        }
+
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id), "from": usuario, "chat_instance": str(chat_id), "data": conteudo,
+            "message": {"message_id": 1, "date": int(time.time()), "chat": chat, "text": "menu"}
+        }
+    }
+
+def porta_Livre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def iniciar_App(app, port):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+async def aguardar_Servidor(session, url, timeout=15.0):
+    """Espera o servidor do webhook aceitar conexões."""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            async with session.get(url):
+                return
+        except aiohttp.ClientConnectionError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("O servidor do webhook não subiu a tempo")
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+async def executar(args):
+    pendentes = {}
+
+    def on_delivery(method, chat_id):
+        future = pendentes.pop(chat_id, None)
+        if future is not None and not future.done():
+            future.set_result(time.perf_counter())
+
+    telegram_port, pandas_port, webhook_port = porta_Livre(), porta_Livre(), porta_Livre()
+    image_base = f"http://127.0.0.1:{pandas_port}/images"
+
+    telegram_app = fake_telegram.create_App(on_delivery, args.telegram_latency)
+    pandas_app = fake_pandascore.create_App(args.latency, image_base)
+    telegram_runner = await iniciar_App(telegram_app, telegram_port)
+    pandas_runner = await iniciar_App(pandas_app, pandas_port)
+
+    telebot.asyncio_helper.API_URL = f"http://127.0.0.1:{telegram_port}/bot{{0}}/{{1}}"
+
+    pandas_client = PandaScoreClient(api_key="bench", base_url=f"http://127.0.0.1:{pandas_port}/csgo")
+    client = TelegramBotClient(
+        BOT_TOKEN,
+        f"http://127.0.0.1:{webhook_port}/",
+        pandas_client,
+        update_workers=args.workers,
+        update_queue_size=args.queue_size,
+        live_poll_interval=3600,
+        host="127.0.0.1",
+        port=webhook_port,
+        mode=args.mode,
+        polling_timeout=5,
+        global_rate=args.global_rate,
+        profile_sample_rate=args.profile_rate
+    )
+
+    parar = asyncio.Event()
+    await pandas_client.start()
+    servidor = asyncio.create_task(client.start(shutdown_trigger=parar.wait))
+
+    webhook_url = f"http://127.0.0.1:{webhook_port}/webhook/{BOT_TOKEN}"
+    lista_acoes = acoes(image_base)
+    latencias = {nome: [] for nome, _, _ in lista_acoes}
+    rejeitadas = 0
+    perdidas = 0
+    semaforo = asyncio.Semaphore(args.concurrency)
+    update_ids = itertools.count(1)
+
+    async with aiohttp.ClientSession() as session:
+        await aguardar_Servidor(session, f"http://127.0.0.1:{webhook_port}/")
+
+        async def disparar(i):
+            nonlocal rejeitadas, perdidas
+            nome, tipo, conteudo = lista_acoes[i % len(lista_acoes)]
+            chat_id = 10_000_000 + i
+            update = criar_Update(next(update_ids), chat_id, tipo, conteudo)
+
+            async with semaforo:
+                future = asyncio.get_running_loop().create_future()
+                pendentes[chat_id] = future
+                inicio = time.perf_counter()
+                if args.mode == "polling":
+                    fake_telegram.enqueue_Update(telegram_app, update)
+                else:
+                    async with session.post(webhook_url, json=update) as response:
+                        if response.status != 200:
+                            pendentes.pop(chat_id, None)
+                            rejeitadas += 1
+                            return
+                    # Simula os reenvios do Telegram quando o webhook demora a responder
+                    for _ in range(args.redeliveries):
+                        async with session.post(webhook_url, json=update) as response:
+                            pass
+                try:
+                    fim = await asyncio.wait_for(future, args.timeout)
+                except asyncio.TimeoutError:
+                    pendentes.pop(chat_id, None)
+                    perdidas += 1
+                    return
+                latencias[nome].append((fim - inicio) * 1000)
+
+        inicio_total = time.perf_counter()
+        await asyncio.gather(*(disparar(i) for i in range(args.requests)))
+        duracao = time.perf_counter() - inicio_total
+
+    parar.set()
+    await servidor
+    await client.bot.close_session()
+    await pandas_client.close()
+    await telegram_runner.cleanup()
+    await pandas_runner.cleanup()
+
+    todas = [valor for valores in latencias.values() for valor in valores]
+    print(f"{args.requests} atualizações em {duracao:.2f}s -> {len(todas) / duracao:.1f} respostas/s "
+          f"(rejeitadas: {rejeitadas}, sem resposta: {perdidas})\n")
+    print(f"{'ação':<26}{'n':>6}{'p50 (ms)':>11}{'p95 (ms)':>11}{'p99 (ms)':>11}")
+    for nome, valores in list(latencias.items()) + [("total", todas)]:
+        if valores:
+            print(f"{nome:<26}{len(valores):>6}{statistics.median(valores):>11.1f}{percentil(valores, 95):>11.1f}{percentil(valores, 99):>11.1f}")
+
+    print(f"\nRequisições à PandaScore: {pandas_app['requests']}")
+    print(f"Chamadas à Bot API: {telegram_app['calls']}")
+    print(f"Coalescência: {pandas_client.get_CoalescingStats()}")
+    print(f"Atualizações por caminho: {client.update_stats}")
+
+    if args.profile_rate:
+        resumo = client.profiler.summary()
+        print(f"\nEtapas das {resumo['sampled']} atualizações amostradas (últimas {len(resumo['traces'])}):")
+        print(f"{'etapa':<12}{'n':>6}{'média (ms)':>13}{'máx (ms)':>11}")
+        for etapa, valores in resumo["stages"].items():
+            print(f"{etapa:<12}{valores['count']:>6}{valores['avg'] * 1000:>13.2f}{valores['max'] * 1000:>11.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga de ponta a ponta do bot")
+    parser.add_argument("--mode", choices=("webhook", "polling"), default="webhook", help="como as atualizações chegam ao bot")
+    parser.add_argument("--requests", type=int, default=1000, help="quantidade de atualizações enviadas")
+    parser.add_argument("--concurrency", type=int, default=50, help="atualizações em andamento ao mesmo tempo")
+    parser.add_argument("--latency", type=float, default=100.0, help="latência da PandaScore falsa em ms")
+    parser.add_argument("--telegram-latency", type=float, default=20.0, help="latência da Bot API falsa em ms")
+    parser.add_argument("--global-rate", type=float, default=1000.0, help="envios por segundo do agendador")
+    parser.add_argument("--workers", type=int, default=8, help="workers da fila de atualizações")
+    parser.add_argument("--queue-size", type=int, default=1000, help="capacidade da fila de atualizações")
+    parser.add_argument("--redeliveries", type=int, default=0, help="reenvios de cada atualização ao webhook (simula retries do Telegram)")
+    parser.add_argument("--profile-rate", type=float, default=0.0, help="fração das atualizações com o tempo de cada etapa medido")
+    parser.add_argument("--timeout", type=float, default=30.0, help="tempo máximo de espera por resposta em s")
+    asyncio.run(executar(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Payloads sintéticos no formato da API PandaScore, usados pelos benchmarks.
+"""
+
+FURIA_ID = 124530
+
+def streams(quantidade=30):
+    """Gera uma lista de streams parecida com a `streams_list` da PandaScore."""
+    idiomas = ["ru", "fr", "de", "pl", "es", "en", "br"]
+    return [
+        {
+            "main": i == quantidade - 1,
+            "official": i >= quantidade - 2,
+            "language": idiomas[i % len(idiomas)],
+            "raw_url": f"https://www.twitch.tv/canal_{i}",
+            "embed_url": f"https://player.twitch.tv/?channel=canal_{i}"
+        }
+        for i in range(quantidade)
+    ]
+
+def partida(i, status="finished"):
+    """Gera uma partida com os campos lidos pelos formatadores."""
+    return {
+        "id": 1000 + i,
+        "name": f"Upper bracket quarterfinal {i}: FURIA vs Time {i}",
+        "status": status,
+        "begin_at": f"2025-05-{10 + i:02d}T19:00:00Z",
+        "opponents": [
+            {"type": "Team", "opponent": {"id": FURIA_ID, "name": "FURIA", "image_url": "https://cdn.pandascore.co/furia.png"}},
+            {"type": "Team", "opponent": {"id": i, "name": f"Time {i}", "image_url": f"https://cdn.pandascore.co/time_{i}.png"}}
+        ],
+        "results": [{"score": 2, "team_id": FURIA_ID}, {"score": 1, "team_id": i}],
+        "winner": {"id": FURIA_ID, "name": "FURIA", "image_url": "https://cdn.pandascore.co/furia.png"},
+        "winner_id": FURIA_ID,
+        "serie": {"id": 9000, "full_name": "PGL Astana 2025"},
+        "league": {"id": 4000, "name": "PGL"},
+        "tournament": {"id": 7000, "name": "Playoffs", "prizepool": "625000 United States Dollar"},
+        "streams_list": streams(30)
+    }
+
+def time_completo(image_base="https://cdn.pandascore.co/players", sem_foto=True):
+    """
+    Gera o time da FURIA com elenco, no formato de `/teams`, com as fotos em `image_base`.
+
+    Com `sem_foto`, metade dos jogadores vem sem foto (usa a imagem padrão do bot).
+    """
+    nomes = ["FalleN", "KSCERATO", "yuurih", "molodoy", "YEKINDAR", "sidde"]
+    return [{
+        "id": FURIA_ID,
+        "name": "FURIA",
+        "acronym": "FURIA",
+        "image_url": "https://cdn.pandascore.co/furia.png",
+        "players": [
+            {
+                "id": 100 + i,
+                "name": nome,
+                "age": 20 + i,
+                "nationality": "BR",
+                "birthday": f"199{i}-0{i + 1}-1{i}",
+                "image_url": None if sem_foto and i % 2 else f"{image_base}/{nome}.png"
+            }
+            for i, nome in enumerate(nomes)
+        ]
+    }]
@@ -1,7 +1,20 @@
 from telebot.async_telebot import AsyncTeleBot
 from services.pandas_score_client import PandaScoreClient
-from utils.formatResponse import format_UltimaPartida, format_ProximasPartidas, format_PartidaAndamento, format_PaginaJogador
+from services.outbound_scheduler import OutboundScheduler
+from services.metrics import Histogram
+from services.chat_state import ChatField, ChatStateStore
+from services.profiler import stage
+from handlers.callback_router import CallbackRouter, timed
+from handlers.roster_index import RosterIndex, parse_PlayerCallback
+from utils.formatResponse import format_UltimaPartida, format_ProximasPartidas, format_PartidaAndamento
 from telebot import types
+from typing import Optional
+
+# Ultima pagina do time vista em cada chat, valida so para a mesma versao do elenco
+ROSTER_FIELDS = (
+    ChatField("roster_versao", "I"),
+    ChatField("roster_pagina", "h")
+)
 
 class CallbacksHandler:
     """
@@ -10,165 +23,231 @@ class CallbacksHandler:
     Responsável por processar ações de botões inline, como exibir o resultado da última partida da Furia, 
     próximas partidas, partidas ao vivo e mostrar o time completo.
     Obtém os dados da API PandaScore e envia respostas formatadas com imagens e texto.
-    Registra manipuladores de callbacks durante a inicialização para o processamento do mesmo logo depois.
+    Registra uma rota por botão no `CallbackRouter` durante a inicialização; o roteador responde
+    cada clique na hora e chama o handler da rota.
 
     Attributes:
         bot (AsyncTeleBot): Instância do bot Telegram para envio de mensagens e interações.
         pandas_client (PandaScoreClient): Cliente para chamadas à API PandaScore.
+        sender (OutboundScheduler): Agendador por onde passam todos os envios ao Telegram,
+            respeitando os limites de taxa.
+        _roster (RosterIndex, optional): Páginas do time pré-montadas, reconstruídas quando
+            os dados do time são atualizados.
+        latency (Histogram): Duração do processamento de cada callback, por ação.
+        router (CallbackRouter): Rotas dos botões inline.
+        chat_state (ChatStateStore): Estado por chat, onde fica a última página do time vista.
     """
 
-    def __init__(self, bot: AsyncTeleBot, pandas_client: PandaScoreClient):
+    def __init__(
+        self,
+        bot: AsyncTeleBot,
+        pandas_client: PandaScoreClient,
+        sender: OutboundScheduler,
+        chat_state: Optional[ChatStateStore] = None
+    ):
         """
         Inicializa o manipulador de callbacks com o bot Telegram e o cliente PandaScore.
 
         Args:
             bot (AsyncTeleBot): Instância do bot Telegram configurada com token e webhook.
             pandas_client (PandaScoreClient): Cliente configurado para acessar a API PandaScore.
+            sender (OutboundScheduler): Agendador de envios ao Telegram.
+            chat_state (ChatStateStore, optional): Estado por chat compartilhado com os outros
+                componentes. Se None, usa um próprio. Defaults to None.
         """
         self.bot = bot
         self.pandas_client = pandas_client
+        self.sender = sender
+        self.chat_state = chat_state if chat_state is not None else ChatStateStore()
+        self.chat_state.register(*ROSTER_FIELDS)
+        self._roster: Optional[RosterIndex] = None
+        self.latency = Histogram("callback_handler_duration_seconds", "Duração do processamento dos callbacks", ("action",))
+        self.router = CallbackRouter(bot)
         self._registerCallbacks()
 
+    async def _get_RosterIndex(self) -> Optional[RosterIndex]:
+        """
+        Retorna o índice de páginas do time, reconstruindo-o se os dados do time mudaram.
+
+        O `PandaScoreClient` devolve o mesmo objeto enquanto o cache não é atualizado, então
+        o índice só é remontado quando chega um payload novo.
+
+        Returns:
+            RosterIndex or None: Índice do time ou None se não houver dados do time.
+        """
+        response = await self.pandas_client.get_Time()
+        if self._roster is None or self._roster.source is not response:
+            self._roster = RosterIndex.build(response) or self._roster
+        return self._roster
+
+    def _prefetch_Vizinhos(self, roster: RosterIndex, index: int):
+        """
+        Antecipa as fotos das páginas vizinhas à página exibida.
+
+        Args:
+            roster (RosterIndex): Índice do time.
+            index (int): Página exibida.
+        """
+        for vizinho in (index - 1, index + 1):
+            page = roster.page(vizinho)
+            if page is not None:
+                self.sender.prefetch_Photo(page.photo)
+
+    def accepts(self, data: str) -> bool:
+        """
+        Diz se um `callback_data` tem rota registrada, para o caminho rápido das
+        atualizações (ver `services.update_filter`).
+
+        Args:
+            data (str): `callback_data` recebido.
+
+        Returns:
+            bool: True para as ações do menu, a paginação do time e os botões desabilitados.
+        """
+        return self.router.resolve(data) is not None
+
+    async def handle_Callback(self, call):
+        """
+        Processa um callback pelo `CallbackRouter`.
+
+        Chamado pelo telebot e também direto pelo caminho rápido das atualizações, com um
+        `FastCallbackQuery` no lugar do `CallbackQuery` completo.
+
+        Args:
+            call (telebot.types.CallbackQuery or FastCallbackQuery): Callback recebido.
+
+        Returns:
+            None
+        """
+        await self.router.dispatch(call)
+
     def _registerCallbacks(self):
         """
-        Registra manipuladores para processar callbacks de botões inline.
+        Registra as rotas dos botões inline no `CallbackRouter` e o roteador no telebot.
 
-        Configura um manipulador genérico que processa todos os callbacks, verificando o
-        `callback_data` para executar ações específicas. Usa um decorador do AsyncTeleBot para associar a função de callback.
+        Cada botão é uma entrada da tabela (valor exato ou prefixo do `callback_data`), com o
+        middleware de tempo para as métricas por ação.
 
         Returns:
             None
         """
+        middleware = (timed(self.latency),)
+
+        self.router.add_Route("menu_ultimaPartida", self._ultima_Partida, middleware=middleware)
+        self.router.add_Route("menu_proximasPartidas", self._proximas_Partidas, middleware=middleware)
+        self.router.add_Route("menu_partidaEmAndamento", self._partida_EmAndamento, middleware=middleware)
+        self.router.add_Route("menu_timeCompleto", self._time_Completo, middleware=middleware)
+        self.router.add_Route("ignored", self._ignorar)
+        self.router.add_Prefix("player_", self._pagina_Jogador, answer=self._aviso_Jogador, middleware=middleware)
+
+        self.bot.callback_query_handler(func=lambda call:True)(self.handle_Callback)
+
+    async def _ultima_Partida(self, call):
+        """Envia o resultado da última partida da FURIA, com a logo do vencedor."""
+        response = await self.pandas_client.get_UltimaPartida()
+        with stage("render"):
+            message = format_UltimaPartida(response)
+        await self.sender.send_photo(
+            chat_id=call.message.chat.id,
+            photo=message['logo'],
+            caption=message['text'],
+            parse_mode='Markdown',
+        )
+
+    async def _proximas_Partidas(self, call):
+        """Envia as próximas partidas da FURIA."""
+        response = await self.pandas_client.get_ProximasPartidas()
+        if not response:
+            message = "Pô meu furioso(a) não achei próximas partidas da FURIA, tenta novamente mais tarde, talvez deu um bug aqui hehe😅"
+        else:
+            with stage("render"):
+                message = format_ProximasPartidas(response)
+        await self.sender.send_message(chat_id=call.message.chat.id, text=message, parse_mode='Markdown')
+
+    async def _partida_EmAndamento(self, call):
+        """Envia a partida da FURIA em andamento."""
+        response = await self.pandas_client.get_PartidaEmAndamento()
+        if not response:
+            message = "As partidas já acabaram meu furioso(a), mas fica ligado na nossa rede 😎" 
+        else:
+            with stage("render"):
+                message = format_PartidaAndamento(response)
+        await self.sender.send_message(chat_id=call.message.chat.id, text=message, parse_mode='Markdown')
+
+    async def _time_Completo(self, call):
+        """
+        Envia a paginação do time, a partir do último jogador visto no chat se o elenco não
+        mudou desde então (ou da primeira página).
+        """
+        roster = await self._get_RosterIndex()
+        if roster is None:
+            message = "Foi mal furioso(a), não consegui puxar o time pra tu, tenta de novo mais tarde 😉"  
+            await self.sender.send_message(chat_id=call.message.chat.id, text=message, parse_mode='Markdown')
+            return
+
+        chat_id = call.message.chat.id
+        player_index = 0
+        salvo = self.chat_state.get_Many(chat_id, "roster_versao", "roster_pagina")
+        if salvo is not None and salvo[0] == int(roster.version, 16) and roster.page(salvo[1]) is not None:
+            player_index = salvo[1]
+
+        page = roster.page(player_index)
+        await self.sender.send_photo(
+            chat_id=chat_id,
+            photo=page.photo,
+            caption=page.caption,
+            reply_markup=page.keyboard,
+            parse_mode='Markdown'
+        )
+        self._prefetch_Vizinhos(roster, player_index)
+
+    def _aviso_Jogador(self, call) -> Optional[str]:
+        """
+        Escolhe o aviso do clique na paginação, respondido antes de a página ser editada.
 
-        @self.bot.callback_query_handler(func=lambda call:True)
-        async def handle_all_callbacks(call):
-            """
-            Processa todos os callbacks de botões inline recebidos.
-
-            Verifica o valor de `callback_data` para determinar qual ação irá executar.
-
-            Args:
-                call (telebot.types.CallbackQuery): Objeto do callback, contendo informações
-                    sobre o botão clicado (ex.: call.data, call.message.chat.id).
-
-            Returns:
-                None
-            """
-            
-            match(call.data):
-                case "menu_ultimaPartida":
-                    response = await self.pandas_client.get_UltimaPartida()
-                    message = format_UltimaPartida(response)
-                    await self.bot.send_photo(
-                        chat_id=call.message.chat.id,
-                        photo=message['logo'],
-                        caption=message['text'],
-                        parse_mode='Markdown',
-                    )
-
-                case "menu_proximasPartidas":
-                    response = await self.pandas_client.get_ProximasPartidas()
-                    if not response:
-                        message = "Pô meu furioso(a) não achei próximas partidas da FURIA, tenta novamente mais tarde, talvez deu um bug aqui hehe😅"
-                    else:
-                        message = format_ProximasPartidas(response)
-                    await self.bot.send_message(chat_id=call.message.chat.id, text=message, parse_mode='Markdown')
-
-                case "menu_partidaEmAndamento":
-                    response = await self.pandas_client.get_PartidaEmAndamento()
-                    if not response:
-                        message = "As partidas já acabaram meu furioso(a), mas fica ligado na nossa rede 😎" 
-                    else:
-                        message = format_PartidaAndamento(response)
-                    await self.bot.send_message(chat_id=call.message.chat.id, text=message, parse_mode='Markdown')
-                
-                case "menu_timeCompleto":
-                    response = await self.pandas_client.get_Time()
-                    if not response:
-                        message = "Foi mal furioso(a), não consegui puxar o time pra tu, tenta de novo mais tarde 😉"  
-                    else:
-
-                        players = response[0].get("players", [])
-                        
-                        player = players[0]
-                        message = format_PaginaJogador(player)
-                        keyboard = create_BotoesNavegacao(0, len(players))
-
-                        if player.get("image_url"):
-                            await self.bot.send_photo(
-                                chat_id=call.message.chat.id,
-                                photo=player["image_url"],
-                                caption=message,
-                                reply_markup=keyboard,
-                                parse_mode='Markdown'
-                            )
-                        else:
-                            await self.bot.send_message(
-                                chat_id=call.message.chat.id,
-                                text=message,
-                                reply_markup=keyboard,
-                                parse_mode='Markdown'
-                            )
-
-                # Case para paginação do time
-                case str() if call.data.startswith("player_"):
-
-                    # Pego todos os jogadores
-                    player_index = int(call.data.split("_")[1])
-                    response = await self.pandas_client.get_Time()
-                    players = response[0].get("players", [])
-
-                    # Pego o jogador e formato a resposta com os botoes de navegação
-                    player = players[player_index]
-                    message = format_PaginaJogador(player)
-                    keyboard = create_BotoesNavegacao(player_index, len(players))
-
-                    if player.get("image_url"):
-                        # Edito a mensagem de midia e envio a foto e informações do jogador
-                        await self.bot.edit_message_media(
-                            chat_id=call.message.chat.id,
-                            message_id=call.message.message_id,
-                            media=types.InputMediaPhoto(player["image_url"], caption=message),
-                            reply_markup=keyboard
-                        )
-                    else:
-                        DEFAULT_IMG_PLAYER = "https://external-content.duckduckgo.com/iu/?u=https%3A%2F%2Fcdn1.iconfinder.com%2Fdata%2Ficons%2Fuser-interface-664%2F24%2FUser-512.png&f=1&nofb=1&ipt=42b1085244d2f163e38bf3f65e2732a8b0f4459c30d1368f801704d50eb99e89"
-
-                        # Modifico primeiro a midia para evitar erros
-                        media = types.InputMediaPhoto(
-                            media=DEFAULT_IMG_PLAYER,
-                            caption=message,
-                            parse_mode='Markdown'
-                        )
-
-                        # Edito a mensagem do bot enviando a foto padrao caso nao tenha uma foto via API
-                        await self.bot.edit_message_media(
-                            chat_id=call.message.chat.id,
-                            message_id=call.message.message_id,
-                            reply_markup=keyboard,
-                            media=media,
-                        )
-            # Volta a ser vazia minha ação
-            await self.bot.send_chat_action(call.message.chat.id, action='')
-
-def create_BotoesNavegacao(current_index, total_players):
-    """
-    Cria botões de navegação (Anterior/Próximo) para mostrar o time completo em uma paginação
-    """
+        Args:
+            call (telebot.types.CallbackQuery or FastCallbackQuery): Callback recebido.
 
-    keyboard = types.InlineKeyboardMarkup(row_width=2)
-    
-    # Botão "Anterior" (desabilitado se for o primeiro jogador)
-    btn_prev = types.InlineKeyboardButton(
-        text="◀️ Anterior",
-        callback_data=f"player_{current_index - 1}" if current_index > 0 else "ignored"
-    )
-    
-    # Botão "Próximo" (desabilitado se for o último jogador)
-    btn_next = types.InlineKeyboardButton(
-        text="Próximo ▶️",
-        callback_data=f"player_{current_index + 1}" if current_index < total_players - 1 else "ignored"
-    )
-    
-    keyboard.add(btn_prev, btn_next)
-    return keyboard
\ No newline at end of file
+        Returns:
+            str or None: Aviso de elenco atualizado se o botão for de um elenco antigo ou
+                apontar para uma página inexistente; None caso contrário (ou se o índice
+                ainda não foi montado).
+        """
+        if self._roster is None:
+            return None
+        parsed = parse_PlayerCallback(call.data)
+        if parsed is None or parsed[0] != self._roster.version or self._roster.page(parsed[1]) is None:
+            return "O elenco foi atualizado, voltando pro começo 🔄"
+        return None
+
+    async def _pagina_Jogador(self, call):
+        """Troca a foto e a legenda da mensagem da paginação pela página pedida."""
+        # Consulta o cache do time a cada clique (em memória, sem ir à API): quando chega um
+        # payload novo, o índice é remontado e as fotos antecipadas são as atuais
+        roster = await self._get_RosterIndex()
+        parsed = parse_PlayerCallback(call.data)
+
+        if roster is None:
+            await self.sender.send_message(chat_id=call.message.chat.id, text="Não consegui puxar o time agora, tenta de novo mais tarde 😉")
+            return
+
+        # Mensagem de um elenco antigo ou indice invalido: volto para a primeira pagina do elenco atual
+        if parsed is None or parsed[0] != roster.version or roster.page(parsed[1]) is None:
+            player_index = 0
+        else:
+            player_index = parsed[1]
+
+        page = roster.page(player_index)
+
+        # Edito a mensagem de midia e envio a foto e informações do jogador
+        await self.sender.edit_message_media(
+            chat_id=call.message.chat.id,
+            message_id=call.message.message_id,
+            media=types.InputMediaPhoto(page.photo, caption=page.caption, parse_mode='Markdown'),
+            reply_markup=page.keyboard
+        )
+        self.chat_state.set(call.message.chat.id, roster_versao=int(roster.version, 16), roster_pagina=player_index)
+        self._prefetch_Vizinhos(roster, player_index)
+
+    async def _ignorar(self, call):
+        """Botão desabilitado (início ou fim da paginação): só a resposta ao clique."""
@@ -0,0 +1,223 @@
+from services.dedup_window import DedupWindow
+from services.metrics import Histogram
+from telebot.async_telebot import AsyncTeleBot
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+from utils.event_log import error_Fields
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+# Handler de callback e middleware: recebe (nome da rota, handler) e devolve o handler envolvido
+CallbackFunc = Callable[[object], Awaitable[None]]
+Middleware = Callable[[str, CallbackFunc], CallbackFunc]
+
+class Route:
+    """
+    Rota de callback registrada no `CallbackRouter`.
+
+    Attributes:
+        name (str): Nome da rota (usado como label nas métricas).
+        handler (CallbackFunc): Handler já envolvido pelos middlewares da rota.
+        answer (Callable, optional): Função síncrona que escolhe o texto do aviso
+            (`answer_callback_query`) a partir do callback; None para responder sem texto.
+    """
+    __slots__ = ("name", "handler", "answer")
+
+    def __init__(self, name: str, handler: CallbackFunc, answer: Optional[Callable[[object], Optional[str]]] = None):
+        self.name = name
+        self.handler = handler
+        self.answer = answer
+
+
+class _TrieNode:
+    __slots__ = ("children", "route")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.route: Optional[Route] = None
+
+
+class CallbackRouter:
+    """
+    Roteador dos callbacks de botões inline, orientado por tabela.
+
+    Valores exatos de `callback_data` ficam em um dicionário; prefixos (ex.: 'player_',
+    seguido de versão e índice) ficam em uma trie, onde vence o prefixo mais longo. O custo
+    de resolver uma rota depende só do tamanho do `callback_data` (no máximo 64 bytes no
+    Telegram), não da quantidade de botões registrados.
+
+    Todo callback é respondido com `answer_callback_query` assim que chega, em paralelo
+    com o handler, para o aplicativo do usuário parar de mostrar o carregamento antes de
+    qualquer consulta à PandaScore.
+
+    Cliques repetidos do mesmo usuário no mesmo botão da mesma mensagem dentro de
+    `debounce_window` segundos (ex.: toque duplo enquanto a foto ainda carrega) são só
+    respondidos, sem executar o handler de novo.
+
+    Attributes:
+        bot (AsyncTeleBot): Bot usado para responder os callbacks.
+        stats (dict): Callbacks respondidos, falhas ao responder, callbacks sem rota e
+            cliques repetidos ignorados.
+    """
+
+    def __init__(self, bot: AsyncTeleBot, debounce_window: float = 1.0, max_taps: int = 10000):
+        """
+        Inicializa o roteador.
+
+        Args:
+            bot (AsyncTeleBot): Bot usado para responder os callbacks.
+            debounce_window (float): Janela em segundos em que um clique repetido é ignorado.
+                Defaults to 1.0.
+            max_taps (int): Quantidade máxima de cliques recentes lembrados. Defaults to 10000.
+        """
+        self.bot = bot
+        self._exact: Dict[str, Route] = {}
+        self._prefixes = _TrieNode()
+        self._recent_taps = DedupWindow(debounce_window, capacity=max_taps)
+        self.stats = {"answered": 0, "answer_errors": 0, "unrouted": 0, "debounced": 0}
+
+    def add_Route(
+        self,
+        data: str,
+        handler: CallbackFunc,
+        name: Optional[str] = None,
+        answer: Optional[Callable[[object], Optional[str]]] = None,
+        middleware: Sequence[Middleware] = ()
+    ) -> Route:
+        """
+        Registra uma rota para um `callback_data` exato.
+
+        Args:
+            data (str): `callback_data` do botão.
+            handler (CallbackFunc): Função assíncrona que recebe o callback.
+            name (str, optional): Nome da rota. Defaults to o próprio `data`.
+            answer (Callable, optional): Escolhe o texto do aviso do callback. Defaults to None.
+            middleware (Sequence[Middleware]): Middlewares aplicados ao handler, do mais
+                externo ao mais interno. Defaults to ().
+
+        Returns:
+            Route: Rota registrada.
+        """
+        route = _build_Route(name or data, handler, answer, middleware)
+        self._exact[data] = route
+        return route
+
+    def add_Prefix(
+        self,
+        prefix: str,
+        handler: CallbackFunc,
+        name: Optional[str] = None,
+        answer: Optional[Callable[[object], Optional[str]]] = None,
+        middleware: Sequence[Middleware] = ()
+    ) -> Route:
+        """
+        Registra uma rota para todo `callback_data` que começa com `prefix`.
+
+        Args:
+            prefix (str): Prefixo do `callback_data`.
+            handler (CallbackFunc): Função assíncrona que recebe o callback.
+            name (str, optional): Nome da rota. Defaults to o prefixo sem '_' no fim.
+            answer (Callable, optional): Escolhe o texto do aviso do callback. Defaults to None.
+            middleware (Sequence[Middleware]): Middlewares aplicados ao handler. Defaults to ().
+
+        Returns:
+            Route: Rota registrada.
+        """
+        node = self._prefixes
+        for char in prefix:
+            node = node.children.setdefault(char, _TrieNode())
+        node.route = _build_Route(name or prefix.rstrip("_"), handler, answer, middleware)
+        return node.route
+
+    def resolve(self, data: Optional[str]) -> Optional[Route]:
+        """
+        Encontra a rota de um `callback_data`: primeiro o valor exato, depois o prefixo
+        registrado mais longo.
+
+        Args:
+            data (str, optional): `callback_data` recebido.
+
+        Returns:
+            Route or None: Rota encontrada ou None se não houver.
+        """
+        if data is None:
+            return None
+
+        route = self._exact.get(data)
+        if route is not None:
+            return route
+
+        node = self._prefixes
+        for char in data:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.route is not None:
+                route = node.route
+        return route
+
+    async def dispatch(self, call):
+        """
+        Responde o callback imediatamente e executa o handler da rota.
+
+        Args:
+            call (telebot.types.CallbackQuery or FastCallbackQuery): Callback recebido.
+
+        Returns:
+            None
+        """
+        route = self.resolve(call.data)
+        repetido = route is not None and self._recent_taps.seen(_tap_Key(call))
+        text = route.answer(call) if route is not None and route.answer is not None and not repetido else None
+        answer = asyncio.create_task(self._answer(call.id, text))
+
+        try:
+            if route is None:
+                self.stats["unrouted"] += 1
+            elif repetido:
+                self.stats["debounced"] += 1
+            else:
+                await route.handler(call)
+        finally:
+            await answer
+
+    async def _answer(self, callback_query_id: str, text: Optional[str]):
+        """Responde o callback (fora do `OutboundScheduler`: não conta no limite de mensagens)."""
+        try:
+            await self.bot.answer_callback_query(callback_query_id, text=text)
+            self.stats["answered"] += 1
+        except Exception as e:
+            self.stats["answer_errors"] += 1
+            log.warning("Não foi possivel responder o callback", extra=error_Fields(e))
+
+
+def timed(histogram: Histogram) -> Middleware:
+    """
+    Middleware que mede a duração do handler no histograma, com o nome da rota como label.
+
+    Args:
+        histogram (Histogram): Histograma com um label (a ação).
+
+    Returns:
+        Middleware: Middleware para `add_Route`/`add_Prefix`.
+    """
+    def middleware(name: str, handler: CallbackFunc) -> CallbackFunc:
+        async def timed_handler(call):
+            with histogram.time(name):
+                await handler(call)
+        return timed_handler
+    return middleware
+
+
+def _tap_Key(call) -> tuple:
+    """Identifica um clique: usuário, mensagem do botão e `callback_data`."""
+    message = call.message
+    return (call.from_user.id, message.chat.id if message else None, message.message_id if message else None, call.data)
+
+
+def _build_Route(name: str, handler: CallbackFunc, answer, middleware: Sequence[Middleware]) -> Route:
+    # Os middlewares sao aplicados no registro, entao nao custam nada ao resolver a rota
+    for wrap in reversed(middleware):
+        handler = wrap(name, handler)
+    return Route(name, handler, answer)
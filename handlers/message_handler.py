@@ -1,5 +1,6 @@
 from telebot.async_telebot import AsyncTeleBot
 from telebot import types
+from services.outbound_scheduler import OutboundScheduler
 
 class MessageHandler:
     """
@@ -11,16 +12,20 @@ class MessageHandler:
 
     Attributes:
         bot (AsyncTeleBot): Instância do bot Telegram para envio de mensagens e interações.
+        sender (OutboundScheduler): Agendador por onde passam todos os envios ao Telegram,
+            respeitando os limites de taxa.
     """
 
-    def __init__(self, bot: AsyncTeleBot):
+    def __init__(self, bot: AsyncTeleBot, sender: OutboundScheduler):
         """
         Inicializa o manipulador de mensagens com o bot Telegram.
 
         Args:
             bot (AsyncTeleBot): Instância do bot Telegram configurada com token e webhook.
+            sender (OutboundScheduler): Agendador de envios ao Telegram.
         """
         self.bot = bot
+        self.sender = sender
 
 
     async def _send_main_menu(self, message):
@@ -54,7 +59,7 @@ class MessageHandler:
             "Escolha uma das opções abaixo e bora pro próximo level 🦾"
         )
 
-        await self.bot.send_photo(
+        await self.sender.send_photo(
             chat_id=message.chat.id,
             photo=logo,
             caption=caption,
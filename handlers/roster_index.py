@@ -0,0 +1,144 @@
+from models.pandascore import Player, Team
+from telebot import types
+from typing import Optional, Sequence, Tuple
+from utils.formatResponse import format_PaginaJogador
+import zlib
+
+DEFAULT_IMG_PLAYER = "https://external-content.duckduckgo.com/iu/?u=https%3A%2F%2Fcdn1.iconfinder.com%2Fdata%2Ficons%2Fuser-interface-664%2F24%2FUser-512.png&f=1&nofb=1&ipt=42b1085244d2f163e38bf3f65e2732a8b0f4459c30d1368f801704d50eb99e89"
+
+class RosterPage:
+    """
+    Página pronta da paginação do time: legenda, foto e teclado de navegação.
+
+    Attributes:
+        caption (str): Legenda formatada do jogador.
+        photo (str): URL da foto do jogador (ou a imagem padrão).
+        keyboard (types.InlineKeyboardMarkup): Botões Anterior/Próximo da página.
+    """
+    __slots__ = ("caption", "photo", "keyboard")
+
+    def __init__(self, caption: str, photo: str, keyboard: types.InlineKeyboardMarkup):
+        self.caption = caption
+        self.photo = photo
+        self.keyboard = keyboard
+
+
+class RosterIndex:
+    """
+    Índice imutável com todas as páginas do time, montado uma vez por atualização do elenco.
+
+    A versão é um hash curto do elenco (ids e nomes dos jogadores), estável entre
+    reinícios, e vai no `callback_data` dos botões ('player_<versão>_<índice>'). Assim, um
+    clique em uma mensagem antiga, de um elenco que já mudou, é reconhecido como obsoleto.
+
+    Attributes:
+        version (str): Versão do elenco.
+        pages (Tuple[RosterPage, ...]): Páginas na ordem dos jogadores.
+        source (Tuple[Team, ...]): Resposta de `PandaScoreClient.get_Time()` usada para montar o índice.
+    """
+    __slots__ = ("version", "pages", "source")
+
+    def __init__(self, version: str, pages: Tuple[RosterPage, ...], source: Tuple[Team, ...]):
+        self.version = version
+        self.pages = pages
+        self.source = source
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def page(self, index: int) -> Optional[RosterPage]:
+        """
+        Retorna a página de um jogador.
+
+        Args:
+            index (int): Posição do jogador.
+
+        Returns:
+            RosterPage or None: Página pronta ou None se o índice estiver fora do elenco.
+        """
+        if 0 <= index < len(self.pages):
+            return self.pages[index]
+        return None
+
+    @classmethod
+    def build(cls, response: Tuple[Team, ...]) -> Optional["RosterIndex"]:
+        """
+        Monta o índice a partir da resposta de `PandaScoreClient.get_Time()`.
+
+        Args:
+            response (Tuple[Team, ...]): Tupla com o time e seu elenco ('players').
+
+        Returns:
+            RosterIndex or None: Índice montado ou None se não houver jogadores.
+        """
+        players = response[0].players if response else ()
+        if not players:
+            return None
+
+        version = roster_Version(players)
+        total = len(players)
+
+        pages = tuple(
+            RosterPage(
+                caption=format_PaginaJogador(player),
+                photo=player.image_url or DEFAULT_IMG_PLAYER,
+                keyboard=create_BotoesNavegacao(i, total, version)
+            )
+            for i, player in enumerate(players)
+        )
+
+        return cls(version, pages, response)
+
+
+def roster_Version(players: Sequence[Player]) -> str:
+    """
+    Calcula a versão do elenco a partir dos ids e nomes dos jogadores.
+
+    Args:
+        players (Sequence[Player]): Jogadores do time.
+
+    Returns:
+        str: Hash hexadecimal curto (8 caracteres).
+    """
+    chave = "|".join(f"{player.id}:{player.name}" for player in players)
+    return f"{zlib.crc32(chave.encode('utf-8')):08x}"
+
+
+def parse_PlayerCallback(data: str) -> Optional[Tuple[str, int]]:
+    """
+    Lê a versão e o índice de um `callback_data` de paginação.
+
+    Args:
+        data (str): `callback_data` no formato 'player_<versão>_<índice>'.
+
+    Returns:
+        Tuple[str, int] or None: (versão, índice) ou None se o formato for inválido
+            (inclusive o formato antigo 'player_<índice>', sem versão).
+    """
+    parts = data.split("_")
+    if len(parts) != 3 or not parts[2].isdigit():
+        return None
+    return parts[1], int(parts[2])
+
+
+def create_BotoesNavegacao(current_index, total_players, version):
+    """
+    Cria botões de navegação (Anterior/Próximo) para mostrar o time completo em uma paginação
+    """
+
+    keyboard = types.InlineKeyboardMarkup(row_width=2)
+
+    # Botão "Anterior" (desabilitado se for o primeiro jogador)
+    btn_prev = types.InlineKeyboardButton(
+        text="◀️ Anterior",
+        callback_data=f"player_{version}_{current_index - 1}" if current_index > 0 else "ignored"
+    )
+
+    # Botão "Próximo" (desabilitado se for o último jogador)
+    btn_next = types.InlineKeyboardButton(
+        text="Próximo ▶️",
+        callback_data=f"player_{version}_{current_index + 1}" if current_index < total_players - 1 else "ignored"
+    )
+
+    keyboard.add(btn_prev, btn_next)
+    return keyboard
@@ -1,10 +1,17 @@
 import asyncio
+import logging
+import multiprocessing
 import os
+import socket
 from dotenv import load_dotenv
+from typing import Optional
 from services.telegram_client import TelegramBotClient
 from services.pandas_score_client import PandaScoreClient
+from utils import event_log, json_codec
 
-async def main():
+log = logging.getLogger("main")
+
+async def main(worker_index: int = 0, workers: int = 1, listen_fd: Optional[int] = None):
     """
     Inicializa e executa o bot Telegram com integração à API PandaScore.
 
@@ -12,7 +19,12 @@ async def main():
     webhook. Esta função é o ponto de entrada principal da aplicação.
 
     Args:
-        None
+        worker_index (int): Índice deste processo entre os workers (0 é o principal, que
+            configura o bot e o webhook). Defaults to 0.
+        workers (int): Quantidade total de workers. Com mais de um, o cache da PandaScore e
+            os inscritos ficam compartilhados entre os processos. Defaults to 1.
+        listen_fd (int, optional): Socket herdado do processo pai onde o servidor escuta.
+            Defaults to None.
 
     Returns:
         None
@@ -28,26 +40,155 @@ async def main():
     BOT_TOKEN = os.getenv('BOT_TOKEN')
     WEBHOOK_URL = os.getenv('WEBHOOK_URL')
     API_KEY_PANDAS_SCORE = os.getenv('API_KEY_PANDAS_SCORE')
+    URL_API = os.getenv('URL_API', "https://api.pandascore.co/csgo/")
+    HOST = os.getenv('HOST', "0.0.0.0")
+    PORT = int(os.getenv('PORT', 5000))
+    CACHE_DB_PATH = os.getenv('CACHE_DB_PATH')
+    UPDATE_WORKERS = int(os.getenv('UPDATE_WORKERS', 8))
+    UPDATE_QUEUE_SIZE = int(os.getenv('UPDATE_QUEUE_SIZE', 1000))
+    MEDIA_CACHE_PATH = os.getenv('MEDIA_CACHE_PATH')
+    SUBSCRIBERS_PATH = os.getenv('SUBSCRIBERS_PATH')
+    LIVE_POLL_INTERVAL = float(os.getenv('LIVE_POLL_INTERVAL', 30))
+    ARCHIVE_DB_PATH = os.getenv('ARCHIVE_DB_PATH')
+    ARCHIVE_SYNC_INTERVAL = float(os.getenv('ARCHIVE_SYNC_INTERVAL', 3600))
+    CHAT_STATE_PATH = os.getenv('CHAT_STATE_PATH')
+    CHAT_STATE_MEMORY_MB = float(os.getenv('CHAT_STATE_MEMORY_MB', 32))
+    CHAT_STATE_SNAPSHOT_INTERVAL = float(os.getenv('CHAT_STATE_SNAPSHOT_INTERVAL', 300))
+    UPDATE_MODE = os.getenv('UPDATE_MODE', "webhook")
+    JSON_CODEC = os.getenv('JSON_CODEC', "auto")
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILER_TOKEN = os.getenv('PROFILER_TOKEN')
+
+    # Decodificador JSON das respostas da PandaScore e das atualizacoes do webhook
+    json_codec.set_Codec(JSON_CODEC)
+
+    # Com varios workers o cache e os inscritos precisam de arquivo para serem compartilhados
+    shared = workers > 1
+    if shared:
+        CACHE_DB_PATH = CACHE_DB_PATH or "pandascore_cache.sqlite3"
+        SUBSCRIBERS_PATH = SUBSCRIBERS_PATH or "inscritos.bin"
+        ARCHIVE_DB_PATH = ARCHIVE_DB_PATH or "partidas.sqlite3"
+        # O estado dos chats e de cada processo (um chat nao cai sempre no mesmo worker): um snapshot por worker
+        if CHAT_STATE_PATH:
+            CHAT_STATE_PATH = f"{CHAT_STATE_PATH}.{worker_index}"
 
-    # Instanciacao para consultas a API
-    clientPandas = PandaScoreClient(API_KEY_PANDAS_SCORE)
+    # Instanciacao para consultas a API (com cache em disco opcional para reinicios "quentes")
+    clientPandas = PandaScoreClient(API_KEY_PANDAS_SCORE, disk_cache_path=CACHE_DB_PATH, base_url=URL_API, shared=shared)
 
-    # Instanciacao para consultas ao BOT
+    # Abre a sessao HTTP compartilhada (pool de conexoes) com a PandaScore
+    await clientPandas.start()
+
+    # Instanciacao para consultas ao BOT (o limite de envios do Telegram e dividido entre os workers)
     client = TelegramBotClient(
         bot_token=BOT_TOKEN,
         webhook_url=WEBHOOK_URL,
-        pandas_client=clientPandas
+        pandas_client=clientPandas,
+        update_workers=UPDATE_WORKERS,
+        update_queue_size=UPDATE_QUEUE_SIZE,
+        media_cache_path=MEDIA_CACHE_PATH,
+        subscribers_path=SUBSCRIBERS_PATH,
+        live_poll_interval=LIVE_POLL_INTERVAL,
+        archive_path=ARCHIVE_DB_PATH,
+        archive_sync_interval=ARCHIVE_SYNC_INTERVAL,
+        chat_state_path=CHAT_STATE_PATH,
+        chat_state_memory=int(CHAT_STATE_MEMORY_MB * 1024 * 1024),
+        chat_state_snapshot_interval=CHAT_STATE_SNAPSHOT_INTERVAL,
+        profile_sample_rate=PROFILE_SAMPLE_RATE,
+        profiler_token=PROFILER_TOKEN,
+        host=HOST,
+        port=PORT,
+        mode=UPDATE_MODE,
+        global_rate=30 / workers,
+        primary=worker_index == 0,
+        shared=shared,
+        listen_fd=listen_fd
     )
 
-    # Configura o BOT
-    await client.set_BotConfig()
+    try:
+        # Configura o BOT
+        if worker_index == 0:
+            await client.set_BotConfig()
+
+        # Roda o bot 
+        await client.start()
+    finally:
+        # Fecha as conexoes abertas com a PandaScore
+        await clientPandas.close()
+
+def run_Worker(worker_index: int = 0, workers: int = 1, listen_fd: Optional[int] = None):
+    """
+    Ponto de entrada de cada processo worker (e do processo único, sem WORKERS).
+
+    Liga os logs estruturados em segundo plano (`LOG_LEVEL`, `LOG_FORMAT`): o event loop só
+    enfileira os registros e uma thread os escreve. Ao encerrar, a fila é esvaziada.
+    """
+    log_listener = event_log.setup_Logging(os.getenv('LOG_LEVEL', "INFO"), os.getenv('LOG_FORMAT', "json"))
+    try:
+        asyncio.run(main(worker_index, workers, listen_fd))
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        log.exception("Não foi possivel inicializar o worker", extra={"worker": worker_index})
+    finally:
+        log_listener.stop()
+
+def run_Workers(workers: int):
+    """
+    Roda o bot em vários processos que dividem o mesmo socket do webhook.
+
+    O processo pai abre o socket em HOST:PORT e cria os workers com fork; cada worker herda
+    o socket e o sistema operacional distribui as conexões entre eles. O worker 0 é o
+    principal: configura o bot e o webhook e roda o poller das partidas ao vivo. Disponível
+    apenas em sistemas com fork (Linux/macOS) e no modo webhook.
+
+    Args:
+        workers (int): Quantidade de processos.
+
+    Returns:
+        None
+    """
+    load_dotenv()
+    host = os.getenv('HOST', "0.0.0.0")
+    port = int(os.getenv('PORT', 5000))
+
+    listener = socket.create_server((host, port), backlog=2048)
+    listener.set_inheritable(True)
 
-    # Roda o bot 
-    await client.start()
+    context = multiprocessing.get_context("fork")
+    processos = [
+        context.Process(target=run_Worker, args=(i, workers, listener.fileno()), name=f"bot-worker-{i}")
+        for i in range(workers)
+    ]
+    for processo in processos:
+        processo.start()
+    listener.close()
+
+    try:
+        for processo in processos:
+            processo.join()
+    except KeyboardInterrupt:
+        for processo in processos:
+            processo.join(timeout=10)
+    finally:
+        for processo in processos:
+            if processo.is_alive():
+                processo.terminate()
 
 if __name__ == "__main__":
+    load_dotenv()
+    WORKERS = int(os.getenv('WORKERS', 1))
+
+    # Escrita direta no processo pai (os workers ligam a fila depois do fork)
+    event_log.setup_Logging(os.getenv('LOG_LEVEL', "INFO"), os.getenv('LOG_FORMAT', "json"), background=False)
+
     try:
-        asyncio.run(main())
-    except Exception as e:
-        print(f"Não foi possivel inicializar o bot : {e}")
+        if WORKERS > 1 and os.getenv('UPDATE_MODE', "webhook") == "polling":
+            log.warning("O modo polling usa um único processo (o Telegram só aceita um getUpdates por vez), ignorando WORKERS")
+            WORKERS = 1
 
+        if WORKERS > 1:
+            run_Workers(WORKERS)
+        else:
+            run_Worker()
+    except Exception:
+        log.exception("Não foi possivel inicializar o bot")
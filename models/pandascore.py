@@ -0,0 +1,237 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+
+class Result(NamedTuple):
+    """
+    Placar de um time em uma partida.
+
+    Attributes:
+        team_id (int, optional): Identificador do time.
+        score (int, optional): Mapas vencidos pelo time.
+    """
+    team_id: Optional[int]
+    score: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
+class Stream:
+    """
+    Transmissão de uma partida.
+
+    Attributes:
+        raw_url (str, optional): Link da transmissão.
+        language (str, optional): Idioma da transmissão (ex.: 'en', 'br').
+        main (bool): Se é a transmissão principal.
+        official (bool): Se é uma transmissão oficial.
+    """
+    raw_url: Optional[str]
+    language: Optional[str]
+    main: bool
+    official: bool
+
+    @classmethod
+    def from_api(cls, data: dict) -> "Stream":
+        """Cria a transmissão a partir de um item de `streams_list`."""
+        return cls(
+            raw_url=data.get("raw_url"),
+            language=data.get("language"),
+            main=bool(data.get("main", False)),
+            official=bool(data.get("official", False))
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Player:
+    """
+    Jogador de um time.
+
+    Attributes:
+        id (int, optional): Identificador do jogador.
+        name (str, optional): Nickname do jogador.
+        age (int, optional): Idade.
+        nationality (str, optional): Nacionalidade (código do país).
+        birthday (str, optional): Data de nascimento.
+        image_url (str, optional): Foto do jogador.
+    """
+    id: Optional[int]
+    name: Optional[str]
+    age: Optional[int]
+    nationality: Optional[str]
+    birthday: Optional[str]
+    image_url: Optional[str]
+
+    @classmethod
+    def from_api(cls, data: dict) -> "Player":
+        """Cria o jogador a partir de um item de `players`."""
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            age=data.get("age"),
+            nationality=data.get("nationality"),
+            birthday=data.get("birthday"),
+            image_url=data.get("image_url")
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Team:
+    """
+    Time, como oponente de uma partida ou com o elenco completo (`/teams`).
+
+    Attributes:
+        id (int, optional): Identificador do time.
+        name (str, optional): Nome do time.
+        acronym (str, optional): Sigla do time.
+        image_url (str, optional): Logo do time.
+        players (Tuple[Player, ...]): Elenco (vazio quando o time vem como oponente).
+    """
+    id: Optional[int]
+    name: Optional[str]
+    acronym: Optional[str]
+    image_url: Optional[str]
+    players: Tuple[Player, ...] = ()
+
+    @classmethod
+    def from_api(cls, data: dict) -> "Team":
+        """Cria o time a partir de um item de `/teams` ou do campo `opponent` de uma partida."""
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            acronym=data.get("acronym"),
+            image_url=data.get("image_url"),
+            players=tuple(Player.from_api(player) for player in data.get("players") or ())
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    """
+    Partida de CS da FURIA, com os campos derivados já calculados.
+
+    Attributes:
+        id (int, optional): Identificador da partida.
+        name (str, optional): Nome da partida.
+        status (str, optional): 'not_started', 'running', 'finished', ...
+        begin_at (str, optional): Início da partida (ISO 8601, UTC).
+        end_at (str, optional): Fim da partida (ISO 8601, UTC).
+        begin_at_display (str, optional): Início formatado como 'DD/MM/AAAA HH:MM'.
+        opponents (Tuple[Team, ...]): Times da partida, na ordem da API.
+        results (Tuple[Result, ...]): Placar de mapas por time, na ordem da API.
+        winner (Team, optional): Time vencedor.
+        winner_id (int, optional): Identificador do time vencedor.
+        serie_name (str, optional): Nome completo da série.
+        league_name (str, optional): Nome da liga.
+        tournament_name (str, optional): Nome da etapa do torneio.
+        prizepool (str, optional): Premiação do torneio.
+        streams (Tuple[Stream, ...]): Transmissões da partida.
+        highlight_url (str, optional): Transmissão oficial em inglês ou português, escolhida
+            a partir do fim da lista ('#' se não houver; None sem transmissões).
+        live_urls (Tuple[str, ...]): Transmissões principais em inglês, espanhol ou português.
+        main_stream_url (str, optional): Transmissão principal (ou a primeira da lista).
+    """
+    id: Optional[int]
+    name: Optional[str]
+    status: Optional[str]
+    begin_at: Optional[str]
+    end_at: Optional[str]
+    begin_at_display: Optional[str]
+    opponents: Tuple[Team, ...]
+    results: Tuple[Result, ...]
+    winner: Optional[Team]
+    winner_id: Optional[int]
+    serie_name: Optional[str]
+    league_name: Optional[str]
+    tournament_name: Optional[str]
+    prizepool: Optional[str]
+    streams: Tuple[Stream, ...]
+    highlight_url: Optional[str]
+    live_urls: Tuple[str, ...]
+    main_stream_url: Optional[str]
+
+    @classmethod
+    def from_api(cls, data: dict) -> "Match":
+        """
+        Cria a partida a partir de um item das respostas de `/matches`.
+
+        Args:
+            data (dict): Partida retornada pela API PandaScore.
+
+        Returns:
+            Match: Partida com os campos derivados calculados.
+        """
+        streams = tuple(Stream.from_api(stream) for stream in data.get("streams_list") or ())
+        winner = data.get("winner")
+        serie = data.get("serie") or {}
+        league = data.get("league") or {}
+        tournament = data.get("tournament") or {}
+
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            status=data.get("status"),
+            begin_at=data.get("begin_at"),
+            end_at=data.get("end_at"),
+            begin_at_display=_display_Time(data.get("begin_at")),
+            opponents=tuple(Team.from_api(opponent.get("opponent") or {}) for opponent in data.get("opponents") or ()),
+            results=tuple(Result(result.get("team_id"), result.get("score")) for result in data.get("results") or ()),
+            winner=Team.from_api(winner) if winner else None,
+            winner_id=data.get("winner_id"),
+            serie_name=serie.get("full_name"),
+            league_name=league.get("name"),
+            tournament_name=tournament.get("name"),
+            prizepool=tournament.get("prizepool"),
+            streams=streams,
+            highlight_url=_highlight_Url(streams),
+            live_urls=tuple(stream.raw_url for stream in streams if stream.main and stream.language in ("en", "es", "br")),
+            main_stream_url=next((stream.raw_url for stream in streams if stream.main), None) or (streams[0].raw_url if streams else None)
+        )
+
+
+def parse_Matches(data: list) -> Tuple[Match, ...]:
+    """
+    Converte a resposta de um endpoint de partidas em objetos `Match`.
+
+    Args:
+        data (list): Lista de partidas retornada pela API.
+
+    Returns:
+        Tuple[Match, ...]: Partidas na ordem da API.
+    """
+    return tuple(Match.from_api(partida) for partida in data)
+
+
+def parse_Teams(data: list) -> Tuple[Team, ...]:
+    """
+    Converte a resposta de `/teams` em objetos `Team`.
+
+    Args:
+        data (list): Lista de times retornada pela API.
+
+    Returns:
+        Tuple[Team, ...]: Times na ordem da API.
+    """
+    return tuple(Team.from_api(time) for time in data)
+
+
+def _display_Time(begin_at: Optional[str]) -> Optional[str]:
+    """Formata um horário ISO 8601 como 'DD/MM/AAAA HH:MM' (None se ausente ou inválido)."""
+    if not begin_at:
+        return None
+    try:
+        return datetime.fromisoformat(begin_at).strftime("%d/%m/%Y %H:%M")
+    except ValueError:
+        return None
+
+
+def _highlight_Url(streams: Tuple[Stream, ...]) -> Optional[str]:
+    """
+    Escolhe a transmissão dos melhores momentos: a oficial em inglês ou português mais ao
+    fim da lista, onde a PandaScore costuma colocar a oficial.
+    """
+    if not streams:
+        return None
+    for stream in reversed(streams):
+        if stream.official and stream.language in ("en", "br"):
+            return stream.raw_url
+    return "#"
@@ -1,5 +1,6 @@
 import aiohttp
-from typing import Optional, Dict, Any
+from utils import json_codec
+from typing import Optional, Dict, Any, Tuple
 
 class APIClient:
     """
@@ -10,24 +11,147 @@ class APIClient:
     cabeçalhos. Projetada para ser estendida por classes específicas, como clientes para a
     API PandaScore.
 
+    Mantém uma única sessão aiohttp (e seu pool de conexões) durante toda a vida do cliente,
+    reaproveitando conexões keep-alive e o cache de DNS entre as requisições.
+
     Attributes:
         base_url (str): URL base da API, sem barras finais.
         api_key (str, optional): Chave de autenticação da API, usada em cabeçalhos
             Authorization, se fornecida.
+        stats (Dict[str, int]): Contadores de uso do pool de conexões (requisições,
+            conexões criadas/reutilizadas e acertos/falhas do cache de DNS), de respostas
+            304 e de bytes recebidos.
     """
-    
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 60,
+        ttl_dns_cache: int = 300
+    ):
         """
         Inicializa o cliente HTTP com a URL base e uma chave de API opcional.
 
+        A sessão HTTP não é criada aqui, pois precisa de um event loop em execução. Ela é
+        aberta em `start()` (ou na primeira requisição) e fechada em `close()`.
+
         Args:
             base_url (str): URL base da API (ex.: 'https://api.pandascore.co').
             api_key (str, optional): Chave de autenticação da API. Se None, não adiciona
                 cabeçalho Authorization. Defaults to None.
+            limit (int): Máximo de conexões simultâneas no pool. Defaults to 100.
+            limit_per_host (int): Máximo de conexões simultâneas por host. Defaults to 20.
+            keepalive_timeout (float): Tempo em segundos que uma conexão ociosa fica aberta
+                para reuso. Defaults to 60.
+            ttl_dns_cache (int): Tempo em segundos que uma resolução de DNS fica em cache.
+                Defaults to 300.
         """
         self.base_url = base_url.strip('/')
         self.api_key = api_key
 
+        # Configuração do pool de conexões compartilhado
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._ttl_dns_cache = ttl_dns_cache
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "not_modified": 0,
+            "bytes_received": 0
+        }
+
+    async def start(self):
+        """
+        Abre a sessão HTTP compartilhada e o pool de conexões.
+
+        Deve ser chamado uma vez na inicialização da aplicação, com o event loop rodando.
+        Chamadas repetidas não têm efeito enquanto a sessão estiver aberta.
+
+        Returns:
+            None
+        """
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self._limit,
+            limit_per_host=self._limit_per_host,
+            keepalive_timeout=self._keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self._ttl_dns_cache,
+            enable_cleanup_closed=True
+        )
+
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10),
+            trace_configs=[self._create_TraceConfig()]
+        )
+
+    async def get_Session(self) -> aiohttp.ClientSession:
+        """
+        Retorna a sessão HTTP compartilhada (abrindo-a se preciso), para outros componentes
+        reaproveitarem o pool de conexões. O cabeçalho Authorization é adicionado por
+        requisição, então não vai junto nas requisições feitas por eles.
+
+        Returns:
+            aiohttp.ClientSession: Sessão aberta.
+        """
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    async def close(self):
+        """
+        Fecha a sessão HTTP compartilhada e libera as conexões do pool.
+
+        Deve ser chamado no encerramento da aplicação.
+
+        Returns:
+            None
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _create_TraceConfig(self) -> aiohttp.TraceConfig:
+        """
+        Cria os ganchos de rastreamento do aiohttp que alimentam os contadores em `stats`.
+
+        Returns:
+            aiohttp.TraceConfig: Configuração de rastreamento para a sessão.
+        """
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, ctx, params):
+            self.stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.stats["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.stats["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.stats["dns_cache_misses"] += 1
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+
+        return trace_config
+
     async def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Executa uma requisição HTTP assíncrona e retorna a resposta em JSON.
@@ -54,25 +178,110 @@ class APIClient:
             >>> print(response)
             {'matches': [...]}
         """
+        return json_codec.loads(await self._request_raw(method, endpoint, params=params, headers=headers))
+
+    async def _request_raw(self, method: str, endpoint: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> bytes:
+        """
+        Executa uma requisição HTTP assíncrona e retorna o corpo bruto da resposta.
+
+        Mesmo comportamento de `_request`, mas sem parsear o JSON, para quem precisa
+        guardar os bytes originais (ex.: cache em disco).
+
+        Args:
+            method (str): Método HTTP (ex.: 'GET', 'POST').
+            endpoint (str): Endpoint da API, relativo à URL base (ex.: 'matches').
+            params (Dict, optional): Parâmetros de consulta a serem incluídos na URL.
+                Defaults to None.
+            headers (Dict, optional): Cabeçalhos HTTP adicionais. Defaults to None.
+
+        Returns:
+            bytes: Corpo da resposta.
+        """
+        _, body, _ = await self._perform(method, endpoint, params=params, headers=headers)
+        return body
+
+    async def _request_Conditional(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Tuple[int, bytes, Dict[str, Optional[str]]]:
+        """
+        Executa uma requisição condicional (revalidação com ETag/Last-Modified).
+
+        Envia `If-None-Match` e `If-Modified-Since` com os validadores da resposta
+        anterior. Se o servidor responder 304, o corpo vem vazio e os dados já guardados
+        continuam válidos.
+
+        Args:
+            method (str): Método HTTP (ex.: 'GET').
+            endpoint (str): Endpoint da API, relativo à URL base.
+            params (Dict, optional): Parâmetros de consulta. Defaults to None.
+            etag (str, optional): ETag da resposta anterior. Defaults to None.
+            last_modified (str, optional): Last-Modified da resposta anterior.
+                Defaults to None.
+
+        Returns:
+            Tuple[int, bytes, Dict[str, Optional[str]]]: Status HTTP (200 ou 304), corpo da
+                resposta e os novos validadores ('etag' e 'last_modified').
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return await self._perform(method, endpoint, params=params, headers=headers)
+
+    async def _perform(self, method: str, endpoint: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> Tuple[int, bytes, Dict[str, Optional[str]]]:
+        """
+        Executa a requisição na sessão compartilhada.
+
+        Args:
+            method (str): Método HTTP (ex.: 'GET', 'POST').
+            endpoint (str): Endpoint da API, relativo à URL base (ex.: 'matches').
+            params (Dict, optional): Parâmetros de consulta a serem incluídos na URL.
+                Defaults to None.
+            headers (Dict, optional): Cabeçalhos HTTP adicionais. Defaults to None.
+
+        Returns:
+            Tuple[int, bytes, Dict[str, Optional[str]]]: Status, corpo e validadores de cache
+                ('etag' e 'last_modified') da resposta.
+        """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        
+
         # Headers padrão + customizados
         final_headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
         if headers:
             final_headers.update(headers)
 
-        async with aiohttp.ClientSession(headers=final_headers) as session:
-            try:
-                async with session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    response.raise_for_status()
-                    return await response.json()
-                    
-            except aiohttp.ClientResponseError as e:
-                raise Exception(f"Erro HTTP {e.status}: {e.message}")
-            except aiohttp.ClientError as e:
-                raise Exception(f"Erro de conexão: {str(e)}")
+        # Garante a sessão compartilhada caso start() nao tenha sido chamado
+        if self._session is None or self._session.closed:
+            await self.start()
+
+        self.stats["requests"] += 1
+
+        try:
+            async with self._session.request(
+                method=method,
+                url=url,
+                params=params,
+                headers=final_headers
+            ) as response:
+                response.raise_for_status()
+                body = await response.read()
+                validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                }
+
+        except aiohttp.ClientResponseError as e:
+            raise Exception(f"Erro HTTP {e.status}: {e.message}")
+        except aiohttp.ClientError as e:
+            raise Exception(f"Erro de conexão: {str(e)}")
+
+        if response.status == 304:
+            self.stats["not_modified"] += 1
+        self.stats["bytes_received"] += len(body)
+        return response.status, body, validators
@@ -0,0 +1,301 @@
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urlencode
+import time
+
+class CachePolicy(NamedTuple):
+    """
+    Política de expiração de uma classe de chaves do cache.
+
+    Attributes:
+        ttl (float): Tempo em segundos em que a entrada é considerada fresca.
+        hard_ttl (float): Tempo máximo em segundos em que a entrada ainda pode ser servida
+            velha enquanto é atualizada em segundo plano.
+    """
+    ttl: float
+    hard_ttl: float
+
+
+class CacheEntry:
+    """
+    Entrada armazenada no cache.
+
+    Attributes:
+        data (Any): Dados armazenados (ou None para uma falha cacheada).
+        timestamp (float): Momento (time.time()) em que a entrada foi gravada.
+        key_class (str): Classe da chave, usada para escolher a política de expiração.
+        error (str, optional): Mensagem de erro quando a entrada representa uma falha da
+            API (cache negativo).
+        etag (str, optional): ETag da resposta, usado para revalidar a entrada.
+        last_modified (str, optional): Last-Modified da resposta, usado para revalidar.
+    """
+    __slots__ = ("data", "timestamp", "key_class", "error", "etag", "last_modified")
+
+    def __init__(
+        self,
+        data: Any,
+        timestamp: float,
+        key_class: str,
+        error: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.data = data
+        self.timestamp = timestamp
+        self.key_class = key_class
+        self.error = error
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def age(self) -> float:
+        """Idade da entrada em segundos."""
+        return time.time() - self.timestamp
+
+
+class TTLCache:
+    """
+    Cache em memória com expiração por classe de chave, limite de tamanho (LRU) e cache
+    negativo de falhas.
+
+    Cada chave pertence a uma classe (ex.: 'partida_andamento', 'time_completo') que define
+    por quanto tempo a entrada é fresca e por quanto tempo ainda pode ser servida velha.
+    Quando o cache passa de `max_size` entradas, a usada há mais tempo é descartada.
+    Falhas da API podem ser gravadas por `negative_ttl` segundos para não repetir a mesma
+    requisição com erro a cada chamada.
+
+    Attributes:
+        policies (Dict[str, CachePolicy]): Política de expiração por classe de chave.
+        default_policy (CachePolicy): Política usada para classes sem política própria.
+        max_size (int): Quantidade máxima de entradas no cache.
+        negative_ttl (float): Tempo em segundos que uma falha fica cacheada.
+        stats (Dict[str, Dict[str, int]]): Contadores por classe de chave ('hits',
+            'stale_hits', 'negative_hits', 'misses', 'evictions').
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        default_policy: CachePolicy = CachePolicy(ttl=300, hard_ttl=1800),
+        max_size: int = 256,
+        negative_ttl: float = 30
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            policies (Dict[str, CachePolicy], optional): Política de expiração por classe de
+                chave. Defaults to None.
+            default_policy (CachePolicy): Política para classes sem política própria.
+                Defaults to CachePolicy(ttl=300, hard_ttl=1800).
+            max_size (int): Quantidade máxima de entradas. Defaults to 256.
+            negative_ttl (float): Tempo em segundos que uma falha fica cacheada.
+                Defaults to 30.
+        """
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """
+        Monta a chave do cache a partir do endpoint e dos parâmetros da requisição.
+
+        Os parâmetros são ordenados, então a mesma consulta sempre gera a mesma chave.
+
+        Args:
+            endpoint (str): Endpoint da API (ex.: 'matches/running').
+            params (Dict, optional): Parâmetros de consulta. Defaults to None.
+
+        Returns:
+            str: Chave no formato 'endpoint?param=valor&...'.
+
+        Example:
+            >>> TTLCache.make_key('/teams', {'filter[id]': 124530})
+            'teams?filter%5Bid%5D=124530'
+        """
+        endpoint = endpoint.strip('/')
+        if not params:
+            return endpoint
+        return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+    def policy_for(self, key_class: str) -> CachePolicy:
+        """
+        Retorna a política de expiração de uma classe de chave.
+
+        Args:
+            key_class (str): Classe da chave.
+
+        Returns:
+            CachePolicy: Política própria da classe ou a política padrão.
+        """
+        return self.policies.get(key_class, self.default_policy)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Retorna a entrada de uma chave, marcando-a como usada recentemente.
+
+        Não verifica a expiração: cabe ao chamador comparar `entry.age` com a política
+        da classe (ou usar `is_fresh`/`is_usable`).
+
+        Args:
+            key (str): Chave do cache.
+
+        Returns:
+            CacheEntry or None: Entrada armazenada ou None se não existir.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """
+        Retorna a entrada de uma chave sem marcá-la como usada nem verificar a expiração.
+
+        Args:
+            key (str): Chave do cache.
+
+        Returns:
+            CacheEntry or None: Entrada armazenada ou None se não existir.
+        """
+        return self._entries.get(key)
+
+    def set(
+        self,
+        key: str,
+        data: Any,
+        key_class: str,
+        timestamp: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> CacheEntry:
+        """
+        Grava dados válidos no cache.
+
+        Args:
+            key (str): Chave do cache.
+            data (Any): Dados a armazenar.
+            key_class (str): Classe da chave.
+            timestamp (float, optional): Momento da busca. Defaults to agora.
+            etag (str, optional): ETag da resposta. Defaults to None.
+            last_modified (str, optional): Last-Modified da resposta. Defaults to None.
+
+        Returns:
+            CacheEntry: Entrada gravada.
+        """
+        entry = CacheEntry(
+            data,
+            time.time() if timestamp is None else timestamp,
+            key_class,
+            etag=etag,
+            last_modified=last_modified
+        )
+        self._store(key, entry)
+        return entry
+
+    def set_error(self, key: str, error: Exception, key_class: str) -> CacheEntry:
+        """
+        Grava uma falha da API no cache (cache negativo).
+
+        Args:
+            key (str): Chave do cache.
+            error (Exception): Erro ocorrido na requisição.
+            key_class (str): Classe da chave.
+
+        Returns:
+            CacheEntry: Entrada de falha gravada.
+        """
+        entry = CacheEntry(None, time.time(), key_class, error=str(error))
+        self._store(key, entry)
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Indica se a entrada pode ser servida sem atualização.
+
+        Para falhas cacheadas, vale o `negative_ttl`.
+
+        Args:
+            entry (CacheEntry): Entrada do cache.
+
+        Returns:
+            bool: True se a entrada ainda estiver fresca.
+        """
+        if entry.error is not None:
+            return entry.age < self.negative_ttl
+        return entry.age < self.policy_for(entry.key_class).ttl
+
+    def is_usable(self, entry: CacheEntry) -> bool:
+        """
+        Indica se a entrada ainda pode ser servida velha enquanto é atualizada.
+
+        Falhas cacheadas nunca são servidas velhas.
+
+        Args:
+            entry (CacheEntry): Entrada do cache.
+
+        Returns:
+            bool: True se a entrada estiver dentro do `hard_ttl` da sua classe.
+        """
+        if entry.error is not None:
+            return False
+        return entry.age < self.policy_for(entry.key_class).hard_ttl
+
+    def record(self, key_class: str, outcome: str):
+        """
+        Incrementa um contador de estatística de uma classe de chave.
+
+        Args:
+            key_class (str): Classe da chave.
+            outcome (str): Nome do contador ('hits', 'stale_hits', 'negative_hits',
+                'misses' ou 'evictions').
+        """
+        self._class_stats(key_class)[outcome] += 1
+
+    def invalidate(self, key: str):
+        """
+        Remove uma chave do cache.
+
+        Args:
+            key (str): Chave do cache.
+        """
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: str, entry: CacheEntry):
+        """
+        Grava a entrada e descarta as usadas há mais tempo se o limite for excedido.
+
+        Args:
+            key (str): Chave do cache.
+            entry (CacheEntry): Entrada a gravar.
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self.record(evicted.key_class, "evictions")
+
+    def _class_stats(self, key_class: str) -> Dict[str, int]:
+        """
+        Retorna (criando se preciso) os contadores de uma classe de chave.
+
+        Args:
+            key_class (str): Classe da chave.
+
+        Returns:
+            Dict[str, int]: Contadores da classe.
+        """
+        stats = self.stats.get(key_class)
+        if stats is None:
+            stats = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0, "evictions": 0}
+            self.stats[key_class] = stats
+        return stats
@@ -0,0 +1,431 @@
+from array import array
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+from utils import json_codec
+from utils.event_log import error_Fields
+import asyncio
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+# Custo fixo estimado por chat: entrada no indice (dict chat_id -> slot, com os dois int) e
+# os arrays de id e da lista do LRU. Medido com tracemalloc para 200 mil chats.
+CHAT_OVERHEAD_BYTES = 136
+
+SNAPSHOT_MAGIC = b"CHATSTATE1\n"
+
+class ChatField(NamedTuple):
+    """
+    Campo do estado de um chat.
+
+    Attributes:
+        name (str): Nome do campo.
+        typecode (str): Tipo do `array` que guarda o campo (ex.: 'b', 'h', 'i', 'I', 'q').
+        default (int): Valor de um chat sem estado ou recém-criado. Defaults to 0.
+    """
+    name: str
+    typecode: str
+    default: int = 0
+
+
+class ChatStateStore:
+    """
+    Estado por chat em memória, compacto e limitado.
+
+    Cada chat ocupa um slot; cada campo é um `array` tipado indexado pelo slot, então o
+    estado de um chat são alguns bytes por campo em vez de um objeto Python. Um dicionário
+    liga o `chat_id` ao slot e a ordem de uso (LRU) é uma lista duplamente ligada guardada
+    em mais dois arrays, sem um objeto por nó. Cheio, o chat usado há mais tempo é
+    descartado e o slot reaproveitado, então a memória para de crescer em `capacity`
+    chats (definida por `max_chats` e `memory_budget`), qualquer que seja a quantidade
+    de chats que já falaram com o bot.
+
+    Os campos são registrados pelos componentes que os usam (`register`). Com `path`, o
+    estado é gravado a cada `snapshot_interval` segundos (só se mudou) e no `stop()`, e
+    relido no `start()`; a gravação e a leitura acontecem em uma thread.
+
+    Attributes:
+        capacity (int): Quantidade máxima de chats em memória.
+        path (str, optional): Arquivo de snapshot. Se None, o estado fica só em memória.
+        snapshot_interval (float): Intervalo em segundos entre snapshots.
+        stats (dict): Chats criados, descartados pelo LRU e snapshots gravados.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[ChatField] = (),
+        max_chats: Optional[int] = None,
+        memory_budget: int = 32 * 1024 * 1024,
+        path: Optional[str] = None,
+        snapshot_interval: float = 300.0
+    ):
+        """
+        Inicializa o armazenamento vazio.
+
+        Args:
+            fields (Sequence[ChatField]): Campos iniciais. Defaults to ().
+            max_chats (int, optional): Limite de chats, além do orçamento de memória.
+                Defaults to None.
+            memory_budget (int): Orçamento aproximado em bytes (índice, LRU e campos).
+                Defaults to 32 MiB.
+            path (str, optional): Arquivo de snapshot. Defaults to None.
+            snapshot_interval (float): Intervalo em segundos entre snapshots.
+                Defaults to 300.0.
+        """
+        self.max_chats = max_chats
+        self.memory_budget = memory_budget
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+
+        self._fields: Dict[str, ChatField] = {}
+        self._values: Dict[str, array] = {}
+        self._slots: Dict[int, int] = {}
+        self._ids = array('q')
+        # Lista do LRU: -1 marca o fim; _head e o mais recente e _tail o mais antigo
+        self._prev = array('i')
+        self._next = array('i')
+        self._head = -1
+        self._tail = -1
+        self._free = array('i')
+
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self.capacity = 0
+        self.stats = {"created": 0, "evicted": 0, "snapshots": 0}
+
+        self.register(*fields)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._slots
+
+    @property
+    def fields(self) -> Tuple[ChatField, ...]:
+        """Campos registrados, na ordem de registro."""
+        return tuple(self._fields.values())
+
+    def memory_Bytes(self) -> int:
+        """Estimativa dos bytes usados pelos chats em memória."""
+        return len(self._ids) * self._bytes_PerChat()
+
+    def register(self, *fields: ChatField):
+        """
+        Registra campos novos (um campo já registrado com o mesmo tipo é ignorado).
+
+        A capacidade é recalculada com o custo dos novos campos e, se diminuir, os chats
+        usados há mais tempo são descartados.
+
+        Args:
+            *fields (ChatField): Campos a registrar.
+
+        Raises:
+            ValueError: Se um campo já existir com outro tipo.
+        """
+        for field in fields:
+            atual = self._fields.get(field.name)
+            if atual is not None:
+                if atual.typecode != field.typecode:
+                    raise ValueError(f"Campo {field.name} já registrado com o tipo '{atual.typecode}'")
+                continue
+            self._fields[field.name] = field
+            self._values[field.name] = array(field.typecode, [field.default]) * len(self._ids)
+
+        capacity = max(1, self.memory_budget // self._bytes_PerChat())
+        self.capacity = min(capacity, self.max_chats) if self.max_chats is not None else capacity
+        while len(self._slots) > self.capacity:
+            self._evict()
+
+    def get(self, chat_id: int, name: str) -> int:
+        """
+        Lê um campo do chat (o default do campo se o chat não tiver estado).
+
+        Args:
+            chat_id (int): Identificador do chat.
+            name (str): Nome do campo.
+
+        Returns:
+            int: Valor do campo.
+        """
+        slot = self._slots.get(chat_id)
+        if slot is None:
+            return self._fields[name].default
+        self._touch(slot)
+        return self._values[name][slot]
+
+    def get_Many(self, chat_id: int, *names: str) -> Optional[Tuple[int, ...]]:
+        """
+        Lê vários campos do chat de uma vez.
+
+        Args:
+            chat_id (int): Identificador do chat.
+            *names (str): Nomes dos campos.
+
+        Returns:
+            Tuple[int, ...] or None: Valores na ordem pedida ou None se o chat não tiver estado.
+        """
+        slot = self._slots.get(chat_id)
+        if slot is None:
+            return None
+        self._touch(slot)
+        return tuple(self._values[name][slot] for name in names)
+
+    def set(self, chat_id: int, **values: int):
+        """
+        Grava campos do chat, criando o estado (e descartando o chat mais antigo, se
+        necessário) na primeira gravação.
+
+        Args:
+            chat_id (int): Identificador do chat.
+            **values (int): Campos e valores.
+
+        Raises:
+            KeyError: Se um campo não estiver registrado.
+            OverflowError: Se um valor não couber no tipo do campo.
+        """
+        slot = self._slots.get(chat_id)
+        if slot is None:
+            slot = self._allocate(chat_id)
+        else:
+            self._touch(slot)
+        for name, value in values.items():
+            self._values[name][slot] = value
+        self._dirty = True
+
+    def forget(self, chat_id: int) -> bool:
+        """
+        Apaga o estado do chat.
+
+        Args:
+            chat_id (int): Identificador do chat.
+
+        Returns:
+            bool: True se o chat tinha estado.
+        """
+        slot = self._slots.pop(chat_id, None)
+        if slot is None:
+            return False
+        self._release(slot)
+        self._dirty = True
+        return True
+
+    def _bytes_PerChat(self) -> int:
+        return CHAT_OVERHEAD_BYTES + sum(values.itemsize for values in self._values.values())
+
+    def _allocate(self, chat_id: int) -> int:
+        if len(self._slots) >= self.capacity:
+            self._evict()
+
+        if self._free:
+            slot = self._free.pop()
+            for name, field in self._fields.items():
+                self._values[name][slot] = field.default
+        else:
+            slot = len(self._ids)
+            self._ids.append(0)
+            self._prev.append(-1)
+            self._next.append(-1)
+            for name, field in self._fields.items():
+                self._values[name].append(field.default)
+
+        self._ids[slot] = chat_id
+        self._slots[chat_id] = slot
+        self._link_Head(slot)
+        self.stats["created"] += 1
+        return slot
+
+    def _evict(self):
+        slot = self._tail
+        del self._slots[self._ids[slot]]
+        self._release(slot)
+        self.stats["evicted"] += 1
+
+    def _release(self, slot: int):
+        self._unlink(slot)
+        self._ids[slot] = 0
+        self._free.append(slot)
+
+    def _touch(self, slot: int):
+        if slot != self._head:
+            self._unlink(slot)
+            self._link_Head(slot)
+
+    def _link_Head(self, slot: int):
+        self._prev[slot] = -1
+        self._next[slot] = self._head
+        if self._head != -1:
+            self._prev[self._head] = slot
+        self._head = slot
+        if self._tail == -1:
+            self._tail = slot
+
+    def _unlink(self, slot: int):
+        prev, nxt = self._prev[slot], self._next[slot]
+        if prev != -1:
+            self._next[prev] = nxt
+        else:
+            self._head = nxt
+        if nxt != -1:
+            self._prev[nxt] = prev
+        else:
+            self._tail = prev
+
+    async def start(self):
+        """
+        Carrega o snapshot (se houver) e inicia a gravação periódica.
+
+        Returns:
+            None
+        """
+        if not self.path:
+            return
+        await self.load()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Encerra a gravação periódica e grava o snapshot final.
+
+        Returns:
+            None
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.path and self._dirty:
+            await self.save()
+
+    async def load(self):
+        """
+        Lê o snapshot em uma thread e substitui o estado em memória.
+
+        Campos do arquivo que não estão registrados (ou mudaram de tipo) são ignorados e
+        campos novos começam no default. Se o arquivo tiver mais chats que a capacidade,
+        ficam os usados mais recentemente.
+
+        Returns:
+            None
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            ids, values = await loop.run_in_executor(None, _read_Snapshot, self.path, self.fields)
+        except Exception as e:
+            log.warning("Não foi possivel carregar o estado dos chats", extra=error_Fields(e))
+            return
+
+        # Os chats vem do mais antigo ao mais recente: os excedentes sao os primeiros
+        inicio = max(0, len(ids) - self.capacity)
+        self._restore(ids[inicio:], {name: column[inicio:] for name, column in values.items()})
+
+    async def save(self):
+        """
+        Grava o snapshot em uma thread.
+
+        No event loop só acontece a cópia dos arrays; a ordem do LRU é percorrida e o
+        arquivo escrito na thread, com troca atômica do arquivo anterior.
+
+        Returns:
+            None
+        """
+        copia = (
+            array('q', self._ids), array('i', self._next), self._head,
+            {name: array(values.typecode, values) for name, values in self._values.items()}
+        )
+        self._dirty = False
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, _write_Snapshot, self.path, self.fields, copia)
+            self.stats["snapshots"] += 1
+        except Exception as e:
+            self._dirty = True
+            log.warning("Não foi possivel gravar o estado dos chats", extra=error_Fields(e))
+
+    def _restore(self, ids: array, values: Dict[str, array]):
+        """Recria o estado a partir de chats em ordem do mais antigo ao mais recente."""
+        n = len(ids)
+        self._ids = ids
+        self._slots = {chat_id: slot for slot, chat_id in enumerate(ids)}
+        # Slot i e o i-esimo mais antigo: o anterior (mais recente) e i + 1 e o proximo e i - 1
+        self._prev = array('i', range(1, n + 1))
+        self._next = array('i', range(-1, n - 1))
+        if n:
+            self._prev[n - 1] = -1
+        self._head = n - 1
+        self._tail = 0 if n else -1
+        self._free = array('i')
+        for name, field in self._fields.items():
+            self._values[name] = values.get(name) or array(field.typecode, [field.default]) * n
+        self._dirty = False
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            if self._dirty:
+                await self.save()
+
+
+def _write_Snapshot(path: str, fields: Tuple[ChatField, ...], copia: tuple):
+    """
+    Grava o snapshot: cabeçalho JSON com os campos e a quantidade de chats, seguido dos
+    arrays de ids e de cada campo, do chat mais antigo ao mais recente. Executado em uma
+    thread.
+    """
+    ids, nxt, head, values = copia
+
+    # "next" aponta do mais recente para o mais antigo: percorre a partir do head e inverte
+    ordem = array('i')
+    slot = head
+    while slot != -1:
+        ordem.append(slot)
+        slot = nxt[slot]
+    ordem.reverse()
+
+    header = {"fields": [[field.name, field.typecode] for field in fields], "count": len(ordem)}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(SNAPSHOT_MAGIC)
+        file.write(json_codec.dumps(header) + b"\n")
+        file.write(array('q', (ids[slot] for slot in ordem)).tobytes())
+        for field in fields:
+            column = values[field.name]
+            file.write(array(field.typecode, (column[slot] for slot in ordem)).tobytes())
+    os.replace(tmp_path, path)
+
+
+def _read_Snapshot(path: str, fields: Tuple[ChatField, ...]) -> Tuple[array, Dict[str, array]]:
+    """
+    Lê um snapshot gravado por `_write_Snapshot`. Executado em uma thread.
+
+    Returns:
+        tuple: (ids do mais antigo ao mais recente, {campo: valores na mesma ordem}) só
+            com os campos registrados que têm o mesmo tipo no arquivo.
+
+    Raises:
+        ValueError: Se o arquivo não for um snapshot válido.
+    """
+    with open(path, 'rb') as file:
+        if file.readline() != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} não é um snapshot do estado dos chats")
+        header = json_codec.loads(file.readline())
+        count = header["count"]
+
+        ids = array('q')
+        ids.frombytes(file.read(count * ids.itemsize))
+
+        registrados = {field.name: field.typecode for field in fields}
+        values: Dict[str, array] = {}
+        for name, typecode in header["fields"]:
+            column = array(typecode)
+            column.frombytes(file.read(count * column.itemsize))
+            if registrados.get(name) == typecode:
+                values[name] = column
+
+    if len(ids) != count or any(len(column) != count for column in values.values()):
+        raise ValueError(f"Snapshot truncado: {path}")
+    return ids, values
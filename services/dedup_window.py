@@ -0,0 +1,107 @@
+from typing import Dict, Hashable, List, Optional
+import time
+
+# Marca o lugar de uma chave removida com `discard` (o lugar no buffer so vaga ao vencer)
+_REMOVED = object()
+
+class DedupWindow:
+    """
+    Conjunto limitado das chaves vistas nos últimos `window` segundos.
+
+    As chaves ficam em um buffer circular pré-alocado (em ordem de chegada) e em um
+    dicionário (chave -> posição no buffer) para a busca em O(1). Como os horários
+    crescem junto com a ordem do buffer, as chaves vencidas estão sempre no início e
+    saem sem varrer o resto. Com o buffer cheio, a chave mais antiga é descartada mesmo
+    dentro da janela, então a memória nunca passa de `capacity` chaves.
+
+    Attributes:
+        window (float): Tempo em segundos em que uma chave repetida é considerada duplicada.
+        capacity (int): Quantidade máxima de chaves mantidas.
+        stats (dict): Chaves novas, duplicadas e descartadas antes do fim da janela.
+    """
+
+    def __init__(self, window: float, capacity: int = 10000):
+        """
+        Inicializa a janela de deduplicação.
+
+        Args:
+            window (float): Duração da janela em segundos.
+            capacity (int): Quantidade máxima de chaves mantidas. Defaults to 10000.
+        """
+        self.window = window
+        self.capacity = capacity
+        self._keys: List[Optional[Hashable]] = [None] * capacity
+        self._times: List[float] = [0.0] * capacity
+        self._head = 0
+        self._size = 0
+        self._seen: Dict[Hashable, int] = {}
+        self.stats = {"new": 0, "duplicates": 0, "evicted": 0}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._expire(time.monotonic())
+        return key in self._seen
+
+    def add(self, key: Hashable):
+        """
+        Registra uma chave. Uma chave ainda dentro da janela não é registrada de novo (ver
+        `seen` para saber se era duplicada).
+
+        Args:
+            key (Hashable): Chave a registrar.
+        """
+        self._expire(time.monotonic())
+        if key in self._seen:
+            return
+
+        if self._size == self.capacity:
+            self._pop()
+            self.stats["evicted"] += 1
+
+        tail = (self._head + self._size) % self.capacity
+        self._keys[tail] = key
+        self._times[tail] = time.monotonic()
+        self._size += 1
+        self._seen[key] = tail
+        self.stats["new"] += 1
+
+    def discard(self, key: Hashable):
+        """
+        Esquece uma chave antes do fim da janela (ex.: atualização reservada que não entrou
+        na fila e deve ser aceita quando o Telegram reenviar).
+
+        Args:
+            key (Hashable): Chave a esquecer.
+        """
+        slot = self._seen.pop(key, None)
+        if slot is not None:
+            self._keys[slot] = _REMOVED
+
+    def seen(self, key: Hashable) -> bool:
+        """
+        Registra uma chave e diz se ela já tinha sido vista dentro da janela.
+
+        Args:
+            key (Hashable): Chave (ex.: `update_id` ou (usuário, mensagem, botão)).
+
+        Returns:
+            bool: True se a chave é duplicada (e não foi registrada de novo).
+        """
+        if key in self:
+            self.stats["duplicates"] += 1
+            return True
+        self.add(key)
+        return False
+
+    def _expire(self, now: float):
+        limite = now - self.window
+        while self._size and self._times[self._head] <= limite:
+            self._pop()
+
+    def _pop(self):
+        self._seen.pop(self._keys[self._head], None)
+        self._keys[self._head] = None
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
@@ -0,0 +1,225 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from utils.event_log import error_Fields
+import asyncio
+import logging
+import sqlite3
+import time
+
+log = logging.getLogger(__name__)
+
+class StoredResponse(NamedTuple):
+    """
+    Resposta gravada no disco.
+
+    Attributes:
+        body (bytes): Bytes da resposta (JSON).
+        fetched_at (float): Momento (time.time()) em que a resposta foi buscada ou revalidada.
+        etag (str, optional): ETag da resposta.
+        last_modified (str, optional): Last-Modified da resposta.
+    """
+    body: bytes
+    fetched_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class DiskCache:
+    """
+    Cache persistente em SQLite para as respostas brutas da API.
+
+    Guarda os bytes de cada resposta junto com o momento em que foi buscada, permitindo que
+    o bot reinicie com o cache "quente". Todo acesso ao banco acontece em uma única thread
+    dedicada, então leituras e escritas nunca bloqueiam o event loop e são executadas na
+    ordem em que foram pedidas.
+
+    O mesmo arquivo pode ser aberto por vários processos (modo com vários workers): a
+    tabela `locks` guarda travas com validade, usadas para que só um processo busque cada
+    chave na API por vez.
+
+    Attributes:
+        path (str): Caminho do arquivo SQLite.
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa o cache em disco. O arquivo só é aberto no primeiro acesso.
+
+        Args:
+            path (str): Caminho do arquivo SQLite (criado se não existir).
+        """
+        self.path = path
+
+        # Uma unica thread garante acesso serializado a conexao SQLite
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-cache")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre (uma única vez) a conexão com o banco e cria a tabela de respostas.
+
+        Executado sempre na thread do cache.
+
+        Returns:
+            sqlite3.Connection: Conexão aberta.
+        """
+        if self._conn is None:
+            # timeout: espera pelo lock de escrita do SQLite quando outro processo esta gravando
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, body BLOB NOT NULL, fetched_at REAL NOT NULL, "
+                "etag TEXT, last_modified TEXT)"
+            )
+
+            # Bancos criados antes dos validadores de cache nao tem as colunas
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+            for column in ("etag", "last_modified"):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS locks ("
+                "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _load_sync(self, key: str) -> Optional[StoredResponse]:
+        row = self._connect().execute(
+            "SELECT body, fetched_at, etag, last_modified FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return StoredResponse(bytes(row[0]), row[1], row[2], row[3]) if row else None
+
+    def _save_sync(self, key: str, body: bytes, fetched_at: float, etag: Optional[str], last_modified: Optional[str]):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, fetched_at, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+            (key, body, fetched_at, etag, last_modified)
+        )
+        conn.commit()
+
+    def _touch_sync(self, key: str, fetched_at: float):
+        conn = self._connect()
+        conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (fetched_at, key))
+        conn.commit()
+
+    def _acquire_sync(self, key: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        conn = self._connect()
+        # Insere a trava ou toma uma que ja expirou (dono que morreu no meio da busca)
+        cursor = conn.execute(
+            "INSERT INTO locks (key, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE locks.expires_at < ?",
+            (key, owner, now + ttl, now)
+        )
+        conn.commit()
+        return cursor.rowcount == 1
+
+    def _release_sync(self, key: str, owner: str):
+        conn = self._connect()
+        conn.execute("DELETE FROM locks WHERE key = ? AND owner = ?", (key, owner))
+        conn.commit()
+
+    def _close_sync(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def load(self, key: str) -> Optional[StoredResponse]:
+        """
+        Lê a resposta gravada para uma chave.
+
+        Args:
+            key (str): Chave do cache.
+
+        Returns:
+            StoredResponse or None: Bytes da resposta, momento da busca e validadores, ou
+                None se a chave não estiver no disco.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._load_sync, key)
+
+    def save(self, key: str, body: bytes, fetched_at: float, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Agenda a gravação de uma resposta no disco sem aguardar sua conclusão.
+
+        Args:
+            key (str): Chave do cache.
+            body (bytes): Bytes da resposta (JSON).
+            fetched_at (float): Momento (time.time()) em que a resposta foi buscada.
+            etag (str, optional): ETag da resposta. Defaults to None.
+            last_modified (str, optional): Last-Modified da resposta. Defaults to None.
+        """
+        self._submit(self._save_sync, key, body, fetched_at, etag, last_modified)
+
+    def touch(self, key: str, fetched_at: float):
+        """
+        Agenda a renovação do momento da busca de uma resposta revalidada (HTTP 304).
+
+        Args:
+            key (str): Chave do cache.
+            fetched_at (float): Momento (time.time()) da revalidação.
+        """
+        self._submit(self._touch_sync, key, fetched_at)
+
+    def _submit(self, func, *args):
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        self._pending.add(future)
+        future.add_done_callback(self._on_saved)
+
+    async def acquire_Lock(self, key: str, owner: str, ttl: float) -> bool:
+        """
+        Tenta obter a trava de busca de uma chave, compartilhada entre processos.
+
+        Args:
+            key (str): Chave do cache.
+            owner (str): Identificador de quem trava (ex.: pid do processo).
+            ttl (float): Validade da trava em segundos; depois disso outro processo pode
+                tomá-la, caso o dono tenha morrido sem liberar.
+
+        Returns:
+            bool: True se a trava foi obtida.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._acquire_sync, key, owner, ttl)
+
+    async def release_Lock(self, key: str, owner: str):
+        """
+        Libera a trava de busca de uma chave.
+
+        Como o acesso ao banco é serializado, uma gravação agendada com `save()` antes desta
+        chamada já está no disco quando a trava é liberada.
+
+        Args:
+            key (str): Chave do cache.
+            owner (str): Identificador usado em `acquire_Lock`.
+
+        Returns:
+            None
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._release_sync, key, owner)
+
+    def _on_saved(self, future: asyncio.Future):
+        self._pending.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            log.warning("Não foi possivel gravar o cache em disco", extra=error_Fields(future.exception()))
+
+    async def close(self):
+        """
+        Aguarda as gravações pendentes e fecha o banco.
+
+        Returns:
+            None
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close_sync)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from services.api_client import APIClient
+from typing import Dict, Optional
+from utils.event_log import error_Fields
+import aiohttp
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+# Tamanho dos pedacos lidos do corpo da imagem
+CHUNK_SIZE = 64 * 1024
+
+class ImagePrefetcher:
+    """
+    Baixa imagens em segundo plano e as mantém em memória para o próximo envio.
+
+    Usado para antecipar as fotos das páginas vizinhas na paginação do time: quando o
+    usuário clica em "Próximo", a imagem já está em memória e é enviada direto ao Telegram,
+    sem que o Telegram precise buscá-la em um servidor externo lento.
+
+    Com `http_client`, os downloads usam a sessão (e o pool de conexões) do cliente da
+    PandaScore em vez de abrir uma própria. O corpo é lido em pedaços e o download é
+    abandonado assim que passa de `max_image_size`, mesmo sem Content-Length.
+
+    Attributes:
+        max_items (int): Quantidade máxima de imagens em memória.
+        max_image_size (int): Tamanho máximo em bytes de uma imagem antecipada.
+        stats (Dict[str, int]): Contadores de downloads, acertos e falhas.
+    """
+
+    def __init__(self, max_items: int = 32, max_image_size: int = 5 * 1024 * 1024, http_client: Optional[APIClient] = None):
+        """
+        Inicializa o antecipador de imagens.
+
+        Args:
+            max_items (int): Quantidade máxima de imagens em memória. Defaults to 32.
+            max_image_size (int): Tamanho máximo em bytes de uma imagem. Defaults to 5 MB.
+            http_client (APIClient, optional): Cliente cuja sessão HTTP é reaproveitada. Se
+                None, abre uma sessão própria. Defaults to None.
+        """
+        self.max_items = max_items
+        self.max_image_size = max_image_size
+        self.http_client = http_client
+
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {"downloaded": 0, "hits": 0, "errors": 0}
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Retorna os bytes de uma imagem já antecipada.
+
+        Args:
+            url (str): URL da imagem.
+
+        Returns:
+            bytes or None: Conteúdo da imagem ou None se ainda não foi baixada.
+        """
+        data = self._images.get(url)
+        if data is not None:
+            self._images.move_to_end(url)
+            self.stats["hits"] += 1
+        return data
+
+    def discard(self, url: str):
+        """
+        Remove uma imagem da memória (ex.: depois que o Telegram já tem o `file_id`).
+
+        Args:
+            url (str): URL da imagem.
+        """
+        self._images.pop(url, None)
+
+    def prefetch(self, url: str):
+        """
+        Agenda o download de uma imagem, se ela ainda não estiver em memória ou baixando.
+
+        Args:
+            url (str): URL da imagem.
+        """
+        if url in self._images or url in self._tasks:
+            return
+        self._tasks[url] = asyncio.create_task(self._download(url))
+
+    async def close(self):
+        """
+        Cancela os downloads pendentes e fecha a sessão HTTP própria (a do `http_client` é
+        fechada pelo dono).
+
+        Returns:
+            None
+        """
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _download(self, url: str):
+        """
+        Baixa a imagem e guarda os bytes em memória (LRU).
+
+        Args:
+            url (str): URL da imagem.
+        """
+        try:
+            session = await self._get_Session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                if (response.content_length or 0) > self.max_image_size:
+                    return
+
+                # Leio em pedacos: sem Content-Length (chunked) o tamanho so se conhece lendo
+                data = bytearray()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    data += chunk
+                    if len(data) > self.max_image_size:
+                        return
+
+            self._images[url] = bytes(data)
+            self.stats["downloaded"] += 1
+            while len(self._images) > self.max_items:
+                self._images.popitem(last=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            log.warning("Não foi possivel antecipar a imagem", extra={**error_Fields(e), "url": url})
+        finally:
+            self._tasks.pop(url, None)
+
+    async def _get_Session(self) -> aiohttp.ClientSession:
+        if self.http_client is not None:
+            return await self.http_client.get_Session()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        return self._session
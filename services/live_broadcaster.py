@@ -0,0 +1,391 @@
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from models.pandascore import Match
+from services.outbound_scheduler import OutboundScheduler, PRIORITY_BULK
+from services.pandas_score_client import PandaScoreClient
+from telebot.asyncio_helper import ApiTelegramException
+from typing import Dict, List, Optional, Tuple
+from utils.event_log import error_Fields
+from utils.formatResponse import format_EventoAoVivo
+import asyncio
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+class SubscriberStore:
+    """
+    Conjunto compacto de chats inscritos nos avisos de partidas ao vivo.
+
+    Os ids ficam em um `array('q')` ordenado (8 bytes por chat), com busca binária para
+    inclusão e remoção. Opcionalmente é persistido em um arquivo binário.
+
+    Com `shared`, o arquivo é compartilhado entre os processos do bot (modo com vários
+    workers): cada inclusão ou remoção é aplicada ao arquivo sob uma trava (`<path>.lock`),
+    e `refresh()` relê o arquivo quando outro processo o alterou.
+
+    Todo acesso ao arquivo acontece em uma única thread dedicada, então as gravações são
+    aplicadas na ordem das alterações e um retrato antigo nunca sobrescreve um mais novo.
+
+    Attributes:
+        path (str, optional): Arquivo de persistência. Se None, fica só em memória.
+        shared (bool): Se o arquivo é compartilhado com outros processos.
+    """
+
+    def __init__(self, path: Optional[str] = None, shared: bool = False):
+        """
+        Inicializa o conjunto de inscritos.
+
+        Args:
+            path (str, optional): Arquivo de persistência. Defaults to None.
+            shared (bool): Compartilha o arquivo com outros processos (exige `path`).
+                Defaults to False.
+        """
+        if shared and not path:
+            raise ValueError("Os inscritos compartilhados entre processos exigem um arquivo")
+        self.path = path
+        self.shared = shared
+        self._ids = array('q')
+        self._mtime: Optional[float] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="subscribers")
+        self._last_save: Optional[asyncio.Future] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, chat_id: int) -> bool:
+        i = bisect_left(self._ids, chat_id)
+        return i < len(self._ids) and self._ids[i] == chat_id
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def add(self, chat_id: int) -> bool:
+        """
+        Inscreve um chat.
+
+        Args:
+            chat_id (int): Identificador do chat.
+
+        Returns:
+            bool: True se o chat foi inscrito agora, False se já estava inscrito.
+        """
+        i = bisect_left(self._ids, chat_id)
+        if i < len(self._ids) and self._ids[i] == chat_id:
+            return False
+        self._ids.insert(i, chat_id)
+        self._schedule_Save(chat_id, True)
+        return True
+
+    def remove(self, chat_id: int) -> bool:
+        """
+        Cancela a inscrição de um chat.
+
+        Args:
+            chat_id (int): Identificador do chat.
+
+        Returns:
+            bool: True se o chat estava inscrito.
+        """
+        i = bisect_left(self._ids, chat_id)
+        if i < len(self._ids) and self._ids[i] == chat_id:
+            del self._ids[i]
+            self._schedule_Save(chat_id, False)
+            return True
+        return False
+
+    def snapshot(self) -> array:
+        """Retorna uma cópia dos inscritos, segura para iterar enquanto o conjunto muda."""
+        return array('q', self._ids)
+
+    async def load(self):
+        """
+        Carrega os inscritos do arquivo de persistência, sem bloquear o event loop.
+
+        Returns:
+            None
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            self._mtime = os.stat(self.path).st_mtime
+            self._ids = await loop.run_in_executor(self._executor, self._read_file)
+        except Exception as e:
+            log.warning("Não foi possivel carregar os inscritos", extra=error_Fields(e))
+
+    async def close(self):
+        """
+        Aguarda as gravações pendentes e encerra a thread do arquivo.
+
+        Returns:
+            None
+        """
+        if self._last_save is not None:
+            # A thread e unica: quando a ultima gravacao termina, as anteriores ja terminaram
+            await asyncio.gather(self._last_save, return_exceptions=True)
+            self._last_save = None
+        self._executor.shutdown(wait=False)
+
+    async def refresh(self):
+        """
+        Relê o arquivo se outro processo o alterou (apenas com `shared`).
+
+        Returns:
+            None
+        """
+        if not self.shared or not os.path.exists(self.path):
+            return
+        if os.stat(self.path).st_mtime != self._mtime:
+            await self.load()
+
+    def _schedule_Save(self, chat_id: int, inscrito: bool):
+        """Enfileira a gravação da alteração na thread do arquivo."""
+        if not self.path:
+            return
+        loop = asyncio.get_running_loop()
+        if self.shared:
+            future = loop.run_in_executor(self._executor, self._apply_Shared, chat_id, inscrito)
+        else:
+            future = loop.run_in_executor(self._executor, self._write_file, self.snapshot())
+        future.add_done_callback(self._on_Saved)
+        self._last_save = future
+
+    def _on_Saved(self, future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            log.warning("Não foi possivel gravar os inscritos", extra=error_Fields(future.exception()))
+
+    def _read_file(self) -> array:
+        ids = array('q')
+        with open(self.path, 'rb') as file:
+            ids.frombytes(file.read())
+        return array('q', sorted(set(ids)))
+
+    def _write_file(self, ids: array):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            ids.tofile(file)
+        os.replace(tmp_path, self.path)
+
+    def _apply_Shared(self, chat_id: int, inscrito: bool):
+        """
+        Aplica uma inclusão ou remoção ao arquivo compartilhado, sob trava entre processos.
+
+        Args:
+            chat_id (int): Identificador do chat.
+            inscrito (bool): True para incluir, False para remover.
+        """
+        import fcntl
+
+        with open(f"{self.path}.lock", 'wb') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            ids = set(self._read_file()) if os.path.exists(self.path) else set()
+            if inscrito:
+                ids.add(chat_id)
+            else:
+                ids.discard(chat_id)
+            self._write_file(array('q', sorted(ids)))
+
+
+class LiveMatchBroadcaster:
+    """
+    Acompanha as partidas da FURIA e avisa todos os chats inscritos em /seguir.
+
+    Um único poller consulta `matches/running` e `matches/upcoming` (pelo cache do
+    `PandaScoreClient`) a cada `interval` segundos, compara com o estado anterior e detecta
+    início de partida, mudança de placar e fim. Cada evento é formatado uma única vez e
+    enviado a todos os inscritos em lotes, com prioridade baixa no `OutboundScheduler`.
+    O custo na API é de uma consulta por intervalo, independente da quantidade de inscritos.
+
+    Attributes:
+        subscribers (SubscriberStore): Chats inscritos.
+        interval (float): Intervalo em segundos entre consultas.
+        batch_size (int): Quantidade de envios agendados por lote.
+        stats (Dict[str, int]): Contadores de consultas, eventos e envios.
+    """
+
+    def __init__(
+        self,
+        pandas_client: PandaScoreClient,
+        sender: OutboundScheduler,
+        subscribers: SubscriberStore,
+        interval: float = 30.0,
+        batch_size: int = 30,
+        max_missing_polls: int = 20
+    ):
+        """
+        Inicializa o transmissor de eventos ao vivo.
+
+        Args:
+            pandas_client (PandaScoreClient): Cliente da API PandaScore.
+            sender (OutboundScheduler): Agendador de envios ao Telegram.
+            subscribers (SubscriberStore): Chats inscritos.
+            interval (float): Intervalo em segundos entre consultas. Defaults to 30.0.
+            batch_size (int): Quantidade de envios agendados por lote. Defaults to 30.
+            max_missing_polls (int): Consultas que uma partida pode ficar fora da lista ao
+                vivo, sem aparecer como finalizada, antes de ser descartada sem aviso.
+                Defaults to 20.
+        """
+        self.pandas_client = pandas_client
+        self.sender = sender
+        self.subscribers = subscribers
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_missing_polls = max_missing_polls
+
+        # match_id -> placar (tupla de (team_id, score)) da ultima consulta
+        self._running: Optional[Dict[int, Tuple]] = None
+        self._last_seen: Dict[int, Match] = {}
+        self._upcoming: set = set()
+        self._missing: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {"polls": 0, "events": 0, "sent": 0, "failed": 0, "unsubscribed": 0}
+
+    async def start(self):
+        """
+        Carrega os inscritos e inicia o poller.
+
+        Returns:
+            None
+        """
+        await self.subscribers.load()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Encerra o poller e aguarda as gravações pendentes dos inscritos.
+
+        Returns:
+            None
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.subscribers.close()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                log.error("Erro ao acompanhar partidas ao vivo", extra=error_Fields(e))
+            await asyncio.sleep(self.interval)
+
+    async def poll(self):
+        """
+        Faz uma consulta, detecta os eventos e os transmite aos inscritos.
+
+        Sem inscritos, apenas mantém o estado atualizado quando já houver um. A primeira
+        consulta só registra o estado, para não repetir avisos após um reinício.
+
+        Returns:
+            None
+        """
+        await self.subscribers.refresh()
+        if not len(self.subscribers) and self._running is None:
+            return
+
+        self.stats["polls"] += 1
+        running = await self.pandas_client.get_PartidaEmAndamento()
+        upcoming = await self.pandas_client.get_ProximasPartidas()
+
+        current = {partida.id: _placar(partida) for partida in running if partida.id is not None}
+        partidas = {partida.id: partida for partida in running if partida.id is not None}
+
+        if self._running is None:
+            self._running = current
+            self._last_seen = partidas
+            self._upcoming = {partida.id for partida in upcoming}
+            return
+
+        eventos: List[Tuple[str, Match]] = []
+        for match_id, placar in current.items():
+            if match_id not in self._running:
+                eventos.append(("inicio", partidas[match_id]))
+            elif placar != self._running[match_id]:
+                eventos.append(("placar", partidas[match_id]))
+
+        # Uma partida que sumiu da lista so e dada como encerrada quando aparece como finalizada
+        # (ou depois de `max_missing_polls` consultas), pois uma falha da API tambem devolve lista vazia
+        for match_id in self._running.keys() - current.keys():
+            final = await self._partida_Final(match_id)
+            if final is not None:
+                eventos.append(("fim", final))
+                self._missing.pop(match_id, None)
+            elif self._missing.get(match_id, 0) + 1 >= self.max_missing_polls:
+                self._missing.pop(match_id, None)
+            else:
+                self._missing[match_id] = self._missing.get(match_id, 0) + 1
+                current[match_id] = self._running[match_id]
+                partidas[match_id] = self._last_seen[match_id]
+
+        # Partida que saiu das proximas e ja terminou sem ter sido vista ao vivo entre duas consultas
+        upcoming_ids = {partida.id for partida in upcoming}
+        for match_id in self._upcoming - upcoming_ids - current.keys() - self._running.keys():
+            ultima = await self.pandas_client.get_UltimaPartida()
+            if ultima and ultima[0].id == match_id:
+                eventos.append(("fim", ultima[0]))
+
+        self._running = current
+        self._last_seen = partidas
+        self._upcoming = upcoming_ids
+
+        for evento, partida in eventos:
+            self.stats["events"] += 1
+            await self.broadcast(format_EventoAoVivo(evento, partida))
+
+    async def _partida_Final(self, match_id: int) -> Optional[Match]:
+        """
+        Busca os dados finais de uma partida que saiu da lista de partidas ao vivo.
+
+        Args:
+            match_id (int): Identificador da partida.
+
+        Returns:
+            Match or None: Partida finalizada ou None se a última partida finalizada
+                ainda não for ela.
+        """
+        ultima = await self.pandas_client.get_UltimaPartida()
+        if ultima and ultima[0].id == match_id:
+            return ultima[0]
+        return None
+
+    async def broadcast(self, text: str):
+        """
+        Envia a mesma mensagem a todos os inscritos, em lotes.
+
+        Chats que bloquearam o bot (erro 403) têm a inscrição cancelada.
+
+        Args:
+            text (str): Mensagem já formatada.
+
+        Returns:
+            None
+        """
+        chats = self.subscribers.snapshot()
+
+        for inicio in range(0, len(chats), self.batch_size):
+            lote = chats[inicio:inicio + self.batch_size]
+            resultados = await asyncio.gather(
+                *(self.sender.send_message(chat_id, text=text, parse_mode='Markdown', priority=PRIORITY_BULK) for chat_id in lote),
+                return_exceptions=True
+            )
+
+            for chat_id, resultado in zip(lote, resultados):
+                if not isinstance(resultado, Exception):
+                    self.stats["sent"] += 1
+                    continue
+                self.stats["failed"] += 1
+                if isinstance(resultado, ApiTelegramException) and resultado.error_code == 403:
+                    self.subscribers.remove(chat_id)
+                    self.stats["unsubscribed"] += 1
+
+
+def _placar(partida: Match) -> Tuple:
+    """Extrai o placar de mapas de uma partida como tupla comparável."""
+    return tuple((result.team_id, result.score) for result in partida.results)
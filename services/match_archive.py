@@ -0,0 +1,309 @@
+from concurrent.futures import ThreadPoolExecutor
+from models.pandascore import Match
+from services.pandas_score_client import FURIA_ID, PandaScoreClient
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from utils.event_log import error_Fields
+import asyncio
+import logging
+import sqlite3
+import time
+
+log = logging.getLogger(__name__)
+
+class ArchivedMatch(NamedTuple):
+    """
+    Partida finalizada guardada no arquivo local.
+
+    Attributes:
+        id (int): Identificador da partida.
+        begin_at (str): Início da partida (ISO 8601, UTC).
+        opponent_name (str, optional): Nome do adversário.
+        furia_score (int, optional): Mapas vencidos pela FURIA.
+        opponent_score (int, optional): Mapas vencidos pelo adversário.
+        won (bool, optional): Se a FURIA venceu (None sem vencedor, ex.: partida cancelada).
+        serie_name (str, optional): Nome completo da série.
+    """
+    id: int
+    begin_at: str
+    opponent_name: Optional[str]
+    furia_score: Optional[int]
+    opponent_score: Optional[int]
+    won: Optional[bool]
+    serie_name: Optional[str]
+
+
+class HeadToHead(NamedTuple):
+    """
+    Retrospecto da FURIA contra um adversário.
+
+    Attributes:
+        opponent_name (str): Nome do adversário encontrado.
+        wins (int): Vitórias da FURIA.
+        losses (int): Derrotas da FURIA.
+        recent (Tuple[ArchivedMatch, ...]): Confrontos mais recentes primeiro.
+    """
+    opponent_name: str
+    wins: int
+    losses: int
+    recent: Tuple[ArchivedMatch, ...]
+
+
+_COLUMNS = "id, begin_at, opponent_name, furia_score, opponent_score, winner_id, serie_name"
+
+class MatchArchive:
+    """
+    Arquivo local (SQLite) das partidas finalizadas da FURIA.
+
+    Guarda uma linha por partida, com índices por data, adversário e série, e responde o
+    retrospecto contra um adversário e a fase recente sem nenhuma consulta à PandaScore.
+    Uma tarefa em segundo plano sincroniza o arquivo a cada `interval` segundos de forma
+    incremental: pede só as partidas com início a partir da mais recente já guardada
+    (cursor em `begin_at`), página por página.
+
+    Como no `DiskCache`, todo acesso ao banco acontece em uma única thread dedicada. Com
+    vários workers, o arquivo é compartilhado: só o processo principal sincroniza e todos
+    leem.
+
+    Attributes:
+        path (str): Caminho do arquivo SQLite (':memory:' para manter só em memória).
+        interval (float): Intervalo em segundos entre sincronizações.
+        page_size (int): Partidas pedidas por página.
+        stats (dict): Sincronizações, páginas buscadas, partidas gravadas e erros.
+    """
+
+    def __init__(self, path: str, pandas_client: PandaScoreClient, interval: float = 3600.0, page_size: int = 100):
+        """
+        Inicializa o arquivo de partidas. O banco só é aberto no primeiro acesso.
+
+        Args:
+            path (str): Caminho do arquivo SQLite (criado se não existir) ou ':memory:'.
+            pandas_client (PandaScoreClient): Cliente usado na sincronização.
+            interval (float): Intervalo em segundos entre sincronizações. Defaults to 3600.0.
+            page_size (int): Partidas por página (máximo da API: 100). Defaults to 100.
+        """
+        self.path = path
+        self.pandas_client = pandas_client
+        self.interval = interval
+        self.page_size = page_size
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="match-archive")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {"syncs": 0, "pages": 0, "saved": 0, "errors": 0, "last_sync": 0.0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre (uma única vez) a conexão com o banco e cria a tabela e os índices.
+
+        Executado sempre na thread do arquivo.
+
+        Returns:
+            sqlite3.Connection: Conexão aberta.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS matches ("
+                "id INTEGER PRIMARY KEY, begin_at TEXT NOT NULL, opponent_id INTEGER, "
+                "opponent_name TEXT, opponent_acronym TEXT, furia_score INTEGER, "
+                "opponent_score INTEGER, winner_id INTEGER, serie_name TEXT, "
+                "league_name TEXT, tournament_name TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS matches_begin_at ON matches (begin_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS matches_opponent ON matches (opponent_id, begin_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS matches_opponent_name ON matches (opponent_name COLLATE NOCASE)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS matches_opponent_acronym ON matches (opponent_acronym COLLATE NOCASE)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS matches_serie ON matches (serie_name, begin_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _cursor_sync(self) -> Optional[str]:
+        return self._connect().execute("SELECT MAX(begin_at) FROM matches").fetchone()[0]
+
+    def _save_sync(self, rows: List[tuple]):
+        conn = self._connect()
+        conn.executemany(
+            "INSERT OR REPLACE INTO matches (id, begin_at, opponent_id, opponent_name, opponent_acronym, "
+            "furia_score, opponent_score, winner_id, serie_name, league_name, tournament_name) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+
+    def _recent_sync(self, limit: int) -> Tuple[ArchivedMatch, ...]:
+        rows = self._connect().execute(
+            f"SELECT {_COLUMNS} FROM matches ORDER BY begin_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return tuple(_archived(row) for row in rows)
+
+    def _head_to_head_sync(self, adversario: str, limit: int) -> Optional[HeadToHead]:
+        conn = self._connect()
+
+        # Nome ou sigla exatos primeiro; depois o adversario mais frequente que comeca com o texto
+        row = conn.execute(
+            "SELECT opponent_id, opponent_name FROM matches "
+            "WHERE opponent_name = ? COLLATE NOCASE OR opponent_acronym = ? COLLATE NOCASE "
+            "ORDER BY begin_at DESC LIMIT 1",
+            (adversario, adversario)
+        ).fetchone()
+        if row is None:
+            row = conn.execute(
+                "SELECT opponent_id, opponent_name FROM matches WHERE opponent_name LIKE ? ESCAPE '\\' "
+                "GROUP BY opponent_id ORDER BY COUNT(*) DESC LIMIT 1",
+                (f"{_escape_Like(adversario)}%",)
+            ).fetchone()
+        if row is None:
+            return None
+
+        opponent_id, opponent_name = row
+        wins, losses = conn.execute(
+            "SELECT COUNT(CASE WHEN winner_id = ? THEN 1 END), "
+            "COUNT(CASE WHEN winner_id IS NOT NULL AND winner_id != ? THEN 1 END) "
+            "FROM matches WHERE opponent_id = ?",
+            (FURIA_ID, FURIA_ID, opponent_id)
+        ).fetchone()
+        recent = conn.execute(
+            f"SELECT {_COLUMNS} FROM matches WHERE opponent_id = ? ORDER BY begin_at DESC LIMIT ?",
+            (opponent_id, limit)
+        ).fetchall()
+        return HeadToHead(opponent_name, wins, losses, tuple(_archived(r) for r in recent))
+
+    def _close_sync(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def _call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def sync(self) -> int:
+        """
+        Busca na PandaScore as partidas finalizadas a partir da mais recente já guardada.
+
+        O cursor é inclusivo: as partidas que começaram no mesmo instante da última guardada
+        voltam e são regravadas (a chave é o id), então nenhuma partida se perde entre duas
+        sincronizações.
+
+        Returns:
+            int: Quantidade de partidas gravadas (novas ou atualizadas).
+        """
+        cursor = await self._call(self._cursor_sync)
+        gravadas = 0
+        page = 1
+
+        while True:
+            partidas = await self.pandas_client.get_PartidasFinalizadas(cursor, page=page, per_page=self.page_size)
+            self.stats["pages"] += 1
+
+            rows = [row for row in (_row(partida) for partida in partidas) if row is not None]
+            if rows:
+                await self._call(self._save_sync, rows)
+                gravadas += len(rows)
+
+            if len(partidas) < self.page_size:
+                break
+            page += 1
+
+        self.stats["syncs"] += 1
+        self.stats["saved"] += gravadas
+        self.stats["last_sync"] = time.time()
+        return gravadas
+
+    async def recent_Form(self, limit: int = 5) -> Tuple[ArchivedMatch, ...]:
+        """
+        Retorna as últimas partidas da FURIA guardadas no arquivo.
+
+        Args:
+            limit (int): Quantidade de partidas. Defaults to 5.
+
+        Returns:
+            Tuple[ArchivedMatch, ...]: Partidas, da mais recente para a mais antiga.
+        """
+        return await self._call(self._recent_sync, limit)
+
+    async def head_To_Head(self, adversario: str, limit: int = 5) -> Optional[HeadToHead]:
+        """
+        Retorna o retrospecto da FURIA contra um adversário.
+
+        O adversário é procurado pelo nome ou pela sigla exatos (sem diferenciar
+        maiúsculas) e, se não houver, pelo time mais enfrentado cujo nome começa com o texto.
+
+        Args:
+            adversario (str): Nome, sigla ou início do nome do adversário.
+            limit (int): Quantidade de confrontos recentes retornados. Defaults to 5.
+
+        Returns:
+            HeadToHead or None: Retrospecto ou None se a FURIA nunca enfrentou o adversário
+                (ou o arquivo ainda não foi sincronizado).
+        """
+        return await self._call(self._head_to_head_sync, adversario.strip(), limit)
+
+    async def start(self):
+        """
+        Inicia a sincronização periódica em segundo plano.
+
+        Returns:
+            None
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Encerra a sincronização e fecha o banco.
+
+        Returns:
+            None
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._call(self._close_sync)
+        self._executor.shutdown(wait=False)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                self.stats["errors"] += 1
+                log.error("Não foi possivel sincronizar o arquivo de partidas", extra=error_Fields(e))
+            await asyncio.sleep(self.interval)
+
+
+def _row(partida: Match) -> Optional[tuple]:
+    """Converte uma partida na linha da tabela (None sem id ou sem horário de início)."""
+    if partida.id is None or partida.begin_at is None:
+        return None
+
+    adversario = next((time for time in partida.opponents if time.id != FURIA_ID), None)
+    placar = {result.team_id: result.score for result in partida.results}
+    return (
+        partida.id,
+        partida.begin_at,
+        adversario.id if adversario else None,
+        adversario.name if adversario else None,
+        adversario.acronym if adversario else None,
+        placar.get(FURIA_ID),
+        placar.get(adversario.id) if adversario else None,
+        partida.winner_id,
+        partida.serie_name,
+        partida.league_name,
+        partida.tournament_name
+    )
+
+
+def _archived(row: Iterable) -> ArchivedMatch:
+    match_id, begin_at, opponent_name, furia_score, opponent_score, winner_id, serie_name = row
+    won = None if winner_id is None else winner_id == FURIA_ID
+    return ArchivedMatch(match_id, begin_at, opponent_name, furia_score, opponent_score, won, serie_name)
+
+
+def _escape_Like(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,251 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional
+from utils.event_log import error_Fields
+import asyncio
+import json
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+class MediaCache:
+    """
+    Cache dos `file_id` que o Telegram devolve após o primeiro envio de cada imagem.
+
+    Na primeira vez que uma URL é enviada, o Telegram baixa a imagem e devolve um `file_id`;
+    nos envios seguintes basta mandar esse `file_id`, sem novo download. O mapeamento
+    URL -> file_id pode ser persistido em um arquivo JSON para sobreviver a reinícios.
+
+    Com `shared`, o arquivo é compartilhado entre os processos do bot (modo com vários
+    workers): cada gravação relê o arquivo sob uma trava (`<path>.lock`) e aplica sobre ele
+    só as alterações deste processo desde a gravação anterior, então um processo não apaga
+    o que os outros gravaram, e os `file_id` dos outros passam a valer neste.
+
+    As gravações acontecem em uma única thread dedicada, e os `file_id` vencidos são
+    descartados ao carregar e ao gravar.
+
+    Attributes:
+        path (str, optional): Caminho do arquivo JSON de persistência. Se None, o cache
+            fica só em memória.
+        shared (bool): Se o arquivo é compartilhado com outros processos.
+        max_age (float): Tempo em segundos após o qual um `file_id` é descartado e a
+            imagem volta a ser enviada pela URL.
+        stats (Dict[str, int]): Contadores de acertos, falhas, gravações e invalidações.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_age: float = 30 * 24 * 3600,
+        save_delay: float = 5.0,
+        shared: bool = False
+    ):
+        """
+        Inicializa o cache de mídia.
+
+        Args:
+            path (str, optional): Caminho do arquivo JSON de persistência. Defaults to None.
+            max_age (float): Validade de um `file_id` em segundos. Defaults to 30 dias.
+            save_delay (float): Tempo em segundos para agrupar alterações antes de gravar o
+                arquivo. Defaults to 5.0.
+            shared (bool): Compartilha o arquivo com outros processos (sem `path`, não tem
+                efeito). Defaults to False.
+        """
+        self.path = path
+        self.shared = shared and bool(path)
+        self.max_age = max_age
+        self._save_delay = save_delay
+
+        # url -> [file_id, momento em que foi gravado]
+        self._entries: Dict[str, List] = {}
+        # Alteracoes desde a ultima gravacao, aplicadas sobre o arquivo no modo compartilhado
+        self._changed: Dict[str, List] = {}
+        self._removed: Dict[str, str] = {}
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="media-cache")
+
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "invalidated": 0}
+
+    async def load(self):
+        """
+        Carrega o arquivo de persistência, se existir, sem bloquear o event loop.
+
+        Returns:
+            None
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            entries = await loop.run_in_executor(self._executor, self._read_file)
+            self._entries.update(self._valid(entries))
+        except Exception as e:
+            log.warning("Não foi possivel carregar o cache de mídia", extra=error_Fields(e))
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Retorna o `file_id` registrado para uma URL, se ainda for válido.
+
+        Args:
+            url (str): URL da imagem.
+
+        Returns:
+            str or None: `file_id` a ser enviado no lugar da URL, ou None.
+        """
+        entry = self._entries.get(url)
+        if entry is None or time.time() - entry[1] > self.max_age:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return entry[0]
+
+    def has(self, url: str) -> bool:
+        """
+        Indica se há um `file_id` válido para a URL, sem afetar as estatísticas.
+
+        Args:
+            url (str): URL da imagem.
+
+        Returns:
+            bool: True se a URL já tiver um `file_id` válido.
+        """
+        entry = self._entries.get(url)
+        return entry is not None and time.time() - entry[1] <= self.max_age
+
+    def put(self, url: str, file_id: str):
+        """
+        Registra o `file_id` devolvido pelo Telegram para uma URL.
+
+        Args:
+            url (str): URL da imagem enviada.
+            file_id (str): Identificador do arquivo no Telegram.
+        """
+        entry = self._entries.get(url)
+        if entry is not None and entry[0] == file_id:
+            return
+
+        self._entries[url] = [file_id, time.time()]
+        if self.shared:
+            self._changed[url] = self._entries[url]
+            self._removed.pop(url, None)
+        self.stats["stored"] += 1
+        self._schedule_Save()
+
+    def invalidate(self, url: str):
+        """
+        Descarta o `file_id` de uma URL (ex.: quando o Telegram recusa o identificador).
+
+        Args:
+            url (str): URL da imagem.
+        """
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            if self.shared:
+                self._changed.pop(url, None)
+                self._removed[url] = entry[0]
+            self.stats["invalidated"] += 1
+            self._schedule_Save()
+
+    async def close(self):
+        """
+        Grava imediatamente as alterações pendentes.
+
+        Returns:
+            None
+        """
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+            self._start_Save()
+        if self._save_task is not None:
+            await asyncio.gather(self._save_task, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    def _schedule_Save(self):
+        """Agenda uma gravação do arquivo, agrupando alterações próximas."""
+        if not self.path or self._save_handle is not None:
+            return
+        self._save_handle = asyncio.get_running_loop().call_later(self._save_delay, self._on_SaveTimer)
+
+    def _on_SaveTimer(self):
+        self._save_handle = None
+        self._start_Save()
+
+    def _start_Save(self):
+        """Grava um retrato do cache na thread do arquivo, sem bloquear o event loop."""
+        snapshot = dict(self._changed if self.shared else self._entries)
+        changed, self._changed = self._changed, {}
+        removed, self._removed = self._removed, {}
+        self._save_task = asyncio.get_running_loop().run_in_executor(self._executor, self._write_file, snapshot, removed)
+        self._save_task.add_done_callback(partial(self._on_Saved, changed, removed))
+
+    def _on_Saved(self, changed: Dict[str, List], removed: Dict[str, str], future: asyncio.Future):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            # As alteracoes voltam para a proxima gravacao
+            self._changed = {**changed, **self._changed}
+            self._removed = {**removed, **self._removed}
+            log.warning("Não foi possivel gravar o cache de mídia", extra=error_Fields(future.exception()))
+            return
+
+        # file_id gravados por outros processos passam a valer aqui tambem
+        for url, entry in (future.result() or {}).items():
+            if url not in self._entries and self._removed.get(url) != entry[0]:
+                self._entries[url] = entry
+
+    def _valid(self, entries: Dict[str, List]) -> Dict[str, List]:
+        """Descarta os `file_id` vencidos."""
+        agora = time.time()
+        return {url: entry for url, entry in entries.items() if agora - entry[1] <= self.max_age}
+
+    def _read_file(self) -> Dict[str, List]:
+        with open(self.path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _write_file(self, snapshot: Dict[str, List], removed: Dict[str, str]) -> Optional[Dict[str, List]]:
+        """
+        Grava o cache. Com `shared`, aplica as alterações sobre o arquivo, sob trava entre
+        processos.
+
+        Args:
+            snapshot (dict): Cache inteiro ou, com `shared`, só as URLs gravadas desde a
+                gravação anterior.
+            removed (dict): URLs invalidadas desde a gravação anterior (com `shared`).
+
+        Returns:
+            dict or None: Entradas gravadas, com as dos outros processos (None sem `shared`).
+        """
+        if not self.shared:
+            self._replace_File(self._valid(snapshot))
+            return None
+
+        import fcntl
+
+        with open(f"{self.path}.lock", 'wb') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            entries = self._read_file() if os.path.exists(self.path) else {}
+            for url, file_id in removed.items():
+                # Outro processo pode ter gravado um file_id novo para a mesma URL
+                if url in entries and entries[url][0] == file_id:
+                    del entries[url]
+            for url, entry in snapshot.items():
+                atual = entries.get(url)
+                if atual is None or entry[1] >= atual[1]:
+                    entries[url] = entry
+            entries = self._valid(entries)
+            self._replace_File(entries)
+        return entries
+
+    def _replace_File(self, entries: Dict[str, List]):
+        # Grava em arquivo temporario e troca, para nunca deixar um JSON pela metade
+        # (um temporario por processo, ja que varios workers podem gravar o mesmo arquivo)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(entries, file)
+        os.replace(tmp_path, self.path)
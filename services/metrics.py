@@ -0,0 +1,266 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from utils.event_log import error_Fields
+import asyncio
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+# Limites (em segundos) dos baldes dos histogramas de latencia
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (labels, valor) de uma amostra
+Sample = Tuple[Dict[str, str], float]
+
+class Counter:
+    """
+    Contador monotônico com labels, no formato de exposição do Prometheus.
+
+    Cada combinação de labels é uma entrada em um dicionário; incrementar custa uma busca
+    e uma soma, barato o bastante para ficar sempre ligado.
+
+    Attributes:
+        name (str): Nome da métrica.
+        help (str): Descrição exibida no `# HELP`.
+        label_names (Tuple[str, ...]): Nomes dos labels, na ordem dos valores em `inc()`.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """
+        Incrementa o contador.
+
+        Args:
+            *labels (str): Valores dos labels, na ordem de `label_names`.
+            amount (float): Valor a somar. Defaults to 1.0.
+        """
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for labels, value in self._values.items():
+            yield self.name, dict(zip(self.label_names, labels)), value
+
+
+class Histogram:
+    """
+    Histograma com baldes fixos e labels, no formato de exposição do Prometheus.
+
+    Uma observação custa uma busca binária nos limites e três somas; os baldes só são
+    acumulados na hora de gerar o texto.
+
+    Attributes:
+        name (str): Nome da métrica.
+        help (str): Descrição exibida no `# HELP`.
+        label_names (Tuple[str, ...]): Nomes dos labels, na ordem dos valores em `observe()`.
+        buckets (Tuple[float, ...]): Limites superiores dos baldes, em ordem crescente.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        # labels -> [contagem por balde (+Inf no fim), soma, total]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        """
+        Registra uma observação.
+
+        Args:
+            value (float): Valor observado (ex.: duração em segundos).
+            *labels (str): Valores dos labels, na ordem de `label_names`.
+        """
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            self._values[labels] = entry
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def time(self, *labels: str) -> "_Timer":
+        """
+        Mede a duração de um bloco `with` e a registra no histograma.
+
+        Args:
+            *labels (str): Valores dos labels.
+
+        Returns:
+            _Timer: Gerenciador de contexto.
+        """
+        return _Timer(self, labels)
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for labels, (counts, total, count) in self._values.items():
+            base = dict(zip(self.label_names, labels))
+            acumulado = 0
+            for limite, quantidade in zip(self.buckets, counts):
+                acumulado += quantidade
+                yield f"{self.name}_bucket", {**base, "le": _format_Value(limite)}, acumulado
+            yield f"{self.name}_bucket", {**base, "le": "+Inf"}, count
+            yield f"{self.name}_sum", base, total
+            yield f"{self.name}_count", base, count
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Reúne as métricas do bot e gera o texto de exposição do Prometheus para a rota /metrics.
+
+    Aceita métricas próprias (`Counter`, `Histogram`) e coletores: funções chamadas a cada
+    leitura que convertem os dicionários `stats` já existentes nos componentes em amostras,
+    sem custo nenhum no caminho das requisições.
+    """
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def register(self, *metrics):
+        """
+        Registra métricas para aparecerem na exposição.
+
+        Args:
+            *metrics (Counter or Histogram): Métricas a registrar.
+        """
+        self._metrics.extend(metrics)
+
+    def add_Collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]):
+        """
+        Registra um coletor.
+
+        Args:
+            collector (Callable): Função sem argumentos que retorna tuplas
+                (nome, tipo, descrição, amostras), com amostras no formato (labels, valor)
+                e tipo 'counter' ou 'gauge'.
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Gera o texto de exposição (formato 0.0.4 do Prometheus).
+
+        Returns:
+            str: Todas as métricas registradas e coletadas.
+        """
+        lines: List[str] = []
+
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(_format_Sample(name, labels, value))
+
+        for collector in self._collectors:
+            try:
+                familias = list(collector())
+            except Exception as e:
+                log.warning("Não foi possivel coletar métricas", extra=error_Fields(e))
+                continue
+            for name, kind, help, samples in familias:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(_format_Sample(name, labels, value))
+
+        lines.append("")
+        return "\n".join(lines)
+
+
+class LoopLagMonitor:
+    """
+    Mede o atraso do event loop: quanto uma tarefa que dorme `interval` segundos acorda
+    depois do previsto. Atrasos altos indicam código bloqueando o loop.
+
+    Attributes:
+        interval (float): Intervalo em segundos entre medições.
+        histogram (Histogram): Distribuição dos atrasos medidos.
+        last_lag (float): Último atraso medido, em segundos.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        """
+        Inicializa o monitor.
+
+        Args:
+            interval (float): Intervalo em segundos entre medições. Defaults to 0.5.
+        """
+        self.interval = interval
+        self.histogram = Histogram(
+            "event_loop_lag_seconds",
+            "Atraso do event loop em relação ao horário previsto",
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+        )
+        self.last_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """
+        Inicia as medições em segundo plano.
+
+        Returns:
+            None
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Encerra as medições.
+
+        Returns:
+            None
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            inicio = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - inicio - self.interval)
+            self.histogram.observe(self.last_lag)
+
+
+def _format_Sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        texto = ",".join(f'{chave}="{_escape(str(valor))}"' for chave, valor in labels.items())
+        return f"{name}{{{texto}}} {_format_Value(value)}"
+    return f"{name} {_format_Value(value)}"
+
+
+def _format_Value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,435 @@
+from collections import OrderedDict
+from services.image_prefetcher import ImagePrefetcher
+from services.media_cache import MediaCache
+from services.metrics import Counter
+from services.profiler import stage
+from telebot import types
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_helper import ApiTelegramException
+from typing import Any, Dict, List, Optional
+import asyncio
+import itertools
+import time
+
+# Faixas de prioridade: respostas interativas passam na frente de envios em massa
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+class TokenBucket:
+    """
+    Balde de fichas para limitar a taxa de envios.
+
+    O balde enche `rate` fichas por segundo até `capacity`; cada envio consome uma ficha.
+
+    Attributes:
+        rate (float): Fichas repostas por segundo.
+        capacity (float): Quantidade máxima de fichas (tamanho da rajada permitida).
+        blocked_until (float): Momento (time.monotonic()) até o qual o balde fica bloqueado
+            após um 429 do Telegram.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated_at", "blocked_until")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self) -> float:
+        """
+        Calcula quanto tempo falta para haver uma ficha disponível, sem consumi-la.
+
+        Returns:
+            float: Segundos até a próxima ficha (0 se já houver uma).
+        """
+        now = time.monotonic()
+        self._refill(now)
+
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        """Consome uma ficha do balde."""
+        self.tokens -= 1
+
+    def block(self, seconds: float):
+        """
+        Bloqueia o balde por alguns segundos (ex.: `retry_after` de um 429).
+
+        Args:
+            seconds (float): Tempo de bloqueio em segundos.
+        """
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    @property
+    def idle(self) -> bool:
+        """Indica se o balde está cheio e sem bloqueio (pode ser descartado)."""
+        now = time.monotonic()
+        self._refill(now)
+        return self.tokens >= self.capacity and now >= self.blocked_until
+
+
+class _Job:
+    """Envio pendente na fila do agendador."""
+    __slots__ = ("priority", "seq", "method", "chat_id", "args", "kwargs", "future", "attempts")
+
+    def __init__(self, priority: int, seq: int, method: str, chat_id: Any, args: tuple, kwargs: dict, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.method = method
+        self.chat_id = chat_id
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.attempts = 0
+
+
+class OutboundScheduler:
+    """
+    Agendador de envios ao Telegram com limite global, limite por chat e prioridades.
+
+    Todos os envios (send_message, send_photo, edit_message_media, ...) passam por uma fila
+    de prioridade. Um despachante libera cada envio respeitando um balde de fichas global
+    (~30 mensagens/s) e um balde por chat, sem que um chat limitado bloqueie os demais.
+    Se o Telegram responder 429, o `retry_after` informado é respeitado automaticamente e
+    o envio é reagendado.
+
+    Com um `MediaCache`, fotos enviadas por URL passam a ser reenviadas pelo `file_id`
+    devolvido pelo Telegram, evitando que a imagem seja baixada de novo a cada envio. Com
+    um `ImagePrefetcher`, fotos antecipadas por `prefetch_Photo` que ainda não têm
+    `file_id` são enviadas direto da memória.
+
+    Attributes:
+        bot (AsyncTeleBot): Instância do bot usada para os envios.
+        media_cache (MediaCache, optional): Cache URL -> file_id das fotos enviadas.
+        image_prefetcher (ImagePrefetcher, optional): Imagens baixadas antecipadamente.
+        max_retries (int): Quantidade máxima de reenvios após um 429.
+        stats (dict): Contadores de envios realizados, 429 recebidos, reenvios e falhas.
+        calls (Counter): Chamadas à Bot API por método e resultado ('ok', '429' ou 'error').
+    """
+
+    def __init__(
+        self,
+        bot: AsyncTeleBot,
+        global_rate: float = 30,
+        global_burst: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 3,
+        max_retries: int = 3,
+        max_chat_buckets: int = 10000,
+        media_cache: Optional[MediaCache] = None,
+        image_prefetcher: Optional[ImagePrefetcher] = None
+    ):
+        """
+        Inicializa o agendador de envios.
+
+        Args:
+            bot (AsyncTeleBot): Instância do bot usada para os envios.
+            global_rate (float): Envios por segundo permitidos no total. Defaults to 30.
+            global_burst (float): Rajada máxima de envios no total. Defaults to 30.
+            chat_rate (float): Envios por segundo permitidos por chat. Defaults to 1.
+            chat_burst (float): Rajada máxima de envios por chat. Defaults to 3.
+            max_retries (int): Reenvios máximos após um 429. Defaults to 3.
+            max_chat_buckets (int): Quantidade máxima de baldes por chat mantidos em
+                memória (os usados há mais tempo são descartados). Defaults to 10000.
+            media_cache (MediaCache, optional): Cache URL -> file_id das fotos enviadas.
+                Defaults to None.
+            image_prefetcher (ImagePrefetcher, optional): Imagens baixadas antecipadamente.
+                Defaults to None.
+        """
+        self.bot = bot
+        self.media_cache = media_cache
+        self.image_prefetcher = image_prefetcher
+        self.max_retries = max_retries
+
+        self._global_bucket = TokenBucket(global_rate, global_burst)
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._chat_buckets: "OrderedDict[Any, TokenBucket]" = OrderedDict()
+        self._max_chat_buckets = max_chat_buckets
+
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+
+        # Envios de chats aguardando ficha, mantidos em ordem ate o balde do chat liberar
+        self._deferred: Dict[Any, List[_Job]] = {}
+
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._inflight = set()
+
+        self.stats = {"sent": 0, "rate_limited": 0, "retried": 0, "failed": 0}
+        self.calls = Counter("telegram_api_calls_total", "Chamadas à Bot API do Telegram", ("method", "result"))
+
+    async def start(self):
+        """
+        Inicia o despachante da fila de envios.
+
+        Returns:
+            None
+        """
+        if self._dispatcher is None:
+            self._queue = asyncio.PriorityQueue()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self):
+        """
+        Encerra o despachante e aguarda os envios em andamento.
+
+        Returns:
+            None
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def call(self, method: str, chat_id: Any, *args, priority: int = PRIORITY_INTERACTIVE, **kwargs) -> Any:
+        """
+        Agenda uma chamada de envio do bot e aguarda o seu resultado.
+
+        Args:
+            method (str): Nome do método do AsyncTeleBot (ex.: 'send_message').
+            chat_id (Any): Chat de destino, usado para o limite por chat.
+            *args: Argumentos posicionais repassados ao método.
+            priority (int): PRIORITY_INTERACTIVE ou PRIORITY_BULK.
+                Defaults to PRIORITY_INTERACTIVE.
+            **kwargs: Argumentos nomeados repassados ao método (além de chat_id).
+
+        Returns:
+            Any: Retorno do método do bot (ex.: a Message enviada).
+        """
+        if self._dispatcher is None:
+            await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(_Job(priority, next(self._sequence), method, chat_id, args, kwargs, future))
+        with stage("send"):
+            return await future
+
+    async def send_message(self, chat_id: Any, text: str, priority: int = PRIORITY_INTERACTIVE, **kwargs) -> Any:
+        """Agenda um `bot.send_message`. Ver `call`."""
+        return await self.call("send_message", chat_id, text=text, priority=priority, **kwargs)
+
+    async def send_photo(self, chat_id: Any, photo: Any, priority: int = PRIORITY_INTERACTIVE, **kwargs) -> Any:
+        """Agenda um `bot.send_photo`, usando o `file_id` em cache quando houver. Ver `call`."""
+        async def send(photo_ref):
+            return await self.call("send_photo", chat_id, photo=photo_ref, priority=priority, **kwargs)
+
+        return await self._send_Media(photo, send)
+
+    async def edit_message_media(self, chat_id: Any, message_id: int, media: Any, priority: int = PRIORITY_INTERACTIVE, **kwargs) -> Any:
+        """Agenda um `bot.edit_message_media`, usando o `file_id` em cache quando houver. Ver `call`."""
+        async def send(photo_ref):
+            # Um InputMediaPhoto novo a cada tentativa: o telebot serializa a referencia da
+            # foto montada no construtor, entao alterar `.media` depois nao muda o envio
+            envio = _photo_With(media, photo_ref) if isinstance(media, types.InputMediaPhoto) else media
+            return await self.call("edit_message_media", chat_id, message_id=message_id, media=envio, priority=priority, **kwargs)
+
+        photo = media.media if isinstance(media, types.InputMediaPhoto) else None
+        return await self._send_Media(photo, send)
+
+    def prefetch_Photo(self, url: str):
+        """
+        Antecipa o download de uma foto que ainda não tem `file_id` em cache.
+
+        Não faz nada sem `media_cache`/`image_prefetcher` ou se a foto já tiver `file_id`.
+
+        Args:
+            url (str): URL da foto.
+        """
+        if self.media_cache is None or self.image_prefetcher is None or not _is_Url(url):
+            return
+        if not self.media_cache.has(url):
+            self.image_prefetcher.prefetch(url)
+
+    async def _send_Media(self, photo: Any, send) -> Any:
+        """
+        Envia uma foto trocando a URL pelo `file_id` em cache e registra o `file_id` novo.
+
+        Se o Telegram recusar um `file_id` em cache, ele é invalidado e a foto é reenviada
+        pela URL original.
+
+        Args:
+            photo (Any): URL da foto (ou qualquer outra referência, enviada sem alteração).
+            send (Callable): Corrotina que recebe a referência da foto e faz o envio.
+
+        Returns:
+            Any: Retorno do envio (ex.: a Message enviada).
+        """
+        if self.media_cache is None or not _is_Url(photo):
+            return await send(photo)
+
+        file_id = self.media_cache.get(photo)
+        if file_id is None:
+            prefetched = self.image_prefetcher.get(photo) if self.image_prefetcher is not None else None
+            result = await send(prefetched if prefetched is not None else photo)
+        else:
+            try:
+                result = await send(file_id)
+            except ApiTelegramException as e:
+                if e.error_code != 400 or "file identifier" not in e.description:
+                    raise
+                self.media_cache.invalidate(photo)
+                result = await send(photo)
+
+        sizes = getattr(result, "photo", None)
+        if sizes:
+            self.media_cache.put(photo, sizes[-1].file_id)
+            if self.image_prefetcher is not None:
+                self.image_prefetcher.discard(photo)
+
+        return result
+
+    def _enqueue(self, job: _Job):
+        self._queue.put_nowait((job.priority, job.seq, job))
+
+    def _release(self, chat_id: Any):
+        """
+        Devolve à fila, na ordem original, os envios de um chat que aguardavam ficha.
+
+        Args:
+            chat_id (Any): Identificador do chat.
+        """
+        for job in self._deferred.pop(chat_id, []):
+            self._enqueue(job)
+
+    def _chat_bucket(self, chat_id: Any) -> TokenBucket:
+        """
+        Retorna (criando se preciso) o balde de um chat, descartando os mais antigos.
+
+        Args:
+            chat_id (Any): Identificador do chat.
+
+        Returns:
+            TokenBucket: Balde do chat.
+        """
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self._chat_rate, self._chat_burst)
+            self._chat_buckets[chat_id] = bucket
+
+            # Descarta baldes antigos apenas se estiverem ociosos (cheios e sem bloqueio)
+            while len(self._chat_buckets) > self._max_chat_buckets:
+                oldest_id, oldest = next(iter(self._chat_buckets.items()))
+                if oldest_id == chat_id or not oldest.idle:
+                    break
+                self._chat_buckets.popitem(last=False)
+        else:
+            self._chat_buckets.move_to_end(chat_id)
+        return bucket
+
+    async def _dispatch(self):
+        """
+        Libera os envios da fila respeitando os limites global e por chat.
+
+        Os envios de um chat sem ficha ficam de lado (em ordem) e voltam para a fila
+        quando o balde do chat libera, sem segurar os envios de outros chats. A espera pelo
+        balde global acontece antes de retirar um envio da fila, para que uma resposta
+        interativa que chegue durante a espera passe na frente dos envios em massa.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            global_wait = self._global_bucket.wait_time()
+            if global_wait > 0:
+                await asyncio.sleep(global_wait)
+                continue
+
+            _, _, job = await self._queue.get()
+
+            deferred = self._deferred.get(job.chat_id)
+            if deferred is not None:
+                deferred.append(job)
+                continue
+
+            chat_wait = self._chat_bucket(job.chat_id).wait_time()
+            if chat_wait > 0:
+                self._deferred[job.chat_id] = [job]
+                loop.call_later(chat_wait, self._release, job.chat_id)
+                continue
+
+            # Um 429 pode ter bloqueado o balde global enquanto a fila estava vazia: o envio
+            # volta para a fila com a mesma prioridade e posicao
+            if self._global_bucket.wait_time() > 0:
+                self._enqueue(job)
+                continue
+
+            self._global_bucket.consume()
+            self._chat_bucket(job.chat_id).consume()
+
+            task = asyncio.create_task(self._send(job))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, job: _Job):
+        """
+        Executa o envio e resolve o future do chamador.
+
+        Em caso de 429, bloqueia o balde do chat e o global pelo `retry_after` (o limite do
+        Telegram vale para o bot inteiro) e reagenda o envio.
+
+        Args:
+            job (_Job): Envio a executar.
+        """
+        if job.future.cancelled():
+            return
+
+        try:
+            result = await getattr(self.bot, job.method)(*job.args, chat_id=job.chat_id, **job.kwargs)
+        except ApiTelegramException as e:
+            self.calls.inc(job.method, "429" if e.error_code == 429 else "error")
+            if e.error_code == 429 and job.attempts < self.max_retries:
+                retry_after = e.result_json.get("parameters", {}).get("retry_after", 1)
+                self.stats["rate_limited"] += 1
+                self.stats["retried"] += 1
+                job.attempts += 1
+
+                self._chat_bucket(job.chat_id).block(retry_after)
+                self._global_bucket.block(retry_after)
+                self._enqueue(job)
+                return
+
+            if e.error_code == 429:
+                self.stats["rate_limited"] += 1
+            self._fail(job, e)
+        except Exception as e:
+            self.calls.inc(job.method, "error")
+            self._fail(job, e)
+        else:
+            self.calls.inc(job.method, "ok")
+            self.stats["sent"] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+
+    def _fail(self, job: _Job, error: Exception):
+        self.stats["failed"] += 1
+        if not job.future.done():
+            job.future.set_exception(error)
+
+
+def _photo_With(media: types.InputMediaPhoto, photo_ref: Any) -> types.InputMediaPhoto:
+    """Cópia do `InputMediaPhoto` com outra referência de foto (URL, `file_id` ou bytes)."""
+    return types.InputMediaPhoto(
+        photo_ref,
+        caption=media.caption,
+        parse_mode=media.parse_mode,
+        caption_entities=media.caption_entities,
+        has_spoiler=media.has_spoiler,
+        show_caption_above_media=media.show_caption_above_media
+    )
+
+
+def _is_Url(photo: Any) -> bool:
+    """Indica se a referência de foto é uma URL http(s)."""
+    return isinstance(photo, str) and photo.startswith(("http://", "https://"))
@@ -1,8 +1,92 @@
+from models.pandascore import Match, parse_Matches, parse_Teams
 from services.api_client import APIClient
+from services.cache import TTLCache, CachePolicy
+from services.disk_cache import DiskCache
+from services.metrics import Counter, Histogram
+from services.profiler import profiled
+from services.projection import project
+from services.single_flight import SingleFlight
+from typing import Optional, Tuple
+from utils import json_codec
+from utils.event_log import error_Fields
+import asyncio
+import logging
+import os
 import time
 
+log = logging.getLogger(__name__)
+
 FURIA_ID = 124530 
 
+# Fim do intervalo de datas pedido na sincronizacao incremental do arquivo de partidas
+ARCHIVE_RANGE_END = "2100-01-01T00:00:00Z"
+
+# Politicas de expiracao por classe de chave (partidas ao vivo mudam em segundos, o elenco em horas)
+CACHE_POLICIES = {
+    "ultima_partida": CachePolicy(ttl=300, hard_ttl=1800),
+    "proximas_partidas": CachePolicy(ttl=300, hard_ttl=1800),
+    "partida_andamento": CachePolicy(ttl=15, hard_ttl=60),
+    "time_completo": CachePolicy(ttl=6 * 3600, hard_ttl=24 * 3600)
+}
+
+def _trim_Streams(streams: list) -> list:
+    """
+    Mantém só as streams que os formatadores podem escolher: a primeira da lista, as
+    principais e as oficiais, na ordem original e só com os campos lidos.
+    """
+    return [
+        {field: stream[field] for field in ("main", "official", "language", "raw_url") if field in stream}
+        for i, stream in enumerate(streams)
+        if i == 0 or stream.get("main") or stream.get("official")
+    ]
+
+# Campos das partidas lidos pelos formatadores, pelos avisos ao vivo e pelo arquivo de partidas
+MATCH_FIELDS = {
+    "id": None,
+    "name": None,
+    "status": None,
+    "begin_at": None,
+    "end_at": None,
+    "winner_id": None,
+    "opponents": {"opponent": {"id": None, "name": None, "acronym": None, "image_url": None}},
+    "results": {"team_id": None, "score": None},
+    "winner": {"id": None, "name": None, "image_url": None},
+    "serie": {"full_name": None},
+    "league": {"name": None},
+    "tournament": {"name": None, "prizepool": None},
+    "streams_list": _trim_Streams
+}
+
+# Campos do time e dos jogadores lidos pela paginacao do elenco
+TEAM_FIELDS = {
+    "id": None,
+    "name": None,
+    "acronym": None,
+    "image_url": None,
+    "players": {"id": None, "name": None, "age": None, "nationality": None, "birthday": None, "image_url": None}
+}
+
+# Projecao aplicada a cada classe de chave antes de guardar a resposta no cache
+PROJECTIONS = {
+    "ultima_partida": MATCH_FIELDS,
+    "proximas_partidas": MATCH_FIELDS,
+    "partida_andamento": MATCH_FIELDS,
+    "time_completo": TEAM_FIELDS
+}
+
+# Modelo em que cada classe de chave e convertida uma unica vez, na busca
+PARSERS = {
+    "ultima_partida": parse_Matches,
+    "proximas_partidas": parse_Matches,
+    "partida_andamento": parse_Matches,
+    "time_completo": parse_Teams
+}
+
+def _parse(key_class: str, data: list):
+    """Converte a resposta projetada no modelo da classe de chave (ver PARSERS)."""
+    parser = PARSERS.get(key_class)
+    return parser(data) if parser is not None else data
+
 class PandaScoreClient(APIClient):
     """
     Cliente para interagir com a API PandaScore para dados de partidas de CS:GO/CS2.
@@ -15,12 +99,32 @@ class PandaScoreClient(APIClient):
         base_url (str): URL base da API PandaScore para CS:GO/CS2
             ('https://api.pandascore.co/csgo').
         api_key (str): Chave de autenticação da API.
-        _cache (Dict[str, Dict]): Cache interno para armazenar respostas de requisições,
-            com dados e timestamp.
-        _cache_ttl (int): Tempo de vida do cache em segundos (default: 300).
+        _cache (TTLCache): Cache das respostas, com chave montada a partir do endpoint e dos
+            parâmetros, expiração por classe de chave (ver CACHE_POLICIES), limite LRU e
+            cache negativo de falhas.
+        _single_flight (SingleFlight): Agrupador que faz chamadas concorrentes ao mesmo
+            endpoint/parâmetros compartilharem uma única requisição à API.
+        _disk_cache (DiskCache, optional): Cache persistente das respostas brutas, lido sob
+            demanda após um reinício.
+        shared (bool): Se o cache em disco é compartilhado com outros processos do bot. Nesse
+            caso, antes de ir à API o cliente procura uma resposta mais nova no disco e usa
+            uma trava entre processos, para que cada chave seja buscada uma única vez por
+            todos os workers.
+        upstream_latency (Histogram): Duração das requisições à API por classe de chave.
+        upstream_errors (Counter): Requisições à API que falharam, por classe de chave.
     """
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache_size: int = 256,
+        negative_ttl: float = 30,
+        disk_cache_path: Optional[str] = None,
+        base_url: str = "https://api.pandascore.co/csgo",
+        shared: bool = False,
+        lock_ttl: float = 15.0,
+        lock_wait: float = 12.0
+    ):
         """
         Inicializa o cliente PandaScore com a chave de API.
 
@@ -29,126 +133,477 @@ class PandaScoreClient(APIClient):
 
         Args:
             api_key (str): Chave de autenticação da API PandaScore.
+            cache_size (int): Quantidade máxima de respostas em cache. Defaults to 256.
+            negative_ttl (float): Tempo em segundos que uma falha da API fica em cache.
+                Defaults to 30.
+            disk_cache_path (str, optional): Caminho do arquivo SQLite para persistir o
+                cache entre reinícios. Se None, o cache fica só em memória. Defaults to None.
+            base_url (str): URL base da API PandaScore para CS:GO/CS2.
+                Defaults to 'https://api.pandascore.co/csgo'.
+            shared (bool): Compartilha o cache em disco com outros processos (exige
+                `disk_cache_path`). Defaults to False.
+            lock_ttl (float): Validade em segundos da trava de busca entre processos.
+                Defaults to 15.0.
+            lock_wait (float): Tempo máximo em segundos esperando outro processo terminar a
+                busca antes de buscar por conta própria. Defaults to 12.0.
 
         """
-        super().__init__("https://api.pandascore.co/csgo", api_key=api_key)
+        super().__init__(base_url, api_key=api_key)
 
         # Cache para evitar multiplas requisições
-        self._cache = {
-            "ultima_partida": {"data": [], "cache_timestamp": 0},
-            "proximas_partidas": {"data": [], "cache_timestamp": 0},
-            "partida_andamento": {"data": [], "cache_timestamp": 0},
-            "time_completo": {"data": [], "cache_timestamp": 0}
-        }
+        self._cache = TTLCache(policies=CACHE_POLICIES, max_size=cache_size, negative_ttl=negative_ttl)
 
-        self._cache_ttl = 300
+        # Atualizacoes em segundo plano em andamento, no maximo uma por chave do cache
+        self._refresh_tasks = {}
 
-    async def get_UltimaPartida(self):
+        # Agrupa requisicoes identicas concorrentes quando o cache expira
+        self._single_flight = SingleFlight()
+
+        # Cache persistente opcional, consultado uma unica vez por chave apos o reinicio
+        self._disk_cache = DiskCache(disk_cache_path) if disk_cache_path else None
+        self._disk_checked = set()
+
+        # Cache compartilhado entre processos (modo com varios workers)
+        if shared and self._disk_cache is None:
+            raise ValueError("O cache compartilhado entre processos exige disk_cache_path")
+        self.shared = shared
+        self._lock_ttl = lock_ttl
+        self._lock_wait = lock_wait
+        self._lock_owner = str(os.getpid())
+
+        # Metricas das requisicoes que de fato chegam a API (expostas em /metrics)
+        self.upstream_latency = Histogram(
+            "pandascore_request_duration_seconds",
+            "Duração das requisições à API PandaScore",
+            ("key_class",)
+        )
+        self.upstream_errors = Counter(
+            "pandascore_request_errors_total",
+            "Requisições à API PandaScore que falharam",
+            ("key_class",)
+        )
+
+    async def close(self):
         """
-        Obtém os dados da última partida finalizada da FURIA em CS:GO.
+        Fecha a sessão HTTP e aguarda as gravações pendentes do cache em disco.
+
+        Returns:
+            None
+        """
+        await super().close()
+        if self._disk_cache is not None:
+            await self._disk_cache.close()
 
-        Verifica se há dados válidos no cache (menos de 300 segundos). Se o cache estiver
-        válido, retorna os dados armazenados. Caso contrário, faz uma requisição à API
-        PandaScore para obter a última partida finalizada da FURIA (opponent_id: 124530),
-        armazena o resultado no cache e o retorna.
+    def get_CoalescingStats(self):
+        """
+        Retorna as estatísticas do agrupamento de requisições.
 
         Returns:
-            list: Lista contendo um dicionário com os dados da última partida, incluindo
-                campos como 'opponents', 'results', 'winner', e 'streams_list'.
+            dict: Contadores gerais ('flights', 'callers', 'coalesced') e a lista
+                'recent_flights' com quantos chamadores cada requisição à API atendeu.
+        """
+        return {**self._single_flight.stats, "recent_flights": list(self._single_flight.recent_flights)}
 
-        Example:
-            >>> client = PandaScoreClient("sua-chave")
-            >>> partida = await client.get_Ultima_Partida()
-            >>> print(partida)
-            [{'opponents': [...], 'results': [...], 'winner': {...}, ...}]
+    def get_CacheStats(self):
         """
-        if time.time() - self._cache["ultima_partida"]["cache_timestamp"] < self._cache_ttl:
-            return self._cache["ultima_partida"]["data"]
-        
-        # Somente faço uma nova requisicao se caso nao tenha dado algum em cache
-        try:
+        Retorna as estatísticas do cache por classe de chave.
 
-            dados = await self._request(
-                method="GET",
-                endpoint=f"/matches",
-                params=
-                {
-                    "filter[status]": "finished",
-                    
-                    "filter[opponent_id]": FURIA_ID,
-                    "sort": "-begin_at",
-                    "page[size]": 1
-                }
-            )
+        Returns:
+            dict: Para cada classe de chave, os contadores 'hits', 'stale_hits',
+                'negative_hits', 'misses' e 'evictions'.
+        """
+        return {key_class: dict(stats) for key_class, stats in self._cache.stats.items()}
+
+    @profiled("upstream")
+    async def _get_Cached(self, key_class: str, endpoint: str, params: dict, error_message: str):
+        """
+        Retorna os dados de uma consulta aplicando o cache com stale-while-revalidate.
+
+        - Dado fresco: retornado direto do cache.
+        - Falha cacheada ainda válida: retorna lista vazia sem chamar a API.
+        - Dado velho, mas dentro do `hard_ttl` da classe: retornado na hora e atualizado em
+          uma tarefa de segundo plano (no máximo uma por chave).
+        - Sem dado ou dado expirado de vez: busca na API e aguarda a resposta. Se a busca
+          falhar, a falha fica em cache por `negative_ttl` segundos.
+
+        Args:
+            key_class (str): Classe da chave, que define a política de expiração
+                (ex.: 'ultima_partida').
+            endpoint (str): Endpoint da API, relativo à URL base.
+            params (dict): Parâmetros de consulta da requisição.
+            error_message (str): Mensagem exibida caso a requisição falhe.
 
-            self._cache["ultima_partida"] = {"data": dados, "cache_timestamp": time.time()}
-            return dados
+        Returns:
+            tuple: Modelos da resposta (ver PARSERS) ou tupla vazia caso a requisição falhe
+                sem dado em cache.
+        """
+        key = TTLCache.make_key(endpoint, params)
+        entry = self._cache.get(key)
+
+        if entry is None:
+            entry = await self._load_FromDisk(key, key_class)
+
+        if entry is not None:
+            if self._cache.is_fresh(entry):
+                if entry.error is not None:
+                    self._cache.record(key_class, "negative_hits")
+                    return ()
+                self._cache.record(key_class, "hits")
+                return entry.data
+
+            if self._cache.is_usable(entry):
+                self._cache.record(key_class, "stale_hits")
+                self._schedule_Refresh(key, key_class, endpoint, params, error_message)
+                return entry.data
+
+        self._cache.record(key_class, "misses")
+
+        try:
+            return await self._fetch(key, key_class, endpoint, params)
         except Exception as e:
-            print(f"Não foi possivel realizar a requisição a Ultima partida da Furia: ERRO {e}\n\n")
-            return []
-    
-    async def get_ProximasPartidas(self):
-        """Retorna a Proxima Partida da Furia"""
-        if time.time() - self._cache["proximas_partidas"]["cache_timestamp"] < self._cache_ttl:
-            return self._cache["proximas_partidas"]["data"]
+            log.warning(error_message, extra={**error_Fields(e), "key_class": key_class})
+            self._cache.set_error(key, e, key_class)
+            return ()
+
+    async def _load_FromDisk(self, key: str, key_class: str):
+        """
+        Carrega para a memória a resposta gravada em disco para uma chave.
+
+        O disco é consultado no máximo uma vez por chave durante a vida do processo; depois
+        disso a memória passa a ser a fonte do cache. A entrada volta com o timestamp
+        original, então as regras normais de expiração continuam valendo.
+
+        Args:
+            key (str): Chave do cache.
+            key_class (str): Classe da chave.
+
+        Returns:
+            CacheEntry or None: Entrada carregada ou None se não houver nada no disco.
+        """
+        if self._disk_cache is None or key in self._disk_checked:
+            return None
+        self._disk_checked.add(key)
 
         try:
-            dados = await self._request(
-                method="GET",
-                endpoint="matches/upcoming",
-                params=
-                {
-                    "filter[opponent_id]": FURIA_ID
-                }
+            stored = await self._disk_cache.load(key)
+            if stored is None:
+                return None
+            return self._cache.set(
+                key,
+                _parse(key_class, json_codec.loads(stored.body)),
+                key_class,
+                timestamp=stored.fetched_at,
+                etag=stored.etag,
+                last_modified=stored.last_modified
             )
-
-            self._cache["proximas_partidas"] = {"data": dados, "cache_timestamp": time.time()}
-        
-            return dados
         except Exception as e:
-            print(f"Nao foi possivel realizar a requisição a Proximas Partidas da Furia: ERRO {e}\n\n")
-            return []
+            log.warning("Não foi possivel ler o cache em disco", extra={**error_Fields(e), "key": key, "key_class": key_class})
+            return None
 
-    async def get_PartidaEmAndamento(self):
-        if time.time() - self._cache["partida_andamento"]["cache_timestamp"] < self._cache_ttl:
-            return self._cache["partida_andamento"]["data"]
-        
+    async def _fetch(self, key: str, key_class: str, endpoint: str, params: dict):
+        """
+        Busca os dados na API e grava o resultado no cache.
+
+        Todas as chamadas simultâneas para a mesma chave aguardam uma única requisição à
+        API e recebem o mesmo resultado (ou o mesmo erro).
+
+        Args:
+            key (str): Chave do cache a ser atualizada.
+            key_class (str): Classe da chave.
+            endpoint (str): Endpoint da API, relativo à URL base.
+            params (dict): Parâmetros de consulta da requisição.
+
+        Returns:
+            tuple: Resposta convertida no modelo da classe.
+        """
+        return await self._single_flight.do(key, lambda: self._fetch_AndStore(key, key_class, endpoint, params))
+
+    async def _fetch_AndStore(self, key: str, key_class: str, endpoint: str, params: dict):
+        """
+        Faz a requisição à API, grava a resposta na memória e agenda a gravação em disco.
+
+        Com o cache compartilhado, a busca passa antes por `_fetch_Shared`.
+
+        Args:
+            key (str): Chave do cache a ser atualizada.
+            key_class (str): Classe da chave.
+            endpoint (str): Endpoint da API, relativo à URL base.
+            params (dict): Parâmetros de consulta da requisição.
+
+        Returns:
+            tuple: Resposta convertida no modelo da classe.
+        """
+        if self.shared:
+            return await self._fetch_Shared(key, key_class, endpoint, params)
+        return await self._fetch_Upstream(key, key_class, endpoint, params)
+
+    async def _fetch_Upstream(self, key: str, key_class: str, endpoint: str, params: dict):
+        """
+        Busca na API e grava a resposta na memória e no disco.
+
+        Se a chave já tiver uma resposta com ETag/Last-Modified, a requisição é condicional:
+        um 304 apenas renova a entrada, mantendo o mesmo objeto de dados (e, com ele, as
+        mensagens já renderizadas). Uma resposta nova passa pela projeção da classe
+        (ver PROJECTIONS) antes de ir para o cache.
+
+        Args:
+            key (str): Chave do cache a ser atualizada.
+            key_class (str): Classe da chave.
+            endpoint (str): Endpoint da API, relativo à URL base.
+            params (dict): Parâmetros de consulta da requisição.
+
+        Returns:
+            tuple: Resposta da API projetada e convertida no modelo da classe.
+        """
+        anterior = self._cache.peek(key)
+        if anterior is not None and anterior.error is not None:
+            anterior = None
+
+        inicio = time.perf_counter()
         try:
-            dados = await self._request(
+            status, body, validators = await self._request_Conditional(
                 method="GET",
-                endpoint="matches/running",
-                params=
-                {
-                    "filter[opponent_id]": FURIA_ID
-                }
+                endpoint=endpoint,
+                params=params,
+                etag=anterior.etag if anterior else None,
+                last_modified=anterior.last_modified if anterior else None
             )
+        except Exception:
+            self.upstream_errors.inc(key_class)
+            raise
+        finally:
+            self.upstream_latency.observe(time.perf_counter() - inicio, key_class)
+        fetched_at = time.time()
 
-            self._cache["partida_andamento"] = {"data": dados, "cache_timestamp": time.time()}
+        if status == 304 and anterior is not None:
+            self._cache.set(
+                key,
+                anterior.data,
+                key_class,
+                timestamp=fetched_at,
+                etag=validators["etag"] or anterior.etag,
+                last_modified=validators["last_modified"] or anterior.last_modified
+            )
+            if self._disk_cache is not None:
+                self._disk_cache.touch(key, fetched_at)
+            return anterior.data
 
-            return dados
-        except Exception as e:
-            print(f"Nao foi possivel fazer a requisição para partidas em andamento: ERRO {e}\n\n")
-            return []
+        projetado = json_codec.loads(body)
+        projection = PROJECTIONS.get(key_class)
+        if projection is not None:
+            projetado = project(projetado, projection)
+        dados = _parse(key_class, projetado)
+
+        self._cache.set(key, dados, key_class, timestamp=fetched_at, **validators)
+        if self._disk_cache is not None:
+            # No disco vai so a versao projetada, que tambem e mais rapida de ler no reinicio
+            stored = json_codec.dumps(projetado) if projection is not None else body
+            self._disk_cache.save(key, stored, fetched_at, **validators)
+
+        return dados
+
+    async def _fetch_Shared(self, key: str, key_class: str, endpoint: str, params: dict):
+        """
+        Busca uma chave coordenando com os outros processos pelo cache em disco.
+
+        Se outro processo já gravou uma resposta fresca, ela é usada sem ir à API. Senão,
+        o processo que obtiver a trava da chave busca na API e grava no disco; os demais
+        esperam a gravação (até `lock_wait` segundos) e leem o resultado do disco. Se o
+        dono da trava demorar demais, o processo busca por conta própria.
+
+        Args:
+            key (str): Chave do cache a ser atualizada.
+            key_class (str): Classe da chave.
+            endpoint (str): Endpoint da API, relativo à URL base.
+            params (dict): Parâmetros de consulta da requisição.
+
+        Returns:
+            tuple: Resposta convertida no modelo da classe (do disco ou da API).
+        """
+        ttl = self._cache.policy_for(key_class).ttl
+        limite = time.monotonic() + self._lock_wait
+        espera = 0.05
+
+        while True:
+            dados = await self._load_SharedFresh(key, key_class, ttl)
+            if dados is not None:
+                return dados
+
+            if await self._disk_cache.acquire_Lock(key, self._lock_owner, self._lock_ttl):
+                try:
+                    # Outro processo pode ter gravado entre a leitura e a trava
+                    dados = await self._load_SharedFresh(key, key_class, ttl)
+                    if dados is not None:
+                        return dados
+                    return await self._fetch_Upstream(key, key_class, endpoint, params)
+                finally:
+                    await self._disk_cache.release_Lock(key, self._lock_owner)
+
+            if time.monotonic() >= limite:
+                return await self._fetch_Upstream(key, key_class, endpoint, params)
+
+            await asyncio.sleep(espera)
+            espera = min(espera * 2, 0.5)
+
+    async def _load_SharedFresh(self, key: str, key_class: str, ttl: float):
+        """
+        Lê do disco a resposta de uma chave se ela ainda estiver fresca e a leva à memória.
+
+        Args:
+            key (str): Chave do cache.
+            key_class (str): Classe da chave.
+            ttl (float): Idade máxima em segundos para a resposta ser considerada fresca.
+
+        Returns:
+            tuple or None: Resposta convertida no modelo da classe ou None se não houver
+                resposta fresca no disco.
+        """
+        stored = await self._disk_cache.load(key)
+        if stored is None or time.time() - stored.fetched_at >= ttl:
+            return None
+
+        # Revalidacao (304) feita por outro processo: os dados continuam os mesmos da memoria
+        entry = self._cache.peek(key)
+        if entry is not None and entry.error is None and entry.etag is not None and entry.etag == stored.etag:
+            self._cache.set(key, entry.data, key_class, timestamp=stored.fetched_at, etag=entry.etag, last_modified=entry.last_modified)
+            return entry.data
+
+        dados = _parse(key_class, json_codec.loads(stored.body))
+        self._cache.set(key, dados, key_class, timestamp=stored.fetched_at, etag=stored.etag, last_modified=stored.last_modified)
+        return dados
+
+    def _schedule_Refresh(self, key: str, key_class: str, endpoint: str, params: dict, error_message: str):
+        """
+        Agenda a atualização de uma chave do cache em segundo plano.
+
+        Não faz nada se já existir uma atualização em andamento para a mesma chave. Em caso
+        de erro, o dado velho continua no cache até expirar de vez.
+
+        Args:
+            key (str): Chave do cache a ser atualizada.
+            key_class (str): Classe da chave.
+            endpoint (str): Endpoint da API, relativo à URL base.
+            params (dict): Parâmetros de consulta da requisição.
+            error_message (str): Mensagem exibida caso a requisição falhe.
+        """
+        task = self._refresh_tasks.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def refresh():
+            try:
+                await self._fetch(key, key_class, endpoint, params)
+            except Exception as e:
+                log.warning(error_message, extra={**error_Fields(e), "key_class": key_class, "background": True})
+            finally:
+                self._refresh_tasks.pop(key, None)
+
+        self._refresh_tasks[key] = asyncio.create_task(refresh())
+
+    async def get_UltimaPartida(self):
+        """
+        Obtém os dados da última partida finalizada da FURIA em CS:GO.
+
+        Verifica se há dados válidos no cache (ver CACHE_POLICIES). Se o cache estiver
+        válido, retorna os dados armazenados. Se estiver velho, retorna o dado armazenado e
+        atualiza em segundo plano. Caso contrário, faz uma requisição à API PandaScore para
+        obter a última partida finalizada da FURIA (opponent_id: 124530), armazena o
+        resultado no cache e o retorna.
+
+        Returns:
+            Tuple[Match, ...]: Tupla com a última partida, incluindo campos como
+                'opponents', 'results', 'winner' e 'highlight_url'.
+
+        Example:
+            >>> client = PandaScoreClient("sua-chave")
+            >>> partida = await client.get_Ultima_Partida()
+            >>> print(partida)
+            (Match(id=..., opponents=(...), results=(...), winner=Team(...), ...),)
+        """
+        return await self._get_Cached(
+            "ultima_partida",
+            endpoint="/matches",
+            params=
+            {
+                "filter[status]": "finished",
+                
+                "filter[opponent_id]": FURIA_ID,
+                "sort": "-begin_at",
+                "page[size]": 1
+            },
+            error_message="Não foi possivel realizar a requisição a Ultima partida da Furia"
+        )
+    
+    async def get_ProximasPartidas(self):
+        """Retorna a Proxima Partida da Furia"""
+        return await self._get_Cached(
+            "proximas_partidas",
+            endpoint="matches/upcoming",
+            params=
+            {
+                "filter[opponent_id]": FURIA_ID
+            },
+            error_message="Nao foi possivel realizar a requisição a Proximas Partidas da Furia"
+        )
+
+    async def get_PartidaEmAndamento(self):
+        return await self._get_Cached(
+            "partida_andamento",
+            endpoint="matches/running",
+            params=
+            {
+                "filter[opponent_id]": FURIA_ID
+            },
+            error_message="Nao foi possivel fazer a requisição para partidas em andamento"
+        )
         
     async def get_Time(self):
         """
         Retorna a composição do time completo da FURIA
         """
-        if time.time() - self._cache["time_completo"]["cache_timestamp"] < self._cache_ttl:
-            return self._cache["time_completo"]["data"]
-        try:
+        return await self._get_Cached(
+            "time_completo",
+            endpoint="/teams",
+            params=
+            {
+                "filter[id]": FURIA_ID
+            },
+            error_message="Nao foi possivel realizar a requisição a get_Team"
+        )
 
-            dados = await self._request(
-                method="GET",
-                endpoint="/teams",
-                params=
-                {
-                    "filter[id]": FURIA_ID
-                }
-            )
+    async def get_PartidasFinalizadas(self, desde: Optional[str] = None, page: int = 1, per_page: int = 100) -> Tuple[Match, ...]:
+        """
+        Busca uma página das partidas finalizadas da FURIA, da mais antiga para a mais recente.
 
-            self._cache["time_completo"] = {"data": dados, "cache_timestamp": time.time()}
-            return dados
-        except Exception as e:
-            print(f"Nao foi possivel realizar a requisição a get_Team: ERRO {e}\n\n")
-            return []
\ No newline at end of file
+        Usada pela sincronização do `MatchArchive`, que guarda o histórico localmente; por
+        isso não passa pelo cache (cada página é pedida uma única vez por sincronização).
+
+        Args:
+            desde (str, optional): Início mínimo (ISO 8601, inclusivo) das partidas. Se None,
+                busca desde a primeira partida. Defaults to None.
+            page (int): Página (a partir de 1). Defaults to 1.
+            per_page (int): Partidas por página (máximo da API: 100). Defaults to 100.
+
+        Returns:
+            Tuple[Match, ...]: Partidas da página, em ordem crescente de início.
+        """
+        params = {
+            "filter[status]": "finished",
+            "filter[opponent_id]": FURIA_ID,
+            "sort": "begin_at",
+            "page[size]": per_page,
+            "page[number]": page
+        }
+        if desde is not None:
+            params["range[begin_at]"] = f"{desde},{ARCHIVE_RANGE_END}"
+
+        inicio = time.perf_counter()
+        try:
+            data = await self._request("GET", "/matches", params=params)
+        except Exception:
+            self.upstream_errors.inc("arquivo_partidas")
+            raise
+        finally:
+            self.upstream_latency.observe(time.perf_counter() - inicio, "arquivo_partidas")
+
+        return parse_Matches(project(data, MATCH_FIELDS))
@@ -0,0 +1,357 @@
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from services.metrics import Histogram
+from typing import Deque, Dict, List, Optional
+import inspect
+import random
+import sys
+import threading
+import time
+
+# Etapas de uma atualizacao, na ordem em que acontecem
+STAGES = ("ingress", "decode", "queue", "dispatch", "upstream", "render", "send")
+
+# Buckets das etapas: a maioria fica abaixo de 1 ms quando o cache responde
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Trace da atualizacao amostrada em andamento no contexto atual (None fora da amostra)
+_current: ContextVar[Optional[dict]] = ContextVar("profiler_trace", default=None)
+
+class _NoStage:
+    """Etapa fora da amostra: não mede nada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Stage:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: dict, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        stages = self.trace["stages"]
+        stages[self.name] = stages.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+def stage(name: str):
+    """
+    Mede um trecho como uma etapa da atualização amostrada em andamento.
+
+    Fora de uma atualização amostrada custa só a leitura de uma `ContextVar`. Etapas
+    repetidas dentro da mesma atualização (ex.: duas consultas à PandaScore) são somadas.
+
+    Args:
+        name (str): Nome da etapa (ver STAGES).
+
+    Returns:
+        Gerenciador de contexto para o bloco `with`.
+    """
+    trace = _current.get()
+    if trace is None:
+        return _NO_STAGE
+    return _Stage(trace, name)
+
+
+def profiled(name: str):
+    """
+    Decorador que mede cada chamada da função (síncrona ou assíncrona) como uma etapa.
+
+    Args:
+        name (str): Nome da etapa (ver STAGES).
+
+    Returns:
+        Callable: Decorador.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class UpdateProfiler:
+    """
+    Amostragem das atualizações com o tempo gasto em cada etapa.
+
+    Uma fração `sample_rate` das atualizações recebe um trace no webhook; o trace segue com
+    a atualização pela fila (pelo `update_id`) e, no worker, fica em uma `ContextVar` durante
+    o processamento, onde `stage()` soma o tempo de cada etapa: recepção do corpo
+    ('ingress'), decodificação do JSON e do telebot ('decode'), espera na fila ('queue'),
+    handler inteiro ('dispatch', que inclui as etapas seguintes), consultas à PandaScore
+    ('upstream'), formatação ('render') e envios ao Telegram ('send'). Atualizações fora da
+    amostra não carregam trace e as etapas não medem nada.
+
+    As etapas vão para o histograma `update_stage_duration_seconds` e os últimos traces
+    ficam guardados para download.
+
+    Attributes:
+        sample_rate (float): Fração das atualizações amostradas (0 desliga).
+        histogram (Histogram): Duração de cada etapa nas atualizações amostradas.
+        recent (Deque[dict]): Últimos traces completos, do mais antigo ao mais recente.
+        stats (dict): Atualizações amostradas e traces descartados sem terminar.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, keep: int = 200, max_pending: int = 1000):
+        """
+        Inicializa a amostragem.
+
+        Args:
+            sample_rate (float): Fração das atualizações amostradas, entre 0 e 1.
+                Defaults to 0.0.
+            keep (int): Quantidade de traces completos guardados. Defaults to 200.
+            max_pending (int): Quantidade máxima de traces aguardando na fila (os mais
+                antigos são descartados). Defaults to 1000.
+        """
+        self.sample_rate = 0.0
+        self.set_Rate(sample_rate)
+        self.max_pending = max_pending
+        self.histogram = Histogram(
+            "update_stage_duration_seconds",
+            "Duração de cada etapa nas atualizações amostradas pelo profiler",
+            ("stage",),
+            buckets=STAGE_BUCKETS
+        )
+        self.recent: Deque[dict] = deque(maxlen=keep)
+        self._pending: Dict[int, dict] = {}
+        self.stats = {"sampled": 0, "abandoned": 0}
+
+    def set_Rate(self, sample_rate: float):
+        """
+        Altera a fração amostrada em tempo de execução.
+
+        Args:
+            sample_rate (float): Nova fração, entre 0 e 1.
+
+        Raises:
+            ValueError: Se a fração estiver fora do intervalo.
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"Fração de amostragem inválida: {sample_rate} (use um valor entre 0 e 1)")
+        self.sample_rate = sample_rate
+
+    def begin(self) -> Optional[dict]:
+        """
+        Sorteia se a atualização que está chegando entra na amostra.
+
+        Returns:
+            dict or None: Trace novo ou None fora da amostra.
+        """
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        self.stats["sampled"] += 1
+        return {"start": time.time(), "stages": {}}
+
+    def measure(self, trace: Optional[dict], name: str):
+        """
+        Mede uma etapa de um trace que ainda não está na `ContextVar` (no webhook).
+
+        Args:
+            trace (dict, optional): Trace de `begin()`.
+            name (str): Nome da etapa.
+
+        Returns:
+            Gerenciador de contexto para o bloco `with`.
+        """
+        return _NO_STAGE if trace is None else _Stage(trace, name)
+
+    def hand_Off(self, update_id: int, trace: dict):
+        """
+        Guarda o trace até um worker pegar a atualização da fila.
+
+        Args:
+            update_id (int): `update_id` da atualização enfileirada.
+            trace (dict): Trace de `begin()`.
+        """
+        if len(self._pending) >= self.max_pending:
+            # dict preserva a ordem de insercao: o primeiro e o mais antigo
+            del self._pending[next(iter(self._pending))]
+            self.stats["abandoned"] += 1
+        trace["handed_off"] = time.perf_counter()
+        self._pending[update_id] = trace
+
+    def discard(self, update_id: int):
+        """Esquece o trace de uma atualização que não entrou na fila."""
+        self._pending.pop(update_id, None)
+
+    def resume(self, update: dict, sample: bool = False) -> Optional[dict]:
+        """
+        Recupera o trace de uma atualização que saiu da fila.
+
+        Args:
+            update (dict): Atualização retirada da fila.
+            sample (bool): Se deve sortear um trace novo para atualizações que não passaram
+                pelo sorteio do webhook (long polling). Defaults to False.
+
+        Returns:
+            dict or None: Trace ou None fora da amostra.
+        """
+        if self._pending:
+            trace = self._pending.pop(update.get("update_id"), None)
+            if trace is not None:
+                trace["stages"]["queue"] = time.perf_counter() - trace.pop("handed_off")
+                return trace
+        return self.begin() if sample else None
+
+    def activate(self, trace: dict):
+        """
+        Torna o trace o atual do contexto (o worker chama antes dos handlers).
+
+        Args:
+            trace (dict): Trace de `resume()`.
+
+        Returns:
+            Token: Token para `finish()`.
+        """
+        return _current.set(trace)
+
+    def finish(self, trace: dict, token):
+        """
+        Encerra o trace: registra as etapas no histograma e guarda o trace completo.
+
+        Args:
+            trace (dict): Trace ativo.
+            token: Token devolvido por `activate()`.
+        """
+        _current.reset(token)
+        for name, seconds in trace["stages"].items():
+            self.histogram.observe(seconds, name)
+        trace["total"] = time.time() - trace["start"]
+        self.recent.append(trace)
+
+    def summary(self) -> dict:
+        """
+        Resume a amostragem para o download.
+
+        Returns:
+            dict: Fração amostrada, contadores, média e máximo por etapa e os últimos traces.
+        """
+        etapas = {}
+        for trace in self.recent:
+            for name, seconds in trace["stages"].items():
+                etapa = etapas.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+                etapa["count"] += 1
+                etapa["total"] += seconds
+                etapa["max"] = max(etapa["max"], seconds)
+
+        return {
+            "sample_rate": self.sample_rate,
+            **self.stats,
+            "stages": {
+                name: {"count": etapa["count"], "avg": etapa["total"] / etapa["count"], "max": etapa["max"]}
+                for name, etapa in sorted(etapas.items(), key=lambda item: STAGES.index(item[0]) if item[0] in STAGES else len(STAGES))
+            },
+            "traces": list(self.recent)
+        }
+
+
+class StackSampler:
+    """
+    Profiler estatístico da thread do event loop.
+
+    Enquanto ligado, uma thread em segundo plano lê a pilha da thread do loop a cada
+    `interval` segundos (via `sys._current_frames`) e conta as pilhas iguais. O resultado
+    sai no formato "folded" (uma pilha por linha, funções separadas por ';' e a contagem no
+    fim), aberto direto no speedscope ou no flamegraph.pl. Desligado, não existe thread
+    nem custo algum.
+
+    Attributes:
+        running (bool): Se uma coleta está em andamento.
+        stats (dict): Amostras coletadas e início e fim da última coleta.
+    """
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: Dict[str, int] = {}
+        self.stats = {"samples": 0, "started_at": 0.0, "finished_at": 0.0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float, interval: float = 0.005, thread_id: Optional[int] = None) -> bool:
+        """
+        Inicia uma coleta, descartando o resultado da anterior.
+
+        Args:
+            duration (float): Duração da coleta em segundos.
+            interval (float): Intervalo em segundos entre amostras. Defaults to 0.005.
+            thread_id (int, optional): Thread amostrada. Defaults to a thread que chamou
+                (a do event loop, quando chamado de uma rota).
+
+        Returns:
+            bool: False se já havia uma coleta em andamento.
+        """
+        if self.running:
+            return False
+
+        self._stop.clear()
+        self._stacks = {}
+        self.stats = {"samples": 0, "started_at": time.time(), "finished_at": 0.0}
+        alvo = thread_id if thread_id is not None else threading.get_ident()
+        self._thread = threading.Thread(
+            target=self._run, args=(alvo, duration, interval), name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Interrompe a coleta em andamento (o resultado parcial fica disponível)."""
+        self._stop.set()
+
+    def folded(self) -> str:
+        """
+        Retorna as pilhas coletadas no formato "folded", das mais frequentes às menos.
+
+        Returns:
+            str: Uma linha por pilha distinta.
+        """
+        pilhas = sorted(self._stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{pilha} {total}\n" for pilha, total in pilhas)
+
+    def _run(self, thread_id: int, duration: float, interval: float):
+        fim = time.monotonic() + duration
+        while not self._stop.is_set() and time.monotonic() < fim:
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+            pilha = _fold(frame)
+            self._stacks[pilha] = self._stacks.get(pilha, 0) + 1
+            self.stats["samples"] += 1
+            del frame
+            self._stop.wait(interval)
+        self.stats["finished_at"] = time.time()
+
+
+def _fold(frame) -> str:
+    """Pilha de um frame em uma linha 'modulo:funcao;...' da raiz até o frame."""
+    funcoes: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        funcoes.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(funcoes))
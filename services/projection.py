@@ -0,0 +1,42 @@
+from typing import Any, Callable, Dict, Union
+
+# Especificacao de projecao: campo -> None (mantem o valor inteiro), outra especificacao
+# (aplicada ao dicionario ou a cada item da lista) ou uma funcao que transforma o valor
+Projection = Dict[str, Union[None, "Projection", Callable[[Any], Any]]]
+
+def project(data: Any, spec: Projection) -> Any:
+    """
+    Mantém apenas os campos de `data` descritos em `spec`.
+
+    Dicionários perdem os campos fora da especificação; listas têm cada item projetado.
+    Campos ausentes continuam ausentes (nada é criado), então quem lê os dados com `.get()`
+    continua vendo os mesmos valores padrão.
+
+    Args:
+        data (Any): Dados parseados da API (dicionário, lista ou valor simples).
+        spec (Projection): Especificação dos campos a manter.
+
+    Returns:
+        Any: Nova estrutura só com os campos da especificação.
+
+    Example:
+        >>> project([{"id": 1, "name": "FURIA", "slug": "furia"}], {"id": None, "name": None})
+        [{'id': 1, 'name': 'FURIA'}]
+    """
+    if isinstance(data, list):
+        return [project(item, spec) for item in data]
+    if not isinstance(data, dict):
+        return data
+
+    projected = {}
+    for field, sub_spec in spec.items():
+        if field not in data:
+            continue
+        value = data[field]
+        if sub_spec is None or value is None:
+            projected[field] = value
+        elif callable(sub_spec):
+            projected[field] = sub_spec(value)
+        else:
+            projected[field] = project(value, sub_spec)
+    return projected
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+class _LeaderCancelled(Exception):
+    """A execução foi cancelada junto com o chamador que a iniciou (uso interno)."""
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes idênticas em uma única execução.
+
+    Enquanto uma chamada para uma chave estiver em andamento, qualquer outra chamada com a
+    mesma chave aguarda o mesmo resultado (ou a mesma exceção) em vez de disparar uma nova
+    execução. Útil para evitar rajadas de requisições idênticas à API quando o cache expira.
+
+    Se o chamador que iniciou a execução for cancelado, os que aguardavam não são: um deles
+    assume e executa a sua própria `func`, e os demais passam a aguardar essa nova execução.
+
+    Attributes:
+        stats (Dict[str, int]): Contadores de execuções reais ('flights'), de chamadores
+            atendidos ('callers') e de chamadores que pegaram carona ('coalesced').
+        recent_flights (List[Dict]): Últimas execuções concluídas, com a chave e quantos
+            chamadores cada uma atendeu.
+    """
+
+    def __init__(self, history_size: int = 50):
+        """
+        Inicializa o agrupador de chamadas.
+
+        Args:
+            history_size (int): Quantidade de execuções concluídas mantidas em
+                `recent_flights`. Defaults to 50.
+        """
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._callers: Dict[Hashable, int] = {}
+        self._history_size = history_size
+
+        self.recent_flights: List[Dict[str, Any]] = []
+        self.stats = {"flights": 0, "callers": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `func` uma única vez para todos os chamadores concorrentes de `key`.
+
+        Args:
+            key (Hashable): Identificador da chamada (ex.: endpoint + parâmetros).
+            func (Callable): Função sem argumentos que retorna o awaitable a executar.
+
+        Returns:
+            Any: Resultado compartilhado da execução.
+
+        Raises:
+            Exception: A mesma exceção levantada por `func` é repassada a todos os
+                chamadores que aguardavam a execução.
+        """
+        self.stats["callers"] += 1
+        carona = False
+
+        future = self._inflight.get(key)
+        while future is not None:
+            # Ja existe uma requisicao em andamento, apenas aguardo o resultado dela
+            self._callers[key] += 1
+            if not carona:
+                carona = True
+                self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # Quem iniciou foi cancelado: o primeiro a acordar assume a execucao
+                future = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._callers[key] = 1
+        self.stats["flights"] += 1
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            # Cancelar o future cancelaria tambem quem so aguardava o resultado
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita aviso de excecao nunca recuperada quando ninguem mais aguardava
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    def _finish(self, key: Hashable):
+        """
+        Remove a chave das execuções em andamento e registra quantos chamadores atendeu.
+
+        Args:
+            key (Hashable): Identificador da execução concluída.
+        """
+        self._inflight.pop(key, None)
+        callers = self._callers.pop(key, 1)
+
+        self.recent_flights.append({"key": key, "callers": callers})
+        if len(self.recent_flights) > self._history_size:
+            del self.recent_flights[0]
@@ -4,11 +4,32 @@ from telebot import types
 from handlers.message_handler import MessageHandler
 from handlers.callback_handler import CallbacksHandler
 import asyncio
+import hmac
+import ipaddress
+import logging
+import time
+from typing import Optional
 from services.pandas_score_client import PandaScoreClient
+from services.update_queue import UpdateQueue
+from services.update_poller import UpdatePoller
+from services.outbound_scheduler import OutboundScheduler
+from services.media_cache import MediaCache
+from services.image_prefetcher import ImagePrefetcher
+from services.live_broadcaster import LiveMatchBroadcaster, SubscriberStore
+from services.match_archive import MatchArchive
+from services.metrics import Histogram, LoopLagMonitor, MetricsRegistry
+from services.update_filter import fast_CallbackQuery, is_Relevant
+from services.dedup_window import DedupWindow
+from services.profiler import StackSampler, UpdateProfiler, stage
 from telebot.types import BotCommand
 from hypercorn.asyncio import serve
 from hypercorn.config import Config
-from utils.formatResponse import get_Curiosidades 
+from services.chat_state import ChatStateStore
+from utils.curiosidades import CuriosidadesStore
+from utils.formatResponse import format_Confronto, format_Forma
+from utils import event_log, json_codec
+
+log = logging.getLogger(__name__)
 
 class TelegramBotClient:
     """Cliente para gerenciar um bot Telegram com suporte a webhooks.
@@ -19,56 +40,464 @@ class TelegramBotClient:
 
     Attributes:
         bot (AsyncTeleBot): Instância do bot Telegram configurada com o token.
+        sender (OutboundScheduler): Agendador de envios ao Telegram com limite global, por
+            chat e prioridades.
+        media_cache (MediaCache): Cache dos `file_id` das fotos já enviadas ao Telegram.
+        chat_state (ChatStateStore): Estado compacto por chat (rotação das curiosidades e
+            última página do time vista), limitado por memória.
+        curiosidades (CuriosidadesStore): Curiosidades em memória com rotação sem repetição
+            por chat.
+        live_broadcaster (LiveMatchBroadcaster): Poller único que avisa os chats inscritos
+            em /seguir sobre início, placar e fim das partidas da FURIA.
+        match_archive (MatchArchive): Histórico local das partidas finalizadas, usado por
+            /confronto e /forma.
         callback_handler (CallbacksHandler): Manipulador de callbacks de botões inline.
         handler (MessageHandler): Manipulador de mensagens e comandos do usuário.
         app (Quart): Aplicação Quart para gerenciar rotas do webhook.
         webhook_url (str): URL base do webhook (ex.: 'https://d1c8-45-187-27-161.ngrok-free.app/').
+        update_queue (UpdateQueue): Fila limitada onde o webhook deposita as atualizações para
+            os workers processarem em segundo plano.
+        mode (str): Como as atualizações chegam: 'webhook' (padrão) ou 'polling'
+            (long polling com `getUpdates`, sem precisar de URL pública).
+        update_poller (UpdatePoller): Poller usado no modo 'polling'.
+        metrics (MetricsRegistry): Métricas do bot, expostas em texto na rota /metrics.
+        loop_lag (LoopLagMonitor): Medidor do atraso do event loop.
+        update_stats (dict): Atualizações descartadas pelo filtro de bytes do webhook
+            ('dropped'), reenvios descartados ('duplicate') e atualizações processadas pelo
+            caminho rápido ('fast_path') ou pelo telebot ('full').
+        recent_updates (DedupWindow): `update_id` recebidos recentemente pelo webhook.
+        profiler (UpdateProfiler): Amostragem do tempo de cada etapa das atualizações.
+        stack_sampler (StackSampler): Profiler estatístico ligado sob demanda pelas rotas
+            /debug/profile.
     """
-    def __init__(self, bot_token: str, webhook_url: str, pandas_client: PandaScoreClient):
+    def __init__(
+        self,
+        bot_token: str,
+        webhook_url: str,
+        pandas_client: PandaScoreClient,
+        update_workers: int = 8,
+        update_queue_size: int = 1000,
+        update_dedup_window: float = 600.0,
+        media_cache_path: Optional[str] = None,
+        subscribers_path: Optional[str] = None,
+        live_poll_interval: float = 30.0,
+        archive_path: Optional[str] = None,
+        archive_sync_interval: float = 3600.0,
+        chat_state_path: Optional[str] = None,
+        chat_state_memory: int = 32 * 1024 * 1024,
+        chat_state_snapshot_interval: float = 300.0,
+        profile_sample_rate: float = 0.0,
+        profiler_token: Optional[str] = None,
+        host: str = "0.0.0.0",
+        port: int = 5000,
+        mode: str = "webhook",
+        polling_limit: int = 100,
+        polling_timeout: int = 30,
+        global_rate: float = 30,
+        primary: bool = True,
+        shared: bool = False,
+        listen_fd: Optional[int] = None
+    ):
         """Inicializa o cliente do bot Telegram com token, URL do webhook e cliente PandaScore.
 
         Args:
             bot_token (str): Token de autenticação do bot fornecido pelo @BotFather.
             webhook_url (str): URL base para o webhook (ex.: 'https://d1c8-45-187-27-161.ngrok-free.app/').
             pandas_client (PandaScoreClient): Cliente configurado para acessar a API PandaScore.
+            update_workers (int): Quantidade de workers processando as atualizações.
+                Defaults to 8.
+            update_queue_size (int): Capacidade máxima da fila de atualizações.
+                Defaults to 1000.
+            update_dedup_window (float): Tempo em segundos em que um `update_id` reenviado
+                pelo Telegram ao webhook é descartado como duplicado. Defaults to 600.0.
+            media_cache_path (str, optional): Arquivo JSON onde os `file_id` das fotos
+                enviadas são persistidos. Se None, ficam só em memória. Defaults to None.
+            subscribers_path (str, optional): Arquivo onde os chats inscritos em /seguir são
+                persistidos. Se None, ficam só em memória. Defaults to None.
+            live_poll_interval (float): Intervalo em segundos entre consultas das partidas
+                ao vivo para os inscritos. Defaults to 30.0.
+            archive_path (str, optional): Arquivo SQLite do histórico de partidas. Se None,
+                fica só em memória. Defaults to None.
+            archive_sync_interval (float): Intervalo em segundos entre sincronizações do
+                histórico de partidas. Defaults to 3600.0.
+            chat_state_path (str, optional): Arquivo de snapshot do estado dos chats. Se
+                None, o estado fica só em memória. Defaults to None.
+            chat_state_memory (int): Orçamento em bytes do estado dos chats; os chats usados
+                há mais tempo são descartados ao atingi-lo. Defaults to 32 MiB.
+            chat_state_snapshot_interval (float): Intervalo em segundos entre snapshots do
+                estado dos chats. Defaults to 300.0.
+            profile_sample_rate (float): Fração das atualizações com o tempo de cada etapa
+                medido (0 desliga). Pode ser alterada depois pela rota /debug/profile.
+                Defaults to 0.0.
+            profiler_token (str, optional): Token exigido pelas rotas /debug/profile. Se
+                None, as rotas não são registradas. Defaults to None.
+            host (str): Endereço em que o servidor do webhook escuta. Defaults to '0.0.0.0'.
+            port (int): Porta em que o servidor do webhook escuta. Defaults to 5000.
+            mode (str): 'webhook' ou 'polling'. No modo 'polling' o `webhook_url` não é
+                usado e o servidor continua no ar apenas para a rota /metrics.
+                Defaults to 'webhook'.
+            polling_limit (int): Atualizações por chamada a `getUpdates`. Defaults to 100.
+            polling_timeout (int): Tempo de espera em segundos de cada chamada a
+                `getUpdates`. Defaults to 30.
+            global_rate (float): Envios por segundo ao Telegram permitidos a este processo.
+                Com vários workers, o limite do bot deve ser dividido entre eles.
+                Defaults to 30.
+            primary (bool): Se este processo configura o webhook e roda o poller das
+                partidas ao vivo. Com vários workers, apenas um deve ser o principal.
+                Defaults to True.
+            shared (bool): Se os arquivos de inscritos e do cache de mídia são
+                compartilhados com outros processos do bot. Defaults to False.
+            listen_fd (int, optional): Socket já aberto (herdado do processo pai) em que o
+                servidor escuta, no lugar de `host`:`port`. Defaults to None.
         """
+        if mode not in ("webhook", "polling"):
+            raise ValueError(f"Modo de atualização inválido: {mode} (use 'webhook' ou 'polling')")
+
+        self.pandas_client = pandas_client
 
         # instancias necessarias para conexao com o bot, troca de mensagens por botoes inline e envio de mensagens
         self.bot = AsyncTeleBot(bot_token)
-        self.callback_handler = CallbacksHandler(self.bot, pandas_client)
-        self.handler = MessageHandler(self.bot)
+        self.media_cache = MediaCache(media_cache_path, shared=shared)
+        self.image_prefetcher = ImagePrefetcher(http_client=pandas_client)
+        self.sender = OutboundScheduler(
+            self.bot,
+            global_rate=global_rate,
+            global_burst=global_rate,
+            media_cache=self.media_cache,
+            image_prefetcher=self.image_prefetcher
+        )
+        self.chat_state = ChatStateStore(
+            memory_budget=chat_state_memory,
+            path=chat_state_path,
+            snapshot_interval=chat_state_snapshot_interval
+        )
+        self.callback_handler = CallbacksHandler(self.bot, pandas_client, self.sender, chat_state=self.chat_state)
+        self.handler = MessageHandler(self.bot, self.sender)
+        self.curiosidades = CuriosidadesStore(chat_state=self.chat_state)
+        self.live_broadcaster = LiveMatchBroadcaster(
+            pandas_client,
+            self.sender,
+            SubscriberStore(subscribers_path, shared=shared),
+            interval=live_poll_interval
+        )
+        self.match_archive = MatchArchive(archive_path or ":memory:", pandas_client, interval=archive_sync_interval)
 
         # inicialização para expor localmente e criar conexao webhook posteriormente
         self.app = Quart(__name__)
         self.webhook_url = webhook_url
+        self.host = host
+        self.port = port
+        self.primary = primary
+        self.listen_fd = listen_fd
+
+        # Fila de atualizacoes: o webhook responde na hora e os workers processam depois
+        self.update_queue = UpdateQueue(self._process_Update, maxsize=update_queue_size, workers=update_workers)
+
+        # Reenvios do Telegram (webhook lento ou 5xx) chegam com o mesmo update_id
+        self.recent_updates = DedupWindow(update_dedup_window, capacity=max(10000, update_queue_size * 2))
+
+        # Long polling: alternativa ao webhook que deposita os lotes na mesma fila
+        self.mode = mode
+        self.update_poller = UpdatePoller(
+            bot_token,
+            self.update_queue,
+            limit=polling_limit,
+            timeout=polling_timeout,
+            allowed_updates=["message", "callback_query"]
+        )
+
+        # Metricas: histogramas proprios e os contadores que os componentes ja mantem
+        self.webhook_latency = Histogram("webhook_request_duration_seconds", "Duração das requisições ao webhook", ("status",))
+        self.update_latency = Histogram("update_processing_duration_seconds", "Duração do processamento de cada atualização pelos handlers")
+        self.loop_lag = LoopLagMonitor()
+        self.update_stats = {"dropped": 0, "duplicate": 0, "fast_path": 0, "full": 0}
+
+        # Profiler: desligado, custa um sorteio no webhook e uma leitura de ContextVar por etapa
+        self.profiler = UpdateProfiler(profile_sample_rate)
+        self.stack_sampler = StackSampler()
+        self.profiler_token = profiler_token
+        self.metrics = MetricsRegistry()
+        self._register_metrics()
 
         # Registro de rotas e handlers
         self._register_routes()
         self._register_handlers()
 
+    async def _process_Update(self, update: dict):
+        """Repassa uma atualização bruta aos handlers do bot.
+
+        Executado pelos workers da fila de atualizações. Callbacks de botões conhecidos vão
+        direto ao `CallbacksHandler` como `FastCallbackQuery`; o resto é convertido em
+        objeto Update e passa pelo telebot. Se a atualização estiver na amostra do
+        profiler, o trace fica ativo enquanto os handlers rodam.
+
+        O `update_id`, o chat e a ação entram no contexto dos logs, então qualquer registro
+        feito pelos handlers (ou pela fila, se o processamento falhar) sai com esses campos.
+        Com o nível DEBUG, cada atualização processada gera um registro com a latência.
+
+        Args:
+            update (dict): JSON da atualização recebida do Telegram.
+
+        Returns:
+            None
+        """
+        event_log.bind(**_update_Fields(update))
+        inicio = time.perf_counter()
+
+        trace = self.profiler.resume(update, sample=self.mode == "polling")
+        if trace is None:
+            await self._dispatch_Update(update)
+        else:
+            token = self.profiler.activate(trace)
+            try:
+                await self._dispatch_Update(update)
+            finally:
+                self.profiler.finish(trace, token)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Atualização processada", extra={"latency_ms": round((time.perf_counter() - inicio) * 1000, 3)})
+
+    async def _dispatch_Update(self, update: dict):
+        """Decodifica a atualização (caminho rápido ou telebot) e chama os handlers."""
+        with self.update_latency.time():
+            with stage("decode"):
+                call = fast_CallbackQuery(update, self.callback_handler.accepts)
+            if call is not None:
+                self.update_stats["fast_path"] += 1
+                with stage("dispatch"):
+                    await self.callback_handler.handle_Callback(call)
+            else:
+                self.update_stats["full"] += 1
+                with stage("decode"):
+                    updates = [types.Update.de_json(update)]
+                with stage("dispatch"):
+                    await self.bot.process_new_updates(updates)
+
+    async def _enqueue_Update(self, update: dict, trace: Optional[dict] = None) -> int:
+        """Enfileira uma atualização do webhook, descartando reenvios do mesmo `update_id`.
+
+        Args:
+            update (dict): JSON da atualização recebida do Telegram.
+            trace (dict, optional): Trace do profiler, se a atualização foi amostrada.
+                Defaults to None.
+
+        Returns:
+            int: Status HTTP da resposta ao webhook (200 ou 503 com a fila cheia).
+        """
+        update_id = update.get("update_id")
+        # O update_id e reservado antes do put: um reenvio que chega enquanto a fila cheia
+        # ainda espera ja e reconhecido como duplicado
+        if update_id is not None and self.recent_updates.seen(update_id):
+            self.update_stats["duplicate"] += 1
+            return 200
+
+        # O trace e entregue antes do put: um worker livre pode pegar a atualizacao na hora
+        if trace is not None and update_id is not None:
+            self.profiler.hand_Off(update_id, trace)
+        if not await self.update_queue.put(update):
+            if trace is not None:
+                self.profiler.discard(update_id)
+            if update_id is not None:
+                self.recent_updates.discard(update_id)
+            return 503
+        return 200
+
+    def _register_metrics(self):
+        """Registra no `MetricsRegistry` as métricas dos componentes do bot.
+
+        Histogramas e contadores dos componentes são lidos direto; os dicionários `stats`
+        já existentes são convertidos em amostras só quando /metrics é consultada.
+
+        Returns:
+            None
+        """
+        self.metrics.register(
+            self.webhook_latency,
+            self.update_latency,
+            self.callback_handler.latency,
+            self.profiler.histogram,
+            self.pandas_client.upstream_latency,
+            self.pandas_client.upstream_errors,
+            self.sender.calls,
+            self.loop_lag.histogram
+        )
+
+        def coletar():
+            cache = self.pandas_client.get_CacheStats()
+            resultados = ("hits", "stale_hits", "negative_hits", "misses")
+            yield ("pandascore_cache_requests_total", "counter", "Consultas ao cache da PandaScore por classe de chave e resultado",
+                   [({"key_class": key_class, "result": resultado}, stats[resultado]) for key_class, stats in cache.items() for resultado in resultados])
+            yield ("pandascore_cache_hit_ratio", "gauge", "Fração das consultas atendidas pelo cache (inclui dado velho e falha cacheada)",
+                   [({"key_class": key_class}, _hit_Ratio(stats)) for key_class, stats in cache.items()])
+            yield ("pandascore_cache_evictions_total", "counter", "Entradas descartadas do cache por limite de tamanho",
+                   [({"key_class": key_class}, stats["evictions"]) for key_class, stats in cache.items()])
+
+            yield ("pandascore_not_modified_total", "counter", "Revalidações respondidas com 304 pela PandaScore", [({}, self.pandas_client.stats["not_modified"])])
+            yield ("pandascore_bytes_received_total", "counter", "Bytes recebidos da PandaScore", [({}, self.pandas_client.stats["bytes_received"])])
+
+            router = self.callback_handler.router.stats
+            yield ("callback_answers_total", "counter", "Callbacks respondidos com answer_callback_query, por resultado",
+                   [({"result": "ok"}, router["answered"]), ({"result": "error"}, router["answer_errors"])])
+            yield ("callback_unrouted_total", "counter", "Callbacks sem rota registrada", [({}, router["unrouted"])])
+            yield ("callback_debounced_total", "counter", "Cliques repetidos ignorados pelo debounce", [({}, router["debounced"])])
+
+            yield ("telegram_rate_limited_total", "counter", "Respostas 429 recebidas do Telegram", [({}, self.sender.stats["rate_limited"])])
+            yield ("telegram_send_failures_total", "counter", "Envios ao Telegram que falharam de vez", [({}, self.sender.stats["failed"])])
+
+            fila = self.update_queue.get_Metrics()
+            yield ("update_queue_depth", "gauge", "Atualizações aguardando na fila", [({}, fila["depth"])])
+            yield ("update_queue_rejected_total", "counter", "Atualizações recusadas com a fila cheia (503)", [({}, fila["rejected"])])
+            yield ("update_queue_wait_seconds_max", "gauge", "Maior espera de uma atualização na fila", [({}, fila["wait_time_max"])])
+
+            yield ("updates_processed_total", "counter", "Atualizações por caminho: filtro de bytes ('dropped'), caminho rápido ou telebot ('full')",
+                   [({"path": caminho}, total) for caminho, total in self.update_stats.items()])
+
+            yield ("update_poller_updates_total", "counter", "Atualizações recebidas por long polling", [({}, self.update_poller.stats["updates"])])
+            yield ("update_poller_errors_total", "counter", "Chamadas a getUpdates que falharam", [({}, self.update_poller.stats["errors"])])
+
+            yield ("event_loop_lag_last_seconds", "gauge", "Último atraso medido do event loop", [({}, self.loop_lag.last_lag)])
+            yield ("media_cache_requests_total", "counter", "Consultas ao cache de file_id por resultado",
+                   [({"result": "hit"}, self.media_cache.stats["hits"]), ({"result": "miss"}, self.media_cache.stats["misses"])])
+            yield ("match_archive_syncs_total", "counter", "Sincronizações do histórico de partidas, por resultado",
+                   [({"result": "ok"}, self.match_archive.stats["syncs"]), ({"result": "error"}, self.match_archive.stats["errors"])])
+            yield ("match_archive_last_sync_timestamp_seconds", "gauge", "Momento da última sincronização do histórico de partidas", [({}, self.match_archive.stats["last_sync"])])
+
+            yield ("live_subscribers", "gauge", "Chats inscritos em /seguir", [({}, len(self.live_broadcaster.subscribers))])
+            yield ("chat_state_chats", "gauge", "Chats com estado em memória", [({}, len(self.chat_state))])
+            yield ("chat_state_memory_bytes", "gauge", "Estimativa da memória usada pelo estado dos chats", [({}, self.chat_state.memory_Bytes())])
+            yield ("chat_state_evictions_total", "counter", "Chats descartados do estado pelo limite de memória", [({}, self.chat_state.stats["evicted"])])
+
+            logs = event_log.get_Stats()
+            yield ("log_records_dropped_total", "counter", "Registros de log descartados, por motivo: fila cheia ou repetição limitada",
+                   [({"reason": "queue_full"}, logs["dropped"]), ({"reason": "repeated"}, logs["suppressed"])])
+
+        self.metrics.add_Collector(coletar)
+
     # Registra a rota da minha webhook
     def _register_routes(self):
         """Registra a rota do webhook para receber atualizações do Telegram.
 
-        Configura uma rota POST no formato '/webhook/<bot_token>' para processar atualizações
-        enviadas pelo Telegram. As atualizações são passadas ao bot para processamento assíncrono.
+        Configura uma rota POST no formato '/webhook/<bot_token>' para receber atualizações
+        enviadas pelo Telegram. As atualizações são colocadas na fila de atualizações e
+        processadas pelos workers em segundo plano.
 
         Returns:
             None
         """
         @self.app.route(f'/webhook/{self.bot.token}', methods=['POST'])
         async def webhook():
-            """Processa atualizações recebidas via webhook.
+            """Recebe atualizações via webhook e as enfileira para processamento.
+
+            Responde imediatamente, sem aguardar os handlers. Atualizações de tipos que o bot
+            não trata são descartadas direto nos bytes, sem decodificar o JSON, e reenvios de
+            um `update_id` já enfileirado são confirmados sem processar de novo. Se a fila
+            continuar cheia, responde 503 para que o Telegram reenvie a atualização mais tarde
+            (o `update_id` reservado é liberado, para o reenvio ser aceito).
+
+            Returns:
+                tuple: Resposta HTTP com corpo vazio e status 200 (400 se o corpo não for
+                    um objeto JSON válido ou 503 se a fila estiver cheia).
+            """
+            inicio = time.perf_counter()
+            trace = self.profiler.begin()
+            with self.profiler.measure(trace, "ingress"):
+                body = await request.get_data()
+
+            if not is_Relevant(body):
+                self.update_stats["dropped"] += 1
+                status = 200
+            else:
+                try:
+                    with self.profiler.measure(trace, "decode"):
+                        update = json_codec.loads(body)
+                except ValueError:
+                    status = 400
+                else:
+                    # JSON valido mas que nao e um objeto (ex.: uma lista) tambem e corpo invalido
+                    status = await self._enqueue_Update(update, trace) if isinstance(update, dict) else 400
+            self.webhook_latency.observe(time.perf_counter() - inicio, str(status))
+            return '', status
+
+        @self.app.route('/metrics', methods=['GET'])
+        async def metrics():
+            """Expõe as métricas do bot no formato de texto do Prometheus.
+
+            Returns:
+                tuple: Texto das métricas, status 200 e Content-Type do formato 0.0.4.
+            """
+            return self.metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+        if self.profiler_token:
+            self._register_profiler_routes()
+
+    def _register_profiler_routes(self):
+        """Registra as rotas /debug/profile de controle e download do profiler.
 
-            Recebe dados JSON do Telegram, converte em um objeto Update e passa para o bot
-            processar mensagens ou callbacks.
+        As rotas só respondem a requisições da própria máquina (loopback) com o cabeçalho
+        `X-Profiler-Token` igual a `profiler_token`; o resto recebe 404, como se a rota não
+        existisse. Com vários workers, cada processo tem o seu profiler e a requisição cai
+        no processo que aceitou a conexão.
+
+        Returns:
+            None
+        """
+        def autorizado() -> bool:
+            token = request.headers.get('X-Profiler-Token', '')
+            return _is_Loopback(request.remote_addr) and hmac.compare_digest(token, self.profiler_token)
+
+        @self.app.route('/debug/profile', methods=['GET', 'POST'])
+        async def profile():
+            """Baixa (GET) o resumo das etapas e os últimos traces amostrados, em JSON, ou
+            altera (POST `?rate=0.05`) a fração das atualizações amostradas.
 
             Returns:
-                tuple: Resposta HTTP com corpo vazio e status 200.
+                tuple: JSON do resumo e status 200 (400 com `rate` inválido, 404 sem
+                    autorização).
             """
-            update = await request.get_json()
-            await self.bot.process_new_updates([types.Update.de_json(update)])
-            return '', 200
+            if not autorizado():
+                return '', 404
+            if request.method == 'POST':
+                try:
+                    self.profiler.set_Rate(float(request.args.get('rate', '')))
+                except ValueError as e:
+                    return str(e), 400
+
+            resumo = {**self.profiler.summary(), "stack_sampler": {"running": self.stack_sampler.running, **self.stack_sampler.stats}}
+            return json_codec.dumps(resumo), 200, {
+                'Content-Type': 'application/json',
+                'Content-Disposition': 'attachment; filename="update_stages.json"'
+            }
+
+        @self.app.route('/debug/profile/stacks', methods=['GET', 'POST', 'DELETE'])
+        async def profile_stacks():
+            """Liga (POST `?seconds=30&interval=0.005`) ou interrompe (DELETE) o profiler
+            estatístico do event loop, ou baixa (GET) as pilhas coletadas no formato "folded".
+
+            Returns:
+                tuple: Pilhas coletadas e status 200 (202 ao ligar, 400 com parâmetros
+                    inválidos, 409 se já houver uma coleta, 404 sem autorização).
+            """
+            if not autorizado():
+                return '', 404
+            if request.method == 'DELETE':
+                self.stack_sampler.stop()
+                return '', 200
+            if request.method == 'POST':
+                try:
+                    seconds = float(request.args.get('seconds', 30))
+                    interval = float(request.args.get('interval', 0.005))
+                except ValueError:
+                    return 'seconds e interval devem ser números', 400
+                if not 0 < seconds <= 600 or not 0.001 <= interval <= 1:
+                    return 'use 0 < seconds <= 600 e 0.001 <= interval <= 1', 400
+                if not self.stack_sampler.start(seconds, interval):
+                    return 'já existe uma coleta em andamento', 409
+                return '', 202
+
+            return self.stack_sampler.folded(), 200, {
+                'Content-Type': 'text/plain; charset=utf-8',
+                'Content-Disposition': 'attachment; filename="event_loop.folded"'
+            }
 
     # Registra os handlers para envio de mensagens
     def _register_handlers(self):
@@ -100,15 +529,68 @@ class TelegramBotClient:
             """
             Manipulador para envio de curiosidades sobre a FURIA
             """
-            curiosidade = get_Curiosidades()
-            await self.bot.send_message(message.chat.id, text=curiosidade, parse_mode='Markdown')
+            curiosidade = await self.curiosidades.get(message.chat.id)
+            await self.sender.send_message(message.chat.id, text=curiosidade, parse_mode='Markdown')
+
+        @self.bot.message_handler(commands=['seguir'])
+        async def handle_seguir(message):
+            """
+            Inscreve o chat nos avisos de partidas ao vivo da FURIA
+            """
+            if self.live_broadcaster.subscribers.add(message.chat.id):
+                text = "Fechou furioso(a)! Vou te avisar quando a FURIA entrar no server, a cada mapa e no fim da partida 🔔\nPra parar, manda /parar"
+            else:
+                text = "Tu já tá seguindo a FURIA, fica tranquilo(a) que eu aviso 😎"
+            await self.sender.send_message(message.chat.id, text=text)
+
+        @self.bot.message_handler(commands=['parar'])
+        async def handle_parar(message):
+            """
+            Cancela a inscrição do chat nos avisos de partidas ao vivo
+            """
+            if self.live_broadcaster.subscribers.remove(message.chat.id):
+                text = "Beleza, não vou mais mandar os avisos das partidas. Quando quiser voltar é só mandar /seguir 👊"
+            else:
+                text = "Tu não tá seguindo as partidas. Manda /seguir pra receber os avisos 🔔"
+            await self.sender.send_message(message.chat.id, text=text)
+
+        @self.bot.message_handler(commands=['confronto'])
+        async def handle_confronto(message):
+            """
+            Mostra o retrospecto da FURIA contra um adversário (ex.: /confronto MOUZ), a partir do histórico local
+            """
+            partes = (message.text or "").split(maxsplit=1)
+            if len(partes) < 2 or not partes[1].strip():
+                text = "Manda o nome do adversário junto, tipo: /confronto MOUZ 😉"
+            else:
+                confronto = await self.match_archive.head_To_Head(partes[1])
+                with stage("render"):
+                    text = format_Confronto(partes[1].strip(), confronto)
+            await self.sender.send_message(message.chat.id, text=text, parse_mode='Markdown')
+
+        @self.bot.message_handler(commands=['forma'])
+        async def handle_forma(message):
+            """
+            Mostra as últimas partidas da FURIA, a partir do histórico local
+            """
+            partidas = await self.match_archive.recent_Form()
+            with stage("render"):
+                text = format_Forma(partidas)
+            await self.sender.send_message(message.chat.id, text=text, parse_mode='Markdown')
 
-    async def start(self):
+    async def start(self, shutdown_trigger=None):
         """
-        Inicia o bot Telegram, configurando o webhook.
+        Inicia o bot Telegram, configurando o webhook ou o long polling conforme `mode`.
 
-        Remove webhooks existentes, configura um novo webhook
-        com a URL fornecida e inicia o servidor Quart com Hypercorn na porta 5000.
+        No processo principal, remove webhooks existentes e, no modo 'webhook', configura um
+        novo webhook com a URL fornecida (ver `configure_Updates`); no modo 'polling', inicia
+        o `UpdatePoller`. Nos dois casos inicia o servidor Quart com Hypercorn em
+        `host`:`port` (ou no socket `listen_fd`).
+
+        Args:
+            shutdown_trigger (Callable, optional): Corrotina que, ao terminar, encerra o
+                servidor (ex.: `asyncio.Event().wait`). Se None, o servidor roda até o
+                processo ser interrompido. Defaults to None.
 
         Returns:
             None
@@ -116,21 +598,65 @@ class TelegramBotClient:
         Notes:
             Requer as bibliotecas Quart e Hypercorn para o servidor webhook.
         """
+        if self.primary:
+            await self.configure_Updates()
+
+        config = Config()
+        # Os logs do Hypercorn seguem pelo mesmo pipeline (fila e JSON) do resto do bot
+        config.errorlog = logging.getLogger("hypercorn.error")
+
+        # Localhost (ou o socket compartilhado pelos workers)
+        if self.listen_fd is not None:
+            config.bind = [f"fd://{self.listen_fd}"]
+        else:
+            config.bind = [f"{self.host}:{self.port}"]
+
+        await self.media_cache.load()
+        await self.curiosidades.load()
+        await self.chat_state.start()
+        await self.sender.start()
+        await self.update_queue.start()
+        if self.primary:
+            await self.live_broadcaster.start()
+            await self.match_archive.start()
+        await self.loop_lag.start()
+        if self.mode == "polling" and self.primary:
+            await self.update_poller.start()
+        try:
+            await serve(self.app, config, shutdown_trigger=shutdown_trigger)
+        finally:
+            await self.update_poller.stop()
+            await self.loop_lag.stop()
+            await self.live_broadcaster.stop()
+            await self.match_archive.stop()
+            await self.update_queue.stop()
+            await self.sender.stop()
+            await self.chat_state.stop()
+            await self.image_prefetcher.close()
+            await self.media_cache.close()
+
+    async def configure_Updates(self):
+        """
+        Remove webhooks existentes e, no modo 'webhook', registra o webhook do bot.
+
+        Chamado por `start()` apenas no processo principal, para que vários workers não
+        registrem o webhook repetidas vezes.
+
+        Returns:
+            None
+        """
         await asyncio.sleep(1) 
         await self.bot.remove_webhook()
 
-        # Removo a slash antes do webhook para evitar problemas com a slash padrao que vem ao final da url gerada pelo ngrok
-        full_url = f"{self.webhook_url}webhook/{self.bot.token}"
-        
-        # Seto a webhook
-        print(f"⏳ Configurando webhook: {full_url}")
-        await self.bot.set_webhook(url=full_url, allowed_updates=["message", "callback_query"])
-        
-        config = Config()
+        if self.mode == "webhook":
+            # Removo a slash antes do webhook para evitar problemas com a slash padrao que vem ao final da url gerada pelo ngrok
+            full_url = f"{self.webhook_url}webhook/{self.bot.token}"
 
-        # Localhost
-        config.bind = ["0.0.0.0:5000"]
-        await serve(self.app, config)
+            # Seto a webhook
+            log.info("Configurando webhook", extra={"webhook_url": self.webhook_url})
+            await self.bot.set_webhook(url=full_url, allowed_updates=["message", "callback_query"])
+        else:
+            log.info("Buscando atualizações por long polling")
         
     async def set_BotConfig(self):
         """
@@ -140,9 +666,35 @@ class TelegramBotClient:
             await self.bot.set_my_name("FURIA CS BOT 🔥")
             await self.bot.set_my_description("Bot da FURIA exclusivo para CS 🔫. Acompanhe o time da FURIA 🐈‍⬛")
             await self.bot.set_my_short_description("Bot da Furia CS. Manda aquele /menu pra acessar o menu principal ou /curiosidade pra curiosidades sobre a FURIA fera 😎")
-            await self.bot.set_my_commands([BotCommand("menu", "Menu principal"), BotCommand("curiosidade", "Curiosidades da FURIA")])
+            await self.bot.set_my_commands([BotCommand("menu", "Menu principal"), BotCommand("curiosidade", "Curiosidades da FURIA"), BotCommand("seguir", "Avisos das partidas ao vivo"), BotCommand("parar", "Parar os avisos das partidas"), BotCommand("confronto", "Retrospecto contra um adversário"), BotCommand("forma", "Últimas partidas da FURIA")])
         except Exception as e:
-            print(f"Problema em configurar o BOT: ERRO: {e}\n\n")
+            log.error("Problema em configurar o BOT", extra=event_log.error_Fields(e))
 
 
-        
+def _update_Fields(update: dict) -> dict:
+    """Campos de log de uma atualização: `update_id`, chat e ação (comando ou `callback_data`)."""
+    call = update.get("callback_query")
+    if call is not None:
+        message = call.get("message") or {}
+        chat_id = message.get("chat", {}).get("id", call.get("from", {}).get("id"))
+        return {"update_id": update.get("update_id"), "chat_id": chat_id, "action": call.get("data")}
+
+    message = update.get("message") or {}
+    texto = message.get("text") or ""
+    acao = texto.split(maxsplit=1)[0].split("@", 1)[0] if texto.startswith("/") else "message"
+    return {"update_id": update.get("update_id"), "chat_id": message.get("chat", {}).get("id"), "action": acao}
+
+
+def _hit_Ratio(stats: dict) -> float:
+    """Fração das consultas ao cache que não precisaram esperar a API."""
+    atendidas = stats["hits"] + stats["stale_hits"] + stats["negative_hits"]
+    total = atendidas + stats["misses"]
+    return atendidas / total if total else 0.0
+
+
+def _is_Loopback(endereco: Optional[str]) -> bool:
+    """Diz se o endereço do cliente é da própria máquina."""
+    try:
+        return ipaddress.ip_address(endereco or "").is_loopback
+    except ValueError:
+        return False
@@ -0,0 +1,80 @@
+from typing import Callable, NamedTuple, Optional
+
+# Tipos de atualizacao que o bot trata; o resto e descartado antes de decodificar o JSON
+RELEVANT_KEYS = (b'"message"', b'"callback_query"')
+
+def is_Relevant(body: bytes) -> bool:
+    """
+    Verifica, direto nos bytes do corpo, se a atualização é de um tipo tratado pelo bot.
+
+    As chaves do JSON do Telegram sempre aparecem entre aspas, então uma atualização de
+    mensagem ou callback sempre contém `"message"` ou `"callback_query"`. O inverso pode
+    falhar (o texto de uma mensagem pode conter essas palavras), e nesse caso a atualização
+    só segue para a decodificação normal, sem prejuízo.
+
+    Args:
+        body (bytes): Corpo bruto da requisição do webhook.
+
+    Returns:
+        bool: False se a atualização certamente pode ser descartada.
+    """
+    return any(key in body for key in RELEVANT_KEYS)
+
+
+class FastUser(NamedTuple):
+    """Usuário que clicou no botão (apenas o id)."""
+    id: int
+
+
+class FastChat(NamedTuple):
+    """Chat da mensagem do botão (apenas o id)."""
+    id: int
+
+
+class FastMessage(NamedTuple):
+    """Mensagem que contém o botão clicado."""
+    message_id: int
+    chat: FastChat
+
+
+class FastCallbackQuery(NamedTuple):
+    """
+    Versão enxuta de `telebot.types.CallbackQuery`, com apenas os campos usados pelos
+    handlers de callback (`call.id`, `call.data`, `call.from_user.id`,
+    `call.message.chat.id` e `call.message.message_id`).
+    """
+    id: str
+    data: str
+    from_user: FastUser
+    message: FastMessage
+
+
+def fast_CallbackQuery(update: dict, accepts: Callable[[str], bool]) -> Optional[FastCallbackQuery]:
+    """
+    Monta um `FastCallbackQuery` para callbacks conhecidos, sem passar por
+    `types.Update.de_json` (que constrói a árvore inteira de objetos do telebot).
+
+    Args:
+        update (dict): Atualização decodificada.
+        accepts (Callable[[str], bool]): Diz se um `callback_data` tem handler conhecido.
+
+    Returns:
+        FastCallbackQuery or None: Callback pronto para o handler ou None se a atualização
+            deve seguir o caminho normal (não é callback, `data` desconhecido ou callback de
+            mensagem inline, sem `message`).
+    """
+    call = update.get("callback_query")
+    if call is None:
+        return None
+
+    data = call.get("data")
+    message = call.get("message")
+    if data is None or message is None or not accepts(data):
+        return None
+
+    return FastCallbackQuery(
+        id=call["id"],
+        data=data,
+        from_user=FastUser(call["from"]["id"]),
+        message=FastMessage(message["message_id"], FastChat(message["chat"]["id"]))
+    )
@@ -0,0 +1,119 @@
+from services.update_queue import UpdateQueue
+from telebot import asyncio_helper
+from typing import List, Optional
+from utils.event_log import error_Fields
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+class UpdatePoller:
+    """
+    Busca atualizações do Telegram por long polling (`getUpdates`), como alternativa ao webhook.
+
+    Cada chamada traz um lote de até `limit` atualizações, que vão para a mesma
+    `UpdateQueue` usada pelo webhook; os workers da fila processam o lote em paralelo, com
+    o mesmo limite de concorrência e os mesmos handlers. O offset só avança depois que a
+    atualização entra na fila, então com a fila cheia o poller simplesmente espera e nada
+    se perde: o Telegram guarda as atualizações ainda não confirmadas.
+
+    Attributes:
+        update_queue (UpdateQueue): Fila onde as atualizações são depositadas.
+        limit (int): Quantidade máxima de atualizações por chamada (máximo do Telegram: 100).
+        timeout (int): Tempo em segundos que o Telegram segura a chamada sem atualizações.
+        allowed_updates (List[str], optional): Tipos de atualização desejados.
+        stats (dict): Contadores de chamadas, atualizações recebidas e erros.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        update_queue: UpdateQueue,
+        limit: int = 100,
+        timeout: int = 30,
+        allowed_updates: Optional[List[str]] = None,
+        max_backoff: float = 30.0
+    ):
+        """
+        Inicializa o poller.
+
+        Args:
+            bot_token (str): Token do bot.
+            update_queue (UpdateQueue): Fila onde as atualizações são depositadas.
+            limit (int): Atualizações por chamada. Defaults to 100.
+            timeout (int): Tempo de espera do long polling em segundos. Defaults to 30.
+            allowed_updates (List[str], optional): Tipos de atualização desejados.
+                Defaults to None (todos).
+            max_backoff (float): Espera máxima em segundos entre tentativas após erros.
+                Defaults to 30.0.
+        """
+        self._token = bot_token
+        self.update_queue = update_queue
+        self.limit = limit
+        self.timeout = timeout
+        self.allowed_updates = allowed_updates
+        self.max_backoff = max_backoff
+
+        self._offset: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {"polls": 0, "updates": 0, "errors": 0}
+
+    async def start(self):
+        """
+        Inicia o long polling em segundo plano.
+
+        Returns:
+            None
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Encerra o long polling.
+
+        Returns:
+            None
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        backoff = 1.0
+        while True:
+            try:
+                await self.poll()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                log.warning("Erro ao buscar atualizações do Telegram", extra={**error_Fields(e), "backoff": backoff})
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def poll(self):
+        """
+        Faz uma chamada a `getUpdates` e enfileira o lote recebido, na ordem.
+
+        Returns:
+            None
+        """
+        self.stats["polls"] += 1
+        updates = await asyncio_helper.get_updates(
+            self._token,
+            offset=self._offset,
+            limit=self.limit,
+            timeout=self.timeout,
+            allowed_updates=self.allowed_updates,
+            request_timeout=self.timeout + 10
+        )
+
+        for update in updates:
+            # Com a fila cheia, espero por espaco em vez de descartar (nao ha reenvio no polling)
+            await self.update_queue.put_Wait(update)
+            self._offset = update["update_id"] + 1
+            self.stats["updates"] += 1
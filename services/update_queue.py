@@ -0,0 +1,181 @@
+from typing import Any, Awaitable, Callable, List, Optional
+from utils.event_log import error_Fields
+import asyncio
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+class UpdateQueue:
+    """
+    Fila limitada de atualizações do Telegram processadas por um conjunto de workers.
+
+    O webhook apenas enfileira a atualização bruta e responde na hora; os workers consomem
+    a fila em segundo plano. Quando a fila está cheia, `put` aguarda um tempo curto e, se
+    ainda não houver espaço, recusa a atualização para que o Telegram a reenvie mais tarde
+    (backpressure).
+
+    Attributes:
+        maxsize (int): Capacidade máxima da fila.
+        workers (int): Quantidade de workers consumindo a fila.
+        put_timeout (float): Tempo máximo em segundos que `put` aguarda por espaço.
+        stats (dict): Contadores de atualizações enfileiradas, processadas, recusadas e com
+            erro, além de tempos de espera na fila.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[Any], Awaitable[None]],
+        maxsize: int = 1000,
+        workers: int = 8,
+        put_timeout: float = 1.0
+    ):
+        """
+        Inicializa a fila de atualizações.
+
+        Args:
+            process (Callable): Corrotina chamada por um worker para cada atualização.
+            maxsize (int): Capacidade máxima da fila. Defaults to 1000.
+            workers (int): Quantidade de workers. Defaults to 8.
+            put_timeout (float): Tempo máximo em segundos aguardando espaço na fila antes de
+                recusar a atualização. Defaults to 1.0.
+        """
+        self._process = process
+        self.maxsize = maxsize
+        self.workers = workers
+        self.put_timeout = put_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        self.stats = {
+            "enqueued": 0,
+            "processed": 0,
+            "rejected": 0,
+            "errors": 0,
+            "max_depth": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0
+        }
+
+    @property
+    def depth(self) -> int:
+        """Quantidade de atualizações aguardando na fila."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def get_Metrics(self) -> dict:
+        """
+        Retorna as métricas da fila.
+
+        Returns:
+            dict: Contadores de `stats` mais a profundidade atual ('depth') e o tempo médio
+                de espera na fila em segundos ('wait_time_avg').
+        """
+        processed = self.stats["processed"] + self.stats["errors"]
+        return {
+            **self.stats,
+            "depth": self.depth,
+            "wait_time_avg": self.stats["wait_time_total"] / processed if processed else 0.0
+        }
+
+    async def start(self):
+        """
+        Cria a fila e inicia os workers.
+
+        Returns:
+            None
+        """
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """
+        Aguarda (por até `drain_timeout` segundos) a fila esvaziar e encerra os workers.
+
+        Args:
+            drain_timeout (float): Tempo máximo em segundos para processar o que restou na
+                fila. Defaults to 5.0.
+
+        Returns:
+            None
+        """
+        if not self._tasks:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def put(self, update: Any) -> bool:
+        """
+        Enfileira uma atualização, aguardando por espaço no máximo `put_timeout` segundos.
+
+        Args:
+            update (Any): Atualização bruta recebida do Telegram.
+
+        Returns:
+            bool: True se a atualização foi enfileirada, False se a fila continuou cheia.
+        """
+        item = (update, time.monotonic())
+
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(item), timeout=self.put_timeout)
+            except asyncio.TimeoutError:
+                self.stats["rejected"] += 1
+                return False
+
+        self._count_Enqueued()
+        return True
+
+    async def put_Wait(self, update: Any):
+        """
+        Enfileira uma atualização, aguardando por espaço o tempo que for preciso.
+
+        Usado pelo long polling, que não tem reenvio: a espera não conta como recusa.
+
+        Args:
+            update (Any): Atualização bruta recebida do Telegram.
+
+        Returns:
+            None
+        """
+        await self._queue.put((update, time.monotonic()))
+        self._count_Enqueued()
+
+    def _count_Enqueued(self):
+        self.stats["enqueued"] += 1
+        self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+
+    async def _worker(self):
+        """
+        Consome a fila indefinidamente, processando uma atualização por vez.
+
+        Erros no processamento são contabilizados e não derrubam o worker.
+        """
+        while True:
+            update, enqueued_at = await self._queue.get()
+
+            wait_time = time.monotonic() - enqueued_at
+            self.stats["wait_time_total"] += wait_time
+            self.stats["wait_time_max"] = max(self.stats["wait_time_max"], wait_time)
+
+            try:
+                await self._process(update)
+                self.stats["processed"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                log.exception("Erro ao processar atualização do Telegram", extra=error_Fields(e))
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,191 @@
+from services.chat_state import ChatField, ChatStateStore
+from typing import List, Optional
+from utils.event_log import error_Fields
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import time
+import zlib
+
+log = logging.getLogger(__name__)
+
+# Estado da rotacao de cada chat no ChatStateStore
+ROTATION_FIELDS = (
+    ChatField("curiosidade_geracao", "I"),
+    ChatField("curiosidade_passo", "i"),
+    ChatField("curiosidade_inicio", "i"),
+    ChatField("curiosidade_posicao", "i")
+)
+
+# Arquivo padrao, resolvido a partir deste modulo (independente do diretorio de execucao)
+CURIOSIDADES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_curiosidade", "curiosidades.json")
+
+class CuriosidadesStore:
+    """
+    Armazena as curiosidades em memória e sorteia sem repetição por chat.
+
+    O arquivo JSON é lido uma vez; depois disso, a cada `check_interval` segundos uma
+    tarefa em segundo plano confere o mtime do arquivo e recarrega se ele mudou. Nenhuma
+    leitura de disco acontece no caminho de uma requisição.
+
+    Cada chat percorre todas as curiosidades em uma ordem embaralhada antes de ver alguma
+    repetida. A ordem é uma permutação afim (índice = (início + posição * passo) mod n, com
+    passo primo com n), então o estado de cada chat são apenas quatro inteiros, guardados
+    no `ChatStateStore` (ver ROTATION_FIELDS). A geração é o CRC32 do conteúdo do arquivo:
+    uma rotação salva no snapshot do estado continua válida depois de um reinício, e
+    qualquer mudança no arquivo recomeça as rotações.
+
+    Attributes:
+        path (str): Caminho do arquivo de curiosidades.
+        check_interval (float): Intervalo mínimo em segundos entre verificações do arquivo.
+        chat_state (ChatStateStore): Estado por chat onde fica a rotação.
+    """
+
+    def __init__(
+        self,
+        path: str = CURIOSIDADES_PATH,
+        check_interval: float = 30.0,
+        chat_state: Optional[ChatStateStore] = None,
+        max_chats: int = 50000
+    ):
+        """
+        Inicializa o armazenamento. O arquivo é lido em `load()` ou no primeiro `get()`.
+
+        Args:
+            path (str): Caminho do arquivo de curiosidades. Defaults to CURIOSIDADES_PATH.
+            check_interval (float): Intervalo mínimo em segundos entre verificações do
+                arquivo. Defaults to 30.0.
+            chat_state (ChatStateStore, optional): Estado por chat compartilhado com os
+                handlers. Se None, usa um próprio, limitado a `max_chats`. Defaults to None.
+            max_chats (int): Quantidade máxima de chats com estado de rotação, sem
+                `chat_state`. Defaults to 50000.
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.chat_state = chat_state if chat_state is not None else ChatStateStore(max_chats=max_chats)
+        self.chat_state.register(*ROTATION_FIELDS)
+
+        self._items: List[str] = []
+        self._mtime: Optional[float] = None
+        self._generation = 0
+        self._last_check = 0.0
+        self._reload_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def load(self):
+        """
+        Lê o arquivo em uma thread se ele mudou desde a última leitura.
+
+        Returns:
+            None
+        """
+        self._last_check = time.monotonic()
+        loop = asyncio.get_running_loop()
+
+        try:
+            loaded = await loop.run_in_executor(None, self._read_IfChanged, self._mtime)
+        except Exception as e:
+            log.warning("Não foi possivel carregar as curiosidades", extra=error_Fields(e))
+            return
+
+        if loaded is not None:
+            self._mtime, self._generation, self._items = loaded
+
+    async def get(self, chat_id: int) -> str:
+        """
+        Retorna a próxima curiosidade da rotação do chat.
+
+        Args:
+            chat_id (int): Identificador do chat.
+
+        Returns:
+            str: Curiosidade sorteada.
+        """
+        if self._mtime is None:
+            # Nada carregado ainda: depois de uma leitura que falhou, so tento de novo apos
+            # check_interval, para o arquivo ausente nao custar uma leitura por comando
+            if not self._last_check or time.monotonic() - self._last_check >= self.check_interval:
+                await self.load()
+        elif time.monotonic() - self._last_check >= self.check_interval:
+            self._schedule_Reload()
+
+        if not self._items:
+            return "Sem curiosidades por enquanto, volta mais tarde furioso(a) 😅"
+
+        return self._items[self._next_Index(chat_id)]
+
+    def _next_Index(self, chat_id: int) -> int:
+        """
+        Avança a rotação do chat e retorna o índice da curiosidade.
+
+        Args:
+            chat_id (int): Identificador do chat.
+
+        Returns:
+            int: Índice em `_items`.
+        """
+        n = len(self._items)
+        state = self.chat_state.get_Many(chat_id, *(field.name for field in ROTATION_FIELDS))
+
+        if state is None or state[0] != self._generation or state[3] >= n:
+            state = (self._generation, _random_Step(n), random.randrange(n), 0)
+
+        generation, step, start, position = state
+        self.chat_state.set(
+            chat_id,
+            curiosidade_geracao=generation,
+            curiosidade_passo=step,
+            curiosidade_inicio=start,
+            curiosidade_posicao=position + 1
+        )
+
+        return (start + position * step) % n
+
+    def _schedule_Reload(self):
+        """Agenda a verificação do arquivo em segundo plano (uma de cada vez)."""
+        if self._reload_task is None or self._reload_task.done():
+            self._last_check = time.monotonic()
+            self._reload_task = asyncio.create_task(self.load())
+
+    def _read_IfChanged(self, known_mtime: Optional[float]):
+        """
+        Lê o arquivo se o mtime for diferente do conhecido. Executado em uma thread.
+
+        Args:
+            known_mtime (float, optional): mtime da última leitura.
+
+        Returns:
+            tuple or None: (mtime, CRC32 do conteúdo, lista de curiosidades) ou None se o
+                arquivo não mudou.
+        """
+        mtime = os.stat(self.path).st_mtime
+        if mtime == known_mtime:
+            return None
+
+        with open(self.path, 'rb') as file:
+            raw = file.read()
+
+        return mtime, zlib.crc32(raw), [item["curiosidade"] for item in json.loads(raw)]
+
+
+def _random_Step(n: int) -> int:
+    """
+    Sorteia um passo primo com n, garantindo que a permutação afim passe por todos os índices.
+
+    Args:
+        n (int): Quantidade de curiosidades.
+
+    Returns:
+        int: Passo entre 1 e n - 1 (ou 1 se n <= 2).
+    """
+    if n <= 2:
+        return 1
+    while True:
+        step = random.randrange(1, n)
+        if math.gcd(step, n) == 1:
+            return step
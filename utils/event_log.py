@@ -0,0 +1,254 @@
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+from utils import json_codec
+import logging
+import queue
+import sys
+import threading
+import time
+
+# Campos da atualizacao em andamento, copiados para todo registro feito durante ela
+_context: ContextVar[Optional[dict]] = ContextVar("event_log_context", default=None)
+
+# Atributos que todo LogRecord tem; o resto veio de `extra` ou do contexto
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+def bind(**fields):
+    """
+    Define os campos (ex.: update_id, chat_id, action) incluídos em todos os registros
+    feitos a partir deste ponto no contexto atual.
+
+    Substitui o contexto anterior em vez de somar a ele: cada worker da fila chama no
+    início de cada atualização, e as tarefas criadas pelos handlers herdam os campos.
+
+    Args:
+        **fields: Campos do contexto.
+    """
+    _context.set(fields)
+
+
+class ContextFilter(logging.Filter):
+    """Copia para o registro os campos definidos com `bind` (sem sobrescrever o `extra`)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = _context.get()
+        if fields:
+            for name, value in fields.items():
+                if not hasattr(record, name):
+                    setattr(record, name, value)
+        return True
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Limita avisos e erros repetidos.
+
+    Registros de nível WARNING ou acima com a mesma origem, a mesma mensagem e o mesmo tipo
+    de erro ('error_type') passam no máximo `burst` vezes a cada `window` segundos; os
+    demais são descartados antes de entrar na fila. O primeiro que passa depois da janela
+    leva no campo 'suppressed' quantos foram descartados, então uma PandaScore fora do ar
+    gera poucas linhas por minuto em vez de uma por requisição.
+
+    Attributes:
+        window (float): Duração da janela em segundos.
+        burst (int): Registros iguais aceitos por janela.
+        suppressed_total (int): Total de registros descartados.
+    """
+
+    def __init__(self, window: float = 60.0, burst: int = 5, max_keys: int = 1000):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.max_keys = max_keys
+        self.suppressed_total = 0
+        # chave -> [inicio da janela, aceitos na janela, descartados desde o ultimo aceito]
+        self._seen: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+
+        key = (record.name, record.msg, getattr(record, "error_type", None))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = entry[2] if entry is not None else 0
+                if entry is None and len(self._seen) >= self.max_keys:
+                    self._seen.clear()
+                self._seen[key] = [now, 1, 0]
+            elif entry[1] < self.burst:
+                entry[1] += 1
+                suppressed, entry[2] = entry[2], 0
+            else:
+                entry[2] += 1
+                self.suppressed_total += 1
+                return False
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class DropQueueHandler(QueueHandler):
+    """
+    `QueueHandler` que nunca bloqueia: com a fila cheia o registro é descartado e contado.
+
+    No thread de quem registra só acontecem a interpolação da mensagem e, se houver, a
+    formatação do traceback; a serialização e a escrita ficam na thread do `QueueListener`.
+
+    Attributes:
+        dropped (int): Registros descartados com a fila cheia.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Um objeto JSON por linha: 'ts' (ISO 8601, UTC), 'level', 'logger', 'pid', 'msg', os campos
+    extras (update_id, chat_id, action, latency_ms, error...) e 'exc' com o traceback.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json_codec.dumps(_fields(record)).decode("utf-8")
+
+
+class TextFormatter(logging.Formatter):
+    """Linha legível para desenvolvimento local: horário, nível, origem, mensagem e campos."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = _fields(record)
+        extras = " ".join(f"{name}={value}" for name, value in fields.items() if name not in ("ts", "level", "logger", "pid", "msg", "exc"))
+        line = f"{fields['ts']} {fields['level']} {fields['logger']}: {fields['msg']}"
+        if extras:
+            line = f"{line} {extras}"
+        if "exc" in fields:
+            line = f"{line}\n{fields['exc']}"
+        return line
+
+
+_FORMATTER = logging.Formatter()
+
+FORMATTERS = {"json": JSONFormatter, "text": TextFormatter}
+
+def setup_Logging(level: str = "INFO", fmt: str = "json", background: bool = True, queue_size: int = 10000, stream=None) -> Optional[QueueListener]:
+    """
+    Configura o logger raiz do processo.
+
+    Com `background`, os registros vão para uma fila limitada e uma thread (`QueueListener`)
+    formata e escreve; quem registra (o event loop) nunca espera pela escrita e, com a fila
+    cheia, o registro é descartado. Sem `background` (ex.: no processo pai dos workers, que
+    não atende requisições), a escrita é direta.
+
+    O handler próprio do telebot é removido, para os registros dele seguirem pela raiz.
+
+    Args:
+        level (str): Nível mínimo ('DEBUG' inclui uma linha por atualização processada).
+            Defaults to 'INFO'.
+        fmt (str): 'json' (padrão) ou 'text'.
+        background (bool): Se a escrita fica em uma thread separada. Defaults to True.
+        queue_size (int): Capacidade da fila de registros. Defaults to 10000.
+        stream (IO, optional): Destino das linhas. Defaults to sys.stdout.
+
+    Returns:
+        QueueListener or None: Thread de escrita, que deve ser parada com `stop()` no
+            encerramento para esvaziar a fila; None sem `background`.
+
+    Raises:
+        ValueError: Se o formato não existir.
+    """
+    if fmt not in FORMATTERS:
+        raise ValueError(f"Formato de log inválido: {fmt} (use {' ou '.join(FORMATTERS)})")
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(FORMATTERS[fmt]())
+
+    listener = None
+    if background:
+        handler = DropQueueHandler(queue.Queue(maxsize=queue_size))
+        listener = QueueListener(handler.queue, writer)
+    else:
+        handler = writer
+    handler.addFilter(ContextFilter())
+    handler.addFilter(RepeatFilter())
+
+    root = logging.getLogger()
+    for antigo in list(root.handlers):
+        root.removeHandler(antigo)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+
+    # telebot instala um StreamHandler proprio (e tambem propaga para a raiz)
+    logging.getLogger("TeleBot").handlers.clear()
+
+    if listener is not None:
+        listener.start()
+    return listener
+
+
+def get_Stats() -> Dict[str, int]:
+    """
+    Retorna os registros descartados pelo handler instalado por `setup_Logging`.
+
+    Returns:
+        dict: 'dropped' (fila cheia) e 'suppressed' (repetições limitadas pelo
+            `RepeatFilter`).
+    """
+    stats = {"dropped": 0, "suppressed": 0}
+    for handler in logging.getLogger().handlers:
+        stats["dropped"] += getattr(handler, "dropped", 0)
+        for filtro in handler.filters:
+            stats["suppressed"] += getattr(filtro, "suppressed_total", 0)
+    return stats
+
+
+def error_Fields(error: BaseException) -> Dict[str, str]:
+    """
+    Campos de um erro para o `extra` de um registro.
+
+    Args:
+        error (BaseException): Erro capturado.
+
+    Returns:
+        dict: 'error' (mensagem) e 'error_type' (nome da classe, usado pelo `RepeatFilter`).
+    """
+    return {"error": str(error), "error_type": type(error).__name__}
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    fields = {
+        "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+        "level": record.levelname,
+        "logger": record.name,
+        "pid": record.process,
+        "msg": record.getMessage()
+    }
+    for name, value in vars(record).items():
+        if name not in _RECORD_ATTRS:
+            fields[name] = value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+    if record.exc_text:
+        fields["exc"] = record.exc_text
+    elif record.exc_info:
+        fields["exc"] = _FORMATTER.formatException(record.exc_info)
+    return fields
@@ -1,8 +1,11 @@
 from datetime import datetime
-import json
-import random
+from models.pandascore import Match, Player
+from typing import Tuple
+from utils.render_cache import render_once
+import re
 
-def format_UltimaPartida(data):
+@render_once(maxsize=8)
+def format_UltimaPartida(data: Tuple[Match, ...]):
     """
     Formata os dados da última partida de Counter-Strike retornados pela API PandaScore.
 
@@ -10,9 +13,9 @@ def format_UltimaPartida(data):
     para criar uma mensagem formatada em Markdown, ideal para envio via Telegram.
 
     Args:
-        data (list): Lista contendo um dicionário com os dados da partida, conforme retornado por
-            `PandaScoreClient.get_Ultima_Partida()`. Espera campos como `opponents`, `results`,
-            `winner`, e `streams_list`.
+        data (Tuple[Match, ...]): Tupla com a partida, conforme retornada por
+            `PandaScoreClient.get_UltimaPartida()`. Usa os campos `opponents`, `results`,
+            `winner`, `serie_name` e `highlight_url`.
 
     Returns:
         dict: Dicionário com duas chaves:
@@ -21,7 +24,7 @@ def format_UltimaPartida(data):
             - logo (str or None): URL da logo do time vencedor ou None se não disponível.
 
     Example:
-        >>> data = [{"opponents": [...], "results": [...], "winner": {...}, "streams_list": [...]}]
+        >>> data = (Match(opponents=(...), results=(...), winner=Team(...), ...),)
         >>> result = formatUltimaPartida(data)
         >>> print(result)
         {
@@ -29,34 +32,28 @@ def format_UltimaPartida(data):
             'logo': 'https://cdn.pandascore.co/images/team/image/3272/...'
         }
     """
+    partida = data[0]
+
     # nome dos times
-    furia = data[0]["opponents"][0]["opponent"]["name"]
-    timeAnonimo = data[0]["opponents"][1]["opponent"]["name"]
+    furia = partida.opponents[0].name
+    timeAnonimo = partida.opponents[1].name
 
     # Score dos Times
-    scoreFuria = data[0]["results"][0]["score"]
-    scoreTimeAnonimo = data[0]["results"][1]["score"]
+    scoreFuria = partida.results[0].score
+    scoreTimeAnonimo = partida.results[1].score
 
     # Nome do Vencedor e sua logo
-    vencedor = data[0]["winner"]["name"]
-    logoVencedor = data[0]["winner"]['image_url']
+    vencedor = partida.winner.name
+    logoVencedor = partida.winner.image_url
 
     # nome da Serie
-    season = data[0]["serie"]['full_name']
+    season = partida.serie_name
 
     # Variavel personalizada para caso o time perca ou venca
     msgVencedor = "Parabéns ao adversário, mas a FURIA vai voltar mais forte!" if scoreFuria < scoreTimeAnonimo else "🔥SÓ VEM QUE A FURIA TÁ LIGADA!!!🔥"
 
-    link_stream = None
-
-    # Varrer a lista pelo ultimo elemento, reduz o tempo, pois eh comum que a stream official fique na ultima posicao (Porem pode mudar!)
-    for stream in data[0]['streams_list'][::-1]:
-        if (stream['official'] == True) and (stream['language'] == 'en' or stream['language'] == 'br'):
-            link_stream = stream['raw_url']
-            break
-        else:
-            # Sem streams para outra idioma
-            link_stream = '#'
+    # Stream oficial em ingles ou portugues, escolhida ao montar o modelo ('#' se nao houver)
+    link_stream = partida.highlight_url
 
     # Construção da mensagem do bot
     message = (
@@ -70,20 +67,20 @@ def format_UltimaPartida(data):
     return {"text": message, "logo": logoVencedor}
 
         
-def format_ProximasPartidas(data):
+@render_once(maxsize=8)
+def format_ProximasPartidas(data: Tuple[Match, ...]):
     """
         Formata dados de partidas futuras para uma mensagem amigável com marcação.
-        Processa uma lista de partidas futuras da API PandaScore, extraindo informações relevantes
+        Processa as partidas futuras da API PandaScore, extraindo informações relevantes
         (nomes dos times, data, links de transmissão) e formata em uma string pronta para exibição
         em aplicações de mensagens como Telegram ou Discord.
 
         Args:
-            data (List[Dict]): Lista de dicionários contendo dados brutos de partidas da API.
-                Campos esperados por partida:
+            data (Tuple[Match, ...]): Partidas conforme retornadas pela API. Campos usados:
                 - name (str): Nome da partida/torneio
-                - begin_at (str): Data/hora
-                - opponents (List[Dict]): Lista de oponentes com detalhes dos times
-                - streams_list (List[Dict]): Lista de streams de transmissão
+                - begin_at_display (str): Data/hora já formatada
+                - opponents (Tuple[Team, ...]): Times da partida
+                - live_urls (Tuple[str, ...]): Links das transmissões principais
 
         Returns:
             str: Mensagem formatada com:
@@ -94,7 +91,7 @@ def format_ProximasPartidas(data):
             - Mensagem padrão caso não haja partidas
 
         Example:
-            >>> partidas = [{
+            >>> partidas = parse_Matches([{
             ...     "name": "BLAST Premier 2023",
             ...     "begin_at": "2023-12-15T19:00:00Z",
             ...     "opponents": [
@@ -104,7 +101,7 @@ def format_ProximasPartidas(data):
             ...     "streams_list": [
             ...         {"main": True, "language": "en", "raw_url": "https://twitch.tv/esl_csgo"}
             ...     ]
-            ... }]
+            ... }])
             >>> print(formatProximasPartidas(partidas))
             Vem torcer com a gente FURIOSO(A)🔥
             
@@ -114,7 +111,7 @@ def format_ProximasPartidas(data):
             🔴 Assista ao vivo: https://twitch.tv/esl_csgo
 
         Notes:
-            - Filtra streams principais em inglês, espanhol ou português
+            - Usa as streams principais em inglês, espanhol ou português (`live_urls`)
             - Mensagem padrão caso não haja partidas: "Infelizmente não tem partidas ainda 😭"
             - Formato de saída otimizado para Markdown (suporte a negrito/itálico)
         """
@@ -123,23 +120,15 @@ def format_ProximasPartidas(data):
 
     for partida in data:
         # Dados básicos com tratamento de erros
-        nome_partida = partida.get("name", "Partida sem nome")
-        dataPartida = partida.get("begin_at", "Data desconhecida")
+        nome_partida = partida.name or "Partida sem nome"
+        dataLimpa = partida.begin_at_display or "Data desconhecida"
         
         # Processamento dos times
-        opponents = partida.get("opponents", [])
-        times = [opponent.get("opponent", {}).get("name", "Time desconhecido") for opponent in opponents]
+        times = [opponent.name or "Time desconhecido" for opponent in partida.opponents]
         timesVS = " vs ".join(times) if len(times) > 1 else f"{times[0]} (Adversário não definido)" if times else "Partida sem times definidos"
     
-        linkStream = []
-
-        for stream in partida.get("streams_list", []):
-            # Aceitar streams principais em inglês, espanhol ou português
-            if stream.get("main", False) and stream.get("language") in ["en", "es", "br"]:
-                linkStream.append(stream["raw_url"])
-
-        utc_time = datetime.fromisoformat(dataPartida)
-        dataLimpa = utc_time.strftime("%d/%m/%Y %H:%M")
+        # Streams principais em inglês, espanhol ou português
+        linkStream = partida.live_urls
 
         # Construção da mensagem formatada
         mensagem = (
@@ -154,7 +143,8 @@ def format_ProximasPartidas(data):
     # Junta todas as mensagens e adiciona cabeçalho
     return "\n".join([f"Vem torcer com a gente FURIOSO(A)🔥\n"] + mensagens) if mensagens else "Infelizmente não tem partidas ainda 😭"
 
-def format_PartidaAndamento(data):
+@render_once(maxsize=8)
+def format_PartidaAndamento(data: Tuple[Match, ...]):
     """
     Formata dados de partidas em andamento para mensagem do bot com marcação.
 
@@ -162,12 +152,11 @@ def format_PartidaAndamento(data):
     essenciais: nome da partida, série/torneio, premiação e link de transmissão.
 
     Args:
-        data (List[Dict]): Lista contendo pelo menos um item com dados da partida ativa.
-            Campos esperados no primeiro item:
+        data (Tuple[Match, ...]): Pelo menos uma partida ativa. Campos usados no primeiro item:
             - name (str): Nome da partida
-            - serie (Dict): Dados da série/torneio com campo 'full_name'
-            - tournament (Dict): Dados do torneio com campo 'prizepool'
-            - streams_list (List[Dict]): Lista de streams de transmissão
+            - serie_name (str): Nome completo da série/torneio
+            - prizepool (str): Premiação do torneio
+            - streams (Tuple[Stream, ...]): Streams de transmissão
 
     Returns:
         str: Mensagem formatada no padrão:
@@ -181,19 +170,19 @@ def format_PartidaAndamento(data):
          🔴[Assista ao vivo](https://twitch.tv/esl_csgo)"
 
     Example:
-        >>> partida = [{
+        >>> partida = parse_Matches([{
         ...     "name": "ESL Pro League S18",
         ...     "serie": {"full_name": "ESL Pro League"},
         ...     "tournament": {"prizepool": "$850,000"},
         ...     "streams_list": [{"raw_url": "https://twitch.tv/esl_csgo"}]
-        ... }]
+        ... }])
         >>> print(formatPartidaEmAndamento(partida))
         🏆 ESL Pro League S18 ESL Pro League 🏆
         🤑 $850,000
         🔴[Assista ao vivo](https://twitch.tv/esl_csgo)
 
     Notes:
-        - Assume que sempre existe pelo menos uma partida em andamento (lista não vazia)
+        - Assume que sempre existe pelo menos uma partida em andamento (tupla não vazia)
         - Usa o primeiro link de transmissão disponível na lista
         - Formatação otimizada para Markdown (links clicáveis)
         - Trata campos inexistentes com valores padrão:
@@ -201,10 +190,11 @@ def format_PartidaAndamento(data):
     """
     
     # indices diretos em data pois ao ter uma partida rodando, o valor da API
-    nomePartida = data[0].get("name", "Nome indisponivel")
-    nomeSerie = data[0]["serie"].get("full_name", "Serie indisponivel")
-    valorPartida = data[0]["tournament"].get("prizepool", "Valor não disponivel")
-    stream = data[0]["streams_list"][0].get("raw_url", "Link indisponivel")
+    partida = data[0]
+    nomePartida = partida.name or "Nome indisponivel"
+    nomeSerie = partida.serie_name or "Serie indisponivel"
+    valorPartida = partida.prizepool or "Valor não disponivel"
+    stream = (partida.streams[0].raw_url if partida.streams else None) or "Link indisponivel"
     
     message = (
         f"🏆 {nomePartida} {nomeSerie} 🏆\n"
@@ -214,7 +204,8 @@ def format_PartidaAndamento(data):
 
     return message
 
-def format_PaginaJogador(player):
+@render_once(maxsize=64)
+def format_PaginaJogador(player: Player):
     """
     Formata os dados de um jogador em uma mensagem estruturada para o bot.
 
@@ -222,7 +213,7 @@ def format_PaginaJogador(player):
     em uma mensagem formatada com emojis e marcação para melhor legibilidade em aplicações de chat.
 
     Args:
-        player (Dict): Dicionário contendo dados do jogador. Campos suportados:
+        player (Player): Jogador do elenco. Campos usados:
             - name (str): Nome completo/nickname do jogador
             - age (int/str): Idade do jogador
             - nationality (str): Nacionalidade (código de país ou nome completo)
@@ -236,26 +227,113 @@ def format_PaginaJogador(player):
            - 📅 Aniversário: Data
     """       
     message = (
-        f"👤 *{player.get('name', 'Sem nome')}*\n"
-        f"   - 🎂 Idade: {player.get('age', '?')} anos\n"
-        f"   - 🏳️ Nacionalidade: {player.get('nationality', '?')}\n"
-        f"   - 📅 Aniversário: {player.get('birthday', 'Não informado')}\n"
+        f"👤 *{player.name or 'Sem nome'}*\n"
+        f"   - 🎂 Idade: {player.age if player.age is not None else '?'} anos\n"
+        f"   - 🏳️ Nacionalidade: {player.nationality or '?'}\n"
+        f"   - 📅 Aniversário: {player.birthday or 'Não informado'}\n"
     )
     return message
 
-def get_Curiosidades():
+def format_EventoAoVivo(evento, partida: Match):
     """
-    Retorna uma curiosidade aleatoriamente
+    Formata o aviso de um evento de partida ao vivo para os inscritos em /seguir.
 
     Args:
-        Nenhum
+        evento (str): Tipo do evento: 'inicio', 'placar' ou 'fim'.
+        partida (Match): Partida conforme retornada pelo `PandaScoreClient`. Campos
+            usados: 'name', 'opponents', 'results', 'winner_id' e 'main_stream_url'.
 
-    Returns:   
-        str: curiosidade disponivel no arquivo curiosidades.json
+    Returns:
+        str: Mensagem formatada em Markdown, por exemplo:
+        🔴 *Começou!* FURIA vs MOUZ
+        📊 FURIA 0 x 0 MOUZ
+        🟣 [Assista ao vivo](https://twitch.tv/...)
     """
-    with open('utils/data_curiosidade/curiosidades.json', 'r', encoding='utf-8') as file:
-        data = json.load(file)
-    
-    indice = random.randint(0, len(data) - 1)
+    nomes = {opponent.id: _escape_Markdown(opponent.name) if opponent.name else "Time desconhecido" for opponent in partida.opponents}
+    resultados = [
+        (nomes.get(result.team_id, "Time desconhecido"), result.score if result.score is not None else 0)
+        for result in partida.results
+    ]
+    placar = f"{resultados[0][0]} {resultados[0][1]} x {resultados[1][1]} {resultados[1][0]}" if len(resultados) == 2 else ""
+    timesVS = " vs ".join(nomes.values()) or (_escape_Markdown(partida.name) if partida.name else "Partida da FURIA")
+    stream = partida.main_stream_url
+
+    if evento == "inicio":
+        titulo = f"🔴 *Começou!* {timesVS}"
+    elif evento == "placar":
+        titulo = f"💥 *Mudou o placar!* {timesVS}"
+    else:
+        vencedor = nomes.get(partida.winner_id)
+        titulo = f"🏁 *Fim de jogo!* {timesVS}" + (f"\n🏆 Vitória dos {vencedor}!" if vencedor else "")
+
+    message = f"{titulo}\n📊 {placar or 'Placar indisponivel'}"
+    if stream and evento != "fim":
+        message += f"\n🟣 [Assista ao vivo]({stream})"
+
+    return message
+
+def format_Confronto(adversario, confronto):
+    """
+    Formata o retrospecto da FURIA contra um adversário (comando /confronto).
+
+    Args:
+        adversario (str): Texto digitado pelo usuário.
+        confronto (HeadToHead or None): Retrospecto do `MatchArchive` ou None se a FURIA
+            nunca enfrentou o adversário.
 
-    return data[indice]["curiosidade"]
\ No newline at end of file
+    Returns:
+        str: Mensagem formatada em Markdown, por exemplo:
+        ⚔️ *FURIA x MOUZ*
+        📊 7 vitórias e 5 derrotas
+
+        ✅ 14/05/2025 FURIA 2 x 1 MOUZ (PGL Astana 2025)
+    """
+    if confronto is None:
+        return f"Não achei nenhum confronto da FURIA contra *{_escape_Markdown(adversario)}* 🤔 Confere o nome do time e tenta de novo"
+
+    linhas = [
+        f"⚔️ *FURIA x {_escape_Markdown(confronto.opponent_name)}*",
+        f"📊 {confronto.wins} vitória{'s' if confronto.wins != 1 else ''} e {confronto.losses} derrota{'s' if confronto.losses != 1 else ''}",
+        ""
+    ]
+    linhas += [_linha_Partida(partida) for partida in confronto.recent]
+    return "\n".join(linhas)
+
+def format_Forma(partidas):
+    """
+    Formata a fase recente da FURIA (comando /forma).
+
+    Args:
+        partidas (Tuple[ArchivedMatch, ...]): Últimas partidas do `MatchArchive`, da mais
+            recente para a mais antiga.
+
+    Returns:
+        str: Mensagem formatada em Markdown, por exemplo:
+        📈 *Fase recente da FURIA:* V V D V V
+
+        ✅ 14/05/2025 FURIA 2 x 1 MOUZ (PGL Astana 2025)
+    """
+    if not partidas:
+        return "Ainda não tenho o histórico de partidas da FURIA, tenta de novo daqui a pouco 😉"
+
+    sequencia = " ".join("V" if partida.won else "D" if partida.won is False else "-" for partida in partidas)
+    linhas = [f"📈 *Fase recente da FURIA:* {sequencia}", ""]
+    linhas += [_linha_Partida(partida) for partida in partidas]
+    return "\n".join(linhas)
+
+def _linha_Partida(partida):
+    """Uma linha de partida do arquivo: resultado, data, placar e série."""
+    icone = "✅" if partida.won else "❌" if partida.won is False else "➖"
+    data = datetime.fromisoformat(partida.begin_at).strftime("%d/%m/%Y")
+    furia = "?" if partida.furia_score is None else partida.furia_score
+    adversario = "?" if partida.opponent_score is None else partida.opponent_score
+    serie = f" ({_escape_Markdown(partida.serie_name)})" if partida.serie_name else ""
+    nome = _escape_Markdown(partida.opponent_name) if partida.opponent_name else "Time desconhecido"
+    return f"{icone} {data} FURIA {furia} x {adversario} {nome}{serie}"
+
+def _escape_Markdown(texto):
+    """
+    Escapa os caracteres especiais do Markdown legado do Telegram (_ * ` [) em textos que não
+    vêm do bot (nomes da PandaScore, texto digitado), para o Telegram não recusar a mensagem.
+    """
+    return re.sub(r"([_*`\[])", r"\\\1", texto)
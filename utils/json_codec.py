@@ -0,0 +1,89 @@
+import json
+from typing import Any, Callable, Dict, NamedTuple, Union
+
+class JSONCodec(NamedTuple):
+    """
+    Par de funções de (de)serialização JSON usado pelo bot.
+
+    Attributes:
+        name (str): Nome do codec ('json' ou 'orjson').
+        loads (Callable): Converte bytes ou str em objetos Python.
+        dumps (Callable): Converte objetos Python em bytes UTF-8 compactos.
+    """
+    name: str
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _std_Dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+CODECS: Dict[str, JSONCodec] = {"json": JSONCodec("json", json.loads, _std_Dumps)}
+
+# orjson e opcional: decodifica os payloads da PandaScore e do Telegram varias vezes mais rapido
+try:
+    import orjson
+    CODECS["orjson"] = JSONCodec("orjson", orjson.loads, orjson.dumps)
+except ImportError:
+    pass
+
+_codec = CODECS.get("orjson") or CODECS["json"]
+
+
+def set_Codec(name: str = "auto") -> JSONCodec:
+    """
+    Escolhe o codec usado em `loads` e `dumps`.
+
+    Args:
+        name (str): 'auto' (o mais rápido instalado), 'orjson' ou 'json'. Defaults to 'auto'.
+
+    Returns:
+        JSONCodec: Codec escolhido.
+
+    Raises:
+        ValueError: Se o codec pedido não existir ou não estiver instalado.
+    """
+    global _codec
+
+    if name == "auto":
+        _codec = CODECS.get("orjson") or CODECS["json"]
+    elif name in CODECS:
+        _codec = CODECS[name]
+    else:
+        raise ValueError(f"Codec JSON indisponível: {name} (instalados: {', '.join(CODECS)})")
+    return _codec
+
+
+def get_Codec() -> JSONCodec:
+    """Retorna o codec em uso."""
+    return _codec
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decodifica JSON com o codec em uso.
+
+    Args:
+        data (bytes or str): Documento JSON.
+
+    Returns:
+        Any: Objeto Python decodificado.
+
+    Raises:
+        ValueError: Se o documento não for um JSON válido.
+    """
+    return _codec.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Codifica um objeto em JSON compacto (UTF-8) com o codec em uso.
+
+    Args:
+        obj (Any): Objeto serializável.
+
+    Returns:
+        bytes: Documento JSON.
+    """
+    return _codec.dumps(obj)
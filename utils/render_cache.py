@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from functools import wraps
+
+def render_once(maxsize: int = 32):
+    """
+    Decorador que formata cada payload da API uma única vez.
+
+    O `PandaScoreClient` devolve sempre o mesmo objeto enquanto a entrada do cache não é
+    atualizada, então a identidade do payload funciona como versão da busca: enquanto o
+    mesmo objeto for passado ao formatador, a mensagem já renderizada é reaproveitada. Uma
+    nova busca gera um novo objeto e, portanto, uma nova renderização.
+
+    O cache guarda uma referência ao payload junto com o resultado, então o `id` não pode
+    ser reaproveitado por outro objeto enquanto a entrada existir.
+
+    Args:
+        maxsize (int): Quantidade máxima de payloads renderizados mantidos por formatador
+            (os usados há mais tempo são descartados). Defaults to 32.
+
+    Returns:
+        Callable: Decorador para funções de formatação que recebem um único payload.
+
+    Example:
+        >>> @render_once()
+        ... def format_Partida(data):
+        ...     return f"{data[0]['name']}"
+        >>> format_Partida.cache_stats
+        {'hits': 0, 'misses': 0}
+    """
+    def decorator(func):
+        rendered = OrderedDict()
+        stats = {"hits": 0, "misses": 0}
+
+        @wraps(func)
+        def wrapper(payload):
+            key = id(payload)
+            entry = rendered.get(key)
+
+            if entry is not None and entry[0] is payload:
+                rendered.move_to_end(key)
+                stats["hits"] += 1
+                return entry[1]
+
+            stats["misses"] += 1
+            result = func(payload)
+
+            rendered[key] = (payload, result)
+            if len(rendered) > maxsize:
+                rendered.popitem(last=False)
+
+            return result
+
+        wrapper.cache_stats = stats
+        wrapper.cache_clear = rendered.clear
+        return wrapper
+
+    return decorator